@@ -5,8 +5,7 @@ Backup device configuration to an external file
 """
 
 from netmiko import ConnectHandler
-from datetime import datetime
-import os
+from part3b_backup_store import BackupStore
 
 # Router configuratie - PAS DIT AAN NAAR JOUW ROUTER
 router = {
@@ -21,11 +20,9 @@ print("=" * 60)
 print("Part 3a: Backup Device Configuration")
 print("=" * 60)
 
-# Maak backup directory als die niet bestaat
+# Backup store: elke unieke config wordt maar één keer (gecomprimeerd) opgeslagen
 backup_dir = "backups"
-if not os.path.exists(backup_dir):
-    os.makedirs(backup_dir)
-    print(f"Backup directory aangemaakt: {backup_dir}/")
+store = BackupStore(f"{backup_dir}/store")
 
 print(f"\nVerbinden met {router['host']}...")
 net_connect = ConnectHandler(**router)
@@ -40,30 +37,13 @@ running_config = net_connect.send_command("show running-config")
 print("Ophalen van startup-config...")
 startup_config = net_connect.send_command("show startup-config")
 
-# Maak backup bestanden
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-# Running config backup
-running_filename = f"{backup_dir}/{hostname}_running_{timestamp}.cfg"
-with open(running_filename, "w") as f:
-    f.write(f"! Backup van {hostname}\n")
-    f.write(f"! Datum: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    f.write(f"! Type: Running Configuration\n")
-    f.write("!\n")
-    f.write(running_config)
-
-print(f"Running config opgeslagen: {running_filename}")
-
-# Startup config backup
-startup_filename = f"{backup_dir}/{hostname}_startup_{timestamp}.cfg"
-with open(startup_filename, "w") as f:
-    f.write(f"! Backup van {hostname}\n")
-    f.write(f"! Datum: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    f.write(f"! Type: Startup Configuration\n")
-    f.write("!\n")
-    f.write(startup_config)
-
-print(f"Startup config opgeslagen: {startup_filename}")
+# Sla beide configs op; ongewijzigde configs worden niet opnieuw weggeschreven
+for config_type, config in (("running", running_config), ("startup", startup_config)):
+    digest, changed = store.save(f"{hostname}_{config_type}", config)
+    if changed:
+        print(f"{config_type.capitalize()} config opgeslagen: {store.blob_path(digest)}")
+    else:
+        print(f"{config_type.capitalize()} config ongewijzigd (versie {digest[:12]})")
 
 net_connect.disconnect()
 print("\nBackup voltooid! Verbinding afgesloten.")
@@ -5,6 +5,7 @@ Execute a script with conditional statements (if, else)
 """
 
 from netmiko import ConnectHandler
+from part3b_compliance import load_engine
 
 # Router configuratie - PAS DIT AAN NAAR JOUW ROUTER
 router = {
@@ -129,20 +130,15 @@ else:
 print("\n--- Check 5: Configuratie Compliance ---")
 running_config = net_connect.send_command("show running-config")
 
-compliance_checks = {
-    "SSH enabled": "ip ssh version 2" in running_config or "transport input ssh" in running_config,
-    "Banner configured": "banner" in running_config.lower(),
-    "Enable secret set": "enable secret" in running_config,
-    "HTTPS server": "ip http secure-server" in running_config,
-    "Logging enabled": "logging" in running_config
-}
+# Alle regels uit compliance_rules.json worden in één pass over de config geëvalueerd
+compliance_results = load_engine().evaluate(running_config)
 
 print("\nCompliance Resultaten:")
 all_compliant = True
-for check, passed in compliance_checks.items():
-    status = "✓ PASS" if passed else "✗ FAIL"
-    print(f"  {check}: {status}")
-    if not passed:
+for check, result in compliance_results.items():
+    status = "✓ PASS" if result["passed"] else "✗ FAIL"
+    print(f"  {result['description']}: {status}")
+    if not result["passed"]:
         all_compliant = False
 
 if all_compliant:
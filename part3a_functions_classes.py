@@ -5,15 +5,17 @@ Execute a script with functions and classes
 """
 
 from netmiko import ConnectHandler
-from datetime import datetime
-import os
+from part3b_backup_store import BackupStore
 
 
 class CiscoRouter:
     """Klasse om een Cisco router te beheren via Netmiko."""
     
-    def __init__(self, host, username, password, port=22, device_type="cisco_ios"):
-        """Initialiseer router verbinding parameters."""
+    def __init__(self, host, username, password, port=22, device_type="cisco_ios", pool=None):
+        """Initialiseer router verbinding parameters.
+        
+        pool: optionele SessionPool (part3b_session_pool) om sessies te hergebruiken.
+        """
         self.device_params = {
             "device_type": device_type,
             "host": host,
@@ -23,12 +25,16 @@ class CiscoRouter:
         }
         self.connection = None
         self.hostname = None
+        self.pool = pool
     
     def connect(self):
         """Maak verbinding met de router."""
         try:
             print(f"Verbinden met {self.device_params['host']}...")
-            self.connection = ConnectHandler(**self.device_params)
+            if self.pool is not None:
+                self.connection = self.pool.acquire(self.device_params)
+            else:
+                self.connection = ConnectHandler(**self.device_params)
             self.hostname = self.connection.find_prompt().replace("#", "").replace(">", "")
             print(f"Verbonden met: {self.hostname}")
             return True
@@ -39,8 +45,14 @@ class CiscoRouter:
     def disconnect(self):
         """Sluit de verbinding."""
         if self.connection:
-            self.connection.disconnect()
-            print(f"Verbinding met {self.hostname} afgesloten.")
+            if self.pool is not None:
+                # Sessie blijft open in de pool voor hergebruik
+                self.pool.release(self.connection)
+                print(f"Verbinding met {self.hostname} teruggegeven aan de pool.")
+            else:
+                self.connection.disconnect()
+                print(f"Verbinding met {self.hostname} afgesloten.")
+            self.connection = None
     
     def send_show_command(self, command):
         """Voer een show command uit en return de output."""
@@ -66,18 +78,17 @@ class CiscoRouter:
         return True
     
     def backup_config(self, backup_dir="backups"):
-        """Maak een backup van de running config."""
-        if not os.path.exists(backup_dir):
-            os.makedirs(backup_dir)
+        """Maak een backup van de running config (enkel als die gewijzigd is)."""
+        store = BackupStore(f"{backup_dir}/store")
         
         config = self.send_show_command("show running-config")
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{backup_dir}/{self.hostname}_{timestamp}.cfg"
-        
-        with open(filename, "w") as f:
-            f.write(config)
+        digest, changed = store.save(self.hostname, config)
+        filename = store.blob_path(digest)
         
-        print(f"Backup opgeslagen: {filename}")
+        if changed:
+            print(f"Backup opgeslagen: {filename}")
+        else:
+            print(f"Config ongewijzigd, bestaande backup: {filename}")
         return filename
     
     def get_interfaces(self):
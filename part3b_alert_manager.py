@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Alert manager
+
+Vervangt de onbegrensde alert lijst van de monitor:
+- Alerts worden gegroepeerd per (device, type, subject); herhalingen verhogen
+  enkel een teller en last_seen in plaats van een nieuwe alert te maken
+- Per severity een suppression window: een herhaling binnen het window wordt
+  geteld maar niet opnieuw getoond
+- Maximaal max_alerts alerts in het geheugen; de minst recent geziene wordt
+  verwijderd (LRU)
+- Console en logbestand output wordt gebufferd en in batches weggeschreven
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+import threading
+import time
+
+
+ICONS = {"CRITICAL": "🔴", "WARNING": "🟡", "INFO": "🟢"}
+
+# Standaard suppression window per severity in seconden
+DEFAULT_SUPPRESSION = {"CRITICAL": 60, "WARNING": 300, "INFO": 3600}
+
+
+class AlertManager:
+    """Gededupliceerde, begrensde alert opslag met gebufferde output."""
+
+    def __init__(self, max_alerts=10000, suppression=None, flush_size=50, log_file=None):
+        self.max_alerts = max_alerts
+        self.suppression = dict(DEFAULT_SUPPRESSION, **(suppression or {}))
+        self.flush_size = flush_size
+        self.log_file = log_file
+        self.alerts = OrderedDict()
+        self.evicted = 0
+        self.suppressed = 0
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def add(self, severity, device, message, alert_type=None, subject=None):
+        """Registreer een alert en return de (eventueel samengevoegde) alert dict."""
+        key = (device, alert_type, subject if subject is not None else message)
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+
+        with self._lock:
+            alert = self.alerts.get(key)
+            if alert is None:
+                alert = {
+                    "timestamp": timestamp,
+                    "severity": severity,
+                    "device": device,
+                    "message": message,
+                    "type": alert_type,
+                    "subject": subject,
+                    "count": 1,
+                    "first_seen": timestamp,
+                    "last_seen": timestamp,
+                    "_last_emitted": now
+                }
+                self.alerts[key] = alert
+                if len(self.alerts) > self.max_alerts:
+                    self.alerts.popitem(last=False)
+                    self.evicted += 1
+                emit = True
+            else:
+                alert["count"] += 1
+                alert["severity"] = severity
+                alert["message"] = message
+                alert["timestamp"] = timestamp
+                alert["last_seen"] = timestamp
+                self.alerts.move_to_end(key)
+                window = self.suppression.get(severity, 0)
+                emit = now - alert["_last_emitted"] >= window
+                if emit:
+                    alert["_last_emitted"] = now
+                else:
+                    self.suppressed += 1
+
+            if emit:
+                repeat = f" (x{alert['count']})" if alert["count"] > 1 else ""
+                icon = ICONS.get(severity, "⚪")
+                self._pending.append(
+                    (f"{icon} [{severity}] {device}: {message}{repeat}",
+                     f"{timestamp} [{severity}] {device}: {message}{repeat}")
+                )
+                if severity == "CRITICAL" or len(self._pending) >= self.flush_size:
+                    self._flush()
+
+        return alert
+
+    def _flush(self):
+        if not self._pending:
+            return
+        print("\n".join(console for console, _ in self._pending))
+        if self.log_file:
+            with open(self.log_file, "a") as f:
+                f.write("\n".join(line for _, line in self._pending) + "\n")
+        self._pending = []
+
+    def flush(self):
+        """Schrijf gebufferde alerts naar console en logbestand."""
+        with self._lock:
+            self._flush()
+
+    def list(self):
+        """Return alle bewaarde alerts (oudste eerst) zonder interne velden."""
+        with self._lock:
+            return [{k: v for k, v in alert.items() if not k.startswith("_")}
+                    for alert in self.alerts.values()]
+
+    def clear(self):
+        """Verwijder alle bewaarde alerts."""
+        with self._lock:
+            self._flush()
+            self.alerts.clear()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - asyncio backend
+
+Asynchrone variant van de NetworkHealthMonitor voor grote netwerken.
+In plaats van één OS thread per netmiko sessie gebruikt deze backend
+asyncssh (non-blocking SSH) zodat duizenden sessies vanuit één proces
+en één event loop kunnen draaien.
+
+Werking per device, langs dezelfde helpers als check_device:
+- TCP pre-probe van de hele inventory en de circuit breaker per device
+- Open een interactieve SSH shell via asyncssh
+- Haal de output van het command plan van alle check plugins op
+- Voer de bestaande parsers/checks van NetworkHealthMonitor uit op die output
+  (dus ook de interface tellers en de time-series, als die store gezet is)
+- Eventuele auto-remediation acties worden daarna als één config-set async
+  uitgevoerd over dezelfde sessie
+- Result en alerts van het device gaan naar de history store, een opname
+  naar de cassette map
+
+De results/alerts structuur is dezelfde als bij de thread-gebaseerde monitor,
+dus generate_report() werkt ongewijzigd. Verschil: de session pool wordt
+niet gebruikt (asyncssh sessies leven enkel binnen één device check), en
+de SQLite/bestand writes van checks en history gebeuren kort in de event loop.
+"""
+
+import asyncio
+import re
+import time
+
+import asyncssh
+
+from part3b_command_batch import BatchSplitError, count_prompts, split_batched_output
+from part3b_check_plugins import build_command_plan, get_checks
+from part3b_network_health_monitor import NetworkHealthMonitor
+from part3b_remediation import make_records
+
+
+# Een IOS prompt aan het einde van de buffer, bv. "R1#", "R1>" of "R1(config-if)#"
+PROMPT_PATTERN = re.compile(r"([\w.\-/]+)(\([^)]*\))?[>#]\s*$")
+
+
+class AsyncDeviceSession:
+    """Non-blocking CLI sessie naar een IOS-XE device via asyncssh."""
+
+    def __init__(self, host, username, password, port=22, timeout=30, **kwargs):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.connection = None
+        self.process = None
+        self.prompt = None
+        self.full_prompt = None
+
+    async def connect(self):
+        """Open SSH verbinding + interactieve shell en zet de terminal klaar."""
+        self.connection = await asyncio.wait_for(
+            asyncssh.connect(
+                self.host,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                known_hosts=None,
+            ),
+            timeout=self.timeout
+        )
+        self.process = await self.connection.create_process(
+            term_type="vt100", term_size=(511, 24)
+        )
+
+        banner = await self._read_until_prompt()
+        match = PROMPT_PATTERN.search(banner)
+        self.prompt = match.group(1)
+        self.full_prompt = match.group(0).strip()
+        await self.send_command("terminal length 0")
+        await self.send_command("terminal width 511")
+
+    async def _read_until_prompt(self):
+        """Lees van de shell tot de prompt terug verschijnt."""
+        buffer = ""
+
+        async def _read():
+            nonlocal buffer
+            while True:
+                chunk = await self.process.stdout.read(65536)
+                if not chunk:
+                    raise ConnectionError(f"{self.host}: sessie onverwacht gesloten")
+                buffer += chunk
+                if PROMPT_PATTERN.search(buffer):
+                    return buffer
+
+        return await asyncio.wait_for(_read(), timeout=self.timeout)
+
+    async def send_command(self, command):
+        """Stuur een command en return de output zonder echo en prompt."""
+        self.process.stdin.write(command + "\n")
+        raw = await self._read_until_prompt()
+
+        lines = re.sub(r"\r+\n", "\n", raw).replace("\r", "").split("\n")
+        # Eerste regel is de echo van het command, laatste de prompt
+        if lines and command in lines[0]:
+            lines = lines[1:]
+        if lines and PROMPT_PATTERN.search(lines[-1]):
+            lines = lines[:-1]
+        return "\n".join(lines).strip("\n")
+
+    async def send_command_batch(self, commands):
+        """Stuur meerdere commands in één write en splits de output per command."""
+        self.process.stdin.write("\n".join(commands) + "\n")
+
+        buffer = ""
+
+        async def _read():
+            nonlocal buffer
+            while True:
+                chunk = await self.process.stdout.read(65536)
+                if not chunk:
+                    raise ConnectionError(f"{self.host}: sessie onverwacht gesloten")
+                buffer += chunk
+                if count_prompts(buffer, self.full_prompt) >= len(commands) and PROMPT_PATTERN.search(buffer):
+                    return buffer
+
+        raw = await asyncio.wait_for(_read(), timeout=self.timeout)
+        try:
+            return split_batched_output(raw, self.full_prompt, commands)
+        except BatchSplitError:
+            # Onbetrouwbare output: sequentieel opnieuw ophalen
+            return {command: await self.send_command(command) for command in commands}
+
+    async def send_config_set(self, commands):
+        """Voer configuratie commands uit in config mode."""
+        output = [await self.send_command("configure terminal")]
+        for command in commands:
+            output.append(await self.send_command(command))
+        output.append(await self.send_command("end"))
+        return "\n".join(output)
+
+    async def disconnect(self):
+        """Sluit de sessie."""
+        if self.connection:
+            self.connection.close()
+            await self.connection.wait_closed()
+            self.connection = None
+
+
+class PrefetchedConnection:
+    """Connection-achtig object dat vooraf opgehaalde output teruggeeft.
+
+    Hiermee kunnen de synchrone check_* methods van NetworkHealthMonitor
+    hergebruikt worden zonder te blokkeren. Config commands worden enkel
+    verzameld en later async uitgevoerd.
+    """
+
+    def __init__(self, outputs, prompt):
+        self.outputs = outputs
+        self.prompt = prompt
+        self.pending_config = []
+
+    def find_prompt(self):
+        return f"{self.prompt}#"
+
+    def send_command(self, command, **kwargs):
+        return self.outputs[command]
+
+    def send_config_set(self, commands, **kwargs):
+        self.pending_config.append(list(commands))
+        return ""
+
+
+class AsyncNetworkHealthMonitor(NetworkHealthMonitor):
+    """NetworkHealthMonitor met een asyncio/asyncssh backend."""
+
+    def __init__(self, devices, max_sessions=5000, **kwargs):
+        # Zelfde opties als NetworkHealthMonitor (history, timeseries, probe_timeout, ...)
+        super().__init__(devices, **kwargs)
+        # Begrenst het aantal gelijktijdige sessies en dus het geheugengebruik
+        self.max_sessions = max_sessions
+
+    async def check_device_async(self, device, semaphore, auto_fix=False):
+        """Voer alle checks uit op een enkel device binnen de event loop.
+        
+        Elke call draait als eigen asyncio task, dus de alerts voor de history
+        worden per device verzameld zoals in een worker thread van check_device.
+        """
+        device_name = device.get("device_name", device["host"])
+        device_params = {k: v for k, v in device.items()
+                         if k not in ("device_name", "device_type")}
+
+        self.start_device_history()
+        if not self.circuit_allows(device):
+            result = {"status": "unreachable"}
+        else:
+            async with semaphore:
+                result = await self._check_session(device, device_name, device_params, auto_fix)
+
+        self.record_device_history(device_name, result)
+        with self._lock:
+            self.results[device_name] = result
+
+    async def _check_session(self, device, device_name, device_params, auto_fix):
+        """Connect, checks en remediation over één asyncssh sessie. Return het result."""
+        session = AsyncDeviceSession(**device_params)
+        try:
+            await session.connect()
+        except Exception as e:
+            self.record_connect(device, e)
+            return {"status": "unreachable"}
+        self.record_connect(device)
+
+        cassette = None
+        try:
+            outputs = {}
+            missing = []
+            for command in build_command_plan(get_checks()).cli:
+                output = self.command_cache.get(device_name, command)
+                if output is None:
+                    missing.append(command)
+                else:
+                    outputs[command] = output
+
+            if self.batch_commands and len(missing) > 1:
+                fetched = await session.send_command_batch(missing)
+            else:
+                fetched = {command: await session.send_command(command) for command in missing}
+            for command, output in fetched.items():
+                self.command_cache.put(device_name, command, output)
+                outputs[command] = output
+
+            conn, cassette = self.start_recording(PrefetchedConnection(outputs, session.prompt),
+                                                  device_name)
+            result = self.run_checks(conn, device_name, auto_fix)
+
+            # Geplande remediation van dit device als één config-set over dezelfde sessie
+            actions, commands = self.remediation.take(device_name)
+            if actions:
+                waited = await asyncio.to_thread(self.remediation.rate_limiter.acquire, len(actions))
+                start = time.monotonic()
+                try:
+                    await session.send_config_set(commands)
+                    outcome, error = "ok", None
+                except Exception as e:
+                    outcome, error = "failed", str(e)
+                self.apply_remediation_records(
+                    result, make_records(actions, outcome, error, waited, time.monotonic() - start))
+
+            self.add_alert("INFO", device_name, "Health check voltooid", "health_check")
+
+        except Exception as e:
+            self.add_alert("CRITICAL", device_name, f"Health check fout: {e}",
+                           "health_check", "error")
+            result = {"status": "error", "error": str(e)}
+        finally:
+            self.save_recording(cassette)
+            await session.disconnect()
+        return result
+
+    async def run_health_check_async(self, auto_fix=False):
+        """Voer de health check uit op alle devices via asyncio."""
+        print("\n" + "=" * 60)
+        print("🔍 NETWORK HEALTH MONITOR (asyncio)")
+        print("=" * 60)
+        print(f"Aantal devices: {len(self.devices)}")
+        print(f"Max gelijktijdige sessies: {self.max_sessions}")
+        print(f"Auto-remediation: {'Aan' if auto_fix else 'Uit'}")
+        print("=" * 60 + "\n")
+
+        if self.command_cache.ttl is None:
+            self.command_cache.clear()
+
+        if self.history is not None:
+            self.history_run_id = self.history.start_run(len(self.devices))
+
+        devices = self.devices
+        if self.probe_timeout is not None:
+            devices = await asyncio.to_thread(self.filter_reachable, devices)
+
+        semaphore = asyncio.Semaphore(self.max_sessions)
+        await asyncio.gather(*(
+            self.check_device_async(device, semaphore, auto_fix)
+            for device in devices
+        ))
+        self.alert_manager.flush()
+
+        if self.history is not None:
+            self.history.finish_run(self.history_run_id)
+        self.generate_report()
+
+    def run_health_check(self, auto_fix=False, max_workers=None):
+        """Synchrone entry point: draait de async health check tot het einde."""
+        asyncio.run(self.run_health_check_async(auto_fix=auto_fix))
+
+
+# Main execution
+if __name__ == "__main__":
+    # Devices configuratie - PAS DIT AAN NAAR JOUW DEVICES
+    devices = [
+        {
+            "device_type": "cisco_ios",
+            "host": "10.176.161.43",
+            "port": 22,
+            "username": "cisco",
+            "password": "cisco123!",
+            "device_name": "CSR1000v-Lab"
+        },
+    ]
+
+    monitor = AsyncNetworkHealthMonitor(devices, max_sessions=5000)
+    monitor.run_health_check(auto_fix=False)
+
+    print("\n✅ Health check voltooid!")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Content-addressed backup store
+
+In plaats van bij elke run een volledig .cfg bestand met timestamp weg te
+schrijven, slaat de backup store elke unieke configuratie maar één keer op:
+
+- De config wordt genormaliseerd (volatiele regels zoals
+  "! Last configuration change" en "ntp clock-period" worden weggelaten)
+- De SHA-256 hash van de genormaliseerde config is de naam van het blob
+- Blobs worden gzip-gecomprimeerd opgeslagen onder objects/<xx>/<hash>.gz
+- Per device houdt een index (index/<device>.jsonl) bij welke hash vanaf
+  welk moment actief was; een nieuwe versie wordt enkel toegevoegd als de
+  config echt veranderd is
+
+Opzoeken van "latest", "as of tijdstip T" en "lijst van versies" gebeurt
+met bisect op de gesorteerde index: O(log n).
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+
+# Regels die veranderen zonder dat de configuratie zelf verandert
+VOLATILE_PATTERNS = re.compile(
+    r"^(Building configuration"
+    r"|Current configuration :"
+    r"|! Last configuration change"
+    r"|! NVRAM config last updated"
+    r"|! No configuration change since last restart"
+    r"|ntp clock-period)"
+)
+
+
+def normalize_config(config):
+    """Verwijder volatiele regels en trailing whitespace."""
+    lines = []
+    for line in config.replace("\r", "").split("\n"):
+        if not VOLATILE_PATTERNS.match(line):
+            lines.append(line.rstrip())
+    return "\n".join(lines).strip("\n") + "\n"
+
+
+def config_hash(config):
+    """SHA-256 van de genormaliseerde configuratie."""
+    return hashlib.sha256(normalize_config(config).encode()).hexdigest()
+
+
+class BackupStore:
+    """Gededupliceerde, gecomprimeerde config backups met een versie-index per device."""
+
+    def __init__(self, root="backups/store"):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_dir = os.path.join(root, "index")
+        for directory in (self.objects_dir, self.index_dir):
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+        # device -> ([timestamps], [hashes]), gesorteerd op timestamp
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest):
+        """Pad van het blob bestand van een hash."""
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.gz")
+
+    def _index_path(self, device):
+        safe_name = re.sub(r"[^\w.\-]", "_", device)
+        return os.path.join(self.index_dir, f"{safe_name}.jsonl")
+
+    def _load_index(self, device):
+        """Laad de versie-index van een device (één keer, daarna uit geheugen)."""
+        index = self._indexes.get(device)
+        if index is None:
+            index = ([], [])
+            if os.path.exists(self._index_path(device)):
+                with open(self._index_path(device)) as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        position = bisect_right(index[0], entry["timestamp"])
+                        index[0].insert(position, entry["timestamp"])
+                        index[1].insert(position, entry["hash"])
+            self._indexes[device] = index
+        return index
+
+    def save(self, device, config, timestamp=None):
+        """Sla een config op. Return (hash, changed).
+
+        changed is False als de genormaliseerde config gelijk is aan de
+        laatste versie van het device; dan wordt er niets geschreven.
+        """
+        timestamp = timestamp if timestamp is not None else time.time()
+        normalized = normalize_config(config)
+        digest = hashlib.sha256(normalized.encode()).hexdigest()
+
+        with self._lock:
+            times, hashes = self._load_index(device)
+            if hashes and hashes[-1] == digest and timestamp >= times[-1]:
+                return digest, False
+
+            blob_path = self.blob_path(digest)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = blob_path + ".tmp"
+                with gzip.open(tmp_path, "wt") as f:
+                    f.write(normalized)
+                os.replace(tmp_path, blob_path)
+
+            position = bisect_right(times, timestamp)
+            times.insert(position, timestamp)
+            hashes.insert(position, digest)
+            with open(self._index_path(device), "a") as f:
+                f.write(json.dumps({"timestamp": timestamp, "hash": digest}) + "\n")
+
+        return digest, True
+
+    def load(self, digest):
+        """Return de (genormaliseerde) config van een blob."""
+        with gzip.open(self.blob_path(digest), "rt") as f:
+            return f.read()
+
+    def versions(self, device):
+        """Lijst van (timestamp, hash) van alle versies van een device, oudste eerst."""
+        with self._lock:
+            times, hashes = self._load_index(device)
+            return list(zip(times, hashes))
+
+    def latest(self, device):
+        """Hash van de laatste versie, of None."""
+        with self._lock:
+            _, hashes = self._load_index(device)
+            return hashes[-1] if hashes else None
+
+    def as_of(self, device, when):
+        """Hash van de versie die actief was op unix tijd when, of None."""
+        with self._lock:
+            times, hashes = self._load_index(device)
+            position = bisect_right(times, when)
+            return hashes[position - 1] if position else None
+
+    def devices(self):
+        """Alle devices met minstens één backup."""
+        return sorted(name[:-len(".jsonl")] for name in os.listdir(self.index_dir)
+                      if name.endswith(".jsonl"))
+
+
+# Main execution: overzicht van de backup store
+if __name__ == "__main__":
+    store = BackupStore()
+
+    print("=" * 60)
+    print("Part 3b: Config Backup Store")
+    print("=" * 60)
+    for device in store.devices():
+        versions = store.versions(device)
+        print(f"\n{device}: {len(versions)} versie(s)")
+        for timestamp, digest in versions[-5:]:
+            when = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            print(f"  {when}  {digest[:12]}")
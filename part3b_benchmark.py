@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Throughput benchmark
+
+Meet de doorvoer van de health monitor tegen de IOS-XE device simulator
+(part3b_device_simulator.py) bij verschillende vlootgroottes:
+
+- devices/minuut voor een volledige run_health_check
+- latency per fase (pre-probe, connect, commands, checks, release, rapport)
+  met p50/p95/max over alle devices
+
+De simulator draait in een apart proces, zodat de SSH server niet om
+dezelfde GIL strijdt als de monitor. Elke run werkt in een eigen tijdelijke
+map (health_reports, circuit breaker, counters) zodat runs elkaar en echte
+rapporten niet beïnvloeden.
+
+    python part3b_benchmark.py --sizes 10 100 1000 --workers 50 --latency 0.05
+"""
+
+from contextlib import redirect_stdout
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from part3b_device_simulator import DeviceSimulator, device_params
+from part3b_network_health_monitor import NetworkHealthMonitor
+
+PHASES = ("probe", "connect", "commands", "checks", "release", "report")
+
+
+class TimedMonitor(NetworkHealthMonitor):
+    """Health monitor die de duur van elke fase per device bijhoudt."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = {phase: [] for phase in PHASES}
+        self._timing_lock = threading.Lock()
+        self._commands_time = threading.local()
+
+    def _record(self, phase, start):
+        with self._timing_lock:
+            self.timings[phase].append(time.perf_counter() - start)
+
+    def filter_reachable(self, devices):
+        start = time.perf_counter()
+        try:
+            return super().filter_reachable(devices)
+        finally:
+            self._record("probe", start)
+
+    def connect_device(self, device):
+        start = time.perf_counter()
+        try:
+            return super().connect_device(device)
+        finally:
+            self._record("connect", start)
+
+    def execute_plan(self, conn, plan, netconf=None):
+        start = time.perf_counter()
+        try:
+            return super().execute_plan(conn, plan, netconf)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._commands_time.value = getattr(self._commands_time, "value", 0.0) + elapsed
+            with self._timing_lock:
+                self.timings["commands"].append(elapsed)
+
+    def run_checks(self, conn, device_name, auto_fix=False, checks=None, netconf=None):
+        # Checks = run_checks zonder de tijd die in execute_plan zat
+        self._commands_time.value = 0.0
+        start = time.perf_counter()
+        try:
+            return super().run_checks(conn, device_name, auto_fix, checks, netconf)
+        finally:
+            with self._timing_lock:
+                self.timings["checks"].append(time.perf_counter() - start - self._commands_time.value)
+
+    def release_device(self, conn, discard=False):
+        start = time.perf_counter()
+        try:
+            return super().release_device(conn, discard)
+        finally:
+            self._record("release", start)
+
+    def generate_report(self):
+        start = time.perf_counter()
+        try:
+            return super().generate_report()
+        finally:
+            self._record("report", start)
+
+
+def _serve_simulator(count, base_port, latency, jitter, ready, stop):
+    """Draait in een apart proces: simulator starten tot stop gezet wordt."""
+    simulator = DeviceSimulator(count, base_port, latency, jitter).start()
+    ready.set()
+    stop.wait()
+    simulator.stop()
+
+
+def percentiles(values):
+    """p50/p95/max in milliseconden (None zonder metingen)."""
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    data = np.array(values) * 1000
+    return {"p50": round(float(np.percentile(data, 50)), 1),
+            "p95": round(float(np.percentile(data, 95)), 1),
+            "max": round(float(data.max()), 1)}
+
+
+def run_benchmark(size, workers, base_port=20022, latency=0.0, jitter=0.0):
+    """Eén benchmark run met size gesimuleerde devices. Return een resultaat dict."""
+    ready = multiprocessing.Event()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve_simulator,
+                                     args=(size, base_port, latency, jitter, ready, stop),
+                                     daemon=True)
+    server.start()
+    if not ready.wait(60):
+        server.terminate()
+        raise RuntimeError("Simulator niet gestart binnen 60 s")
+
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="health_benchmark_")
+    os.chdir(workdir)
+    try:
+        monitor = TimedMonitor(device_params(size, base_port), max_workers=workers)
+        start = time.perf_counter()
+        # De monitor print per device; voor de benchmark enkel de cijfers
+        with redirect_stdout(io.StringIO()):
+            monitor.run_health_check()
+        duration = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+        stop.set()
+        server.join(10)
+
+    checked = sum(1 for result in monitor.results.values() if result.get("status") == "checked")
+    return {
+        "devices": size,
+        "workers": workers,
+        "latency": latency,
+        "checked": checked,
+        "duration": round(duration, 2),
+        "devices_per_minute": round(checked / duration * 60, 1),
+        "phases": {phase: percentiles(monitor.timings[phase]) for phase in PHASES},
+        "workdir": workdir
+    }
+
+
+def print_result(result):
+    print(f"\n{result['devices']} devices, {result['workers']} workers, "
+          f"latency {result['latency']} s/command")
+    print(f"  Gecontroleerd: {result['checked']}/{result['devices']} in {result['duration']} s "
+          f"-> {result['devices_per_minute']} devices/minuut")
+    print(f"  {'fase':<10} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for phase, stats in result["phases"].items():
+        if stats["p50"] is None:
+            continue
+        print(f"  {phase:<10} {stats['p50']:>10} {stats['p95']:>10} {stats['max']:>10}")
+
+
+# Main execution: benchmark bij oplopende vlootgroottes
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Health monitor throughput benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Aantal gesimuleerde devices per run")
+    parser.add_argument("--workers", type=int, default=50, help="Parallelle workers van de monitor")
+    parser.add_argument("--latency", type=float, default=0.0, help="Vertraging per command (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra willekeurige vertraging (s)")
+    parser.add_argument("--base-port", type=int, default=20022, help="Poort van het eerste device")
+    parser.add_argument("-o", "--output", help="Schrijf de resultaten ook als JSON")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Part 3b: Health Monitor Benchmark")
+    print("=" * 60)
+
+    results = []
+    for size in args.sizes:
+        result = run_benchmark(size, args.workers, args.base_port, args.latency, args.jitter)
+        print_result(result)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultaten: {args.output}")
@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Sessie cassettes (record/replay)
+
+Om de parsers en checks te tunen hoef je niet telkens een live sessie te
+openen. Een RecordingConnection rond de netmiko verbinding (of een
+RecordingNetconf rond een ncclient manager) schrijft elke interactie weg:
+
+- CLI: command -> output, config-set -> output, en de prompt
+- NETCONF: RPC (operatie + genormaliseerde filter/config) -> reply XML
+
+Per sessie wordt één cassette bewaard als gzip JSON (enkele KB per device).
+Een ReplayConnection / ReplayNetconf speelt de cassette daarna offline af,
+aan geheugensnelheid, met exact dezelfde interface als de echte verbinding.
+
+    python part3b_cassette.py replay health_reports/cassettes -o results.ndjson
+    python part3b_cassette.py replay health_reports/cassettes --compare results.ndjson
+
+De replay draait alle parsers en checks van de monitor over duizenden
+cassettes in seconden en vergelijkt optioneel met een vorige run
+(regressietest van de parsers).
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime
+import argparse
+import gzip
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+from lxml import etree
+
+from part3b_command_batch import send_command_batch
+from part3b_interface_counters import CounterStore
+
+CASSETTE_VERSION = 1
+CASSETTE_SUFFIX = ".json.gz"
+
+
+class CassetteMiss(KeyError):
+    """Replay: de gevraagde interactie staat niet in de cassette."""
+
+
+def _normalize_xml(xml):
+    """Whitespace tussen tags weg, zodat dezelfde filter/config altijd dezelfde key geeft."""
+    return re.sub(r">\s+<", "><", xml.strip())
+
+
+def rpc_key(operation, **params):
+    """Key van een NETCONF RPC: operatie + genormaliseerde parameters."""
+    normalized = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, (tuple, list)):
+            value = [_normalize_xml(item) if isinstance(item, str) else item for item in value]
+        elif isinstance(value, str):
+            value = _normalize_xml(value)
+        normalized[name] = value
+    return json.dumps([operation, normalized], sort_keys=True)
+
+
+class Cassette:
+    """Opgenomen interacties van één sessie met één device."""
+
+    def __init__(self, device_name, prompt=None, interactions=None, recorded_at=None):
+        self.device_name = device_name
+        self.prompt = prompt
+        self.interactions = interactions or []
+        self.recorded_at = recorded_at if recorded_at is not None else time.time()
+        self.path = None
+        self._lock = threading.Lock()
+        self._positions = {}
+        self._index = None
+
+    def record(self, kind, key, response):
+        """Voeg een interactie toe (kind: 'command', 'config_set' of 'rpc')."""
+        with self._lock:
+            self.interactions.append({"kind": kind, "key": key, "response": response})
+            self._index = None
+
+    def play(self, kind, key):
+        """Return de volgende opgenomen response voor (kind, key).
+
+        Werd dezelfde interactie meerdere keren opgenomen, dan komen de
+        responses in volgorde terug; daarna blijft de laatste herhalen.
+        """
+        with self._lock:
+            if self._index is None:
+                self._index = {}
+                for interaction in self.interactions:
+                    self._index.setdefault((interaction["kind"], interaction["key"]), []).append(
+                        interaction["response"])
+            responses = self._index.get((kind, key))
+            if not responses:
+                raise CassetteMiss(f"{self.device_name}: geen opname voor {kind} {key!r}")
+            position = self._positions.get((kind, key), 0)
+            self._positions[(kind, key)] = position + 1
+            return responses[min(position, len(responses) - 1)]
+
+    def commands(self):
+        """{command: output} van alle opgenomen CLI commands (laatste opname wint)."""
+        return {interaction["key"]: interaction["response"]
+                for interaction in self.interactions if interaction["kind"] == "command"}
+
+    def save(self, directory):
+        """Schrijf de cassette als gzip JSON in directory. Return het pad."""
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        safe_name = re.sub(r"[^\w.\-]", "_", self.device_name)
+        stamp = datetime.fromtimestamp(self.recorded_at).strftime("%Y%m%d_%H%M%S_%f")
+        path = os.path.join(directory, f"{safe_name}_{stamp}{CASSETTE_SUFFIX}")
+        data = {
+            "version": CASSETTE_VERSION,
+            "device": self.device_name,
+            "prompt": self.prompt,
+            "recorded_at": self.recorded_at,
+            "interactions": self.interactions
+        }
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(data, f, separators=(",", ":"))
+        self.path = path
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"{path}: onbekende cassette versie {data.get('version')}")
+        cassette = cls(data["device"], data.get("prompt"), data["interactions"], data["recorded_at"])
+        cassette.path = path
+        return cassette
+
+
+def find_cassettes(paths):
+    """Alle cassette bestanden in de gegeven bestanden/directories (recursief)."""
+    found = []
+    for path in map(os.path.abspath, paths):
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, name) for name in files if name.endswith(CASSETTE_SUFFIX))
+        elif path.endswith(CASSETTE_SUFFIX):
+            found.append(path)
+    return sorted(found)
+
+
+# ---------------------------------------------------------------------------
+# CLI (netmiko)
+# ---------------------------------------------------------------------------
+
+class RecordingConnection:
+    """Wrapper rond een netmiko verbinding die elke interactie in een cassette opneemt."""
+
+    def __init__(self, conn, cassette):
+        self.conn = conn
+        self.cassette = cassette
+
+    def find_prompt(self, *args, **kwargs):
+        prompt = self.conn.find_prompt(*args, **kwargs)
+        self.cassette.prompt = prompt
+        return prompt
+
+    def send_command(self, command, **kwargs):
+        output = self.conn.send_command(command, **kwargs)
+        self.cassette.record("command", command, output)
+        return output
+
+    def send_command_batch(self, commands):
+        if hasattr(self.conn, "send_command_batch"):
+            outputs = self.conn.send_command_batch(commands)
+        else:
+            outputs = send_command_batch(self.conn, commands)
+        for command in commands:
+            self.cassette.record("command", command, outputs[command])
+        return outputs
+
+    def send_config_set(self, commands, **kwargs):
+        output = self.conn.send_config_set(commands, **kwargs)
+        self.cassette.record("config_set", "\n".join(commands), output)
+        return output
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+class ReplayConnection:
+    """Offline stand-in voor een netmiko verbinding die een cassette afspeelt."""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    def find_prompt(self, *args, **kwargs):
+        return self.cassette.prompt or f"{self.cassette.device_name}#"
+
+    def send_command(self, command, **kwargs):
+        return self.cassette.play("command", command)
+
+    def send_command_batch(self, commands):
+        return {command: self.cassette.play("command", command) for command in commands}
+
+    def send_config_set(self, commands, **kwargs):
+        return self.cassette.play("config_set", "\n".join(commands))
+
+    def disconnect(self):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# NETCONF (ncclient)
+# ---------------------------------------------------------------------------
+
+class RecordingNetconf:
+    """Wrapper rond een ncclient manager die RPC's en replies in een cassette opneemt."""
+
+    def __init__(self, manager, cassette):
+        self.manager = manager
+        self.cassette = cassette
+
+    def get(self, filter=None, **kwargs):
+        reply = self.manager.get(filter=filter, **kwargs)
+        self.cassette.record("rpc", rpc_key("get", filter=filter), reply.xml)
+        return reply
+
+    def get_config(self, source, filter=None, **kwargs):
+        reply = self.manager.get_config(source, filter=filter, **kwargs)
+        self.cassette.record("rpc", rpc_key("get-config", source=source, filter=filter), reply.xml)
+        return reply
+
+    def edit_config(self, config, target="running", **kwargs):
+        reply = self.manager.edit_config(config, target=target, **kwargs)
+        self.cassette.record("rpc", rpc_key("edit-config", target=target, config=config), reply.xml)
+        return reply
+
+    def __getattr__(self, name):
+        return getattr(self.manager, name)
+
+
+class ReplayReply:
+    """Minimale ncclient reply: xml, ok, errors, data_ele en data_xml."""
+
+    NC_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+    def __init__(self, xml):
+        self.xml = xml
+        self._root = None
+
+    def _parse(self):
+        if self._root is None:
+            self._root = etree.fromstring(self.xml.encode(), etree.XMLParser(huge_tree=True))
+        return self._root
+
+    @property
+    def errors(self):
+        return self._parse().findall(f"{{{self.NC_NS}}}rpc-error")
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    @property
+    def data_ele(self):
+        return self._parse().find(f"{{{self.NC_NS}}}data")
+
+    @property
+    def data_xml(self):
+        # Zelfde serialisatie als ncclient (to_xml): UTF-8 met XML declaratie
+        data = self.data_ele
+        if data is None:
+            return None
+        xml = etree.tostring(data, encoding="UTF-8", xml_declaration=False).decode("UTF-8")
+        return f'<?xml version="1.0" encoding="UTF-8"?>{xml}'
+
+
+class ReplayNetconf:
+    """Offline stand-in voor een ncclient manager die een cassette afspeelt."""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+        self.connected = True
+
+    def get(self, filter=None, **kwargs):
+        return ReplayReply(self.cassette.play("rpc", rpc_key("get", filter=filter)))
+
+    def get_config(self, source, filter=None, **kwargs):
+        return ReplayReply(self.cassette.play("rpc", rpc_key("get-config", source=source, filter=filter)))
+
+    def edit_config(self, config, target="running", **kwargs):
+        return ReplayReply(self.cassette.play("rpc", rpc_key("edit-config", target=target, config=config)))
+
+    def close_session(self):
+        self.connected = False
+
+
+# ---------------------------------------------------------------------------
+# Offline replay door de checks van de monitor
+# ---------------------------------------------------------------------------
+
+class _ReplayCounterStore(CounterStore):
+    """Rekent interface rates met het opnametijdstip van de cassette in plaats van de klok."""
+
+    recorded_at = None
+
+    def update(self, device, interfaces, timestamp=None):
+        return super().update(device, interfaces, self.recorded_at if timestamp is None else timestamp)
+
+
+def replay(paths, checks=None):
+    """Speel cassettes af door de parsers en checks van de health monitor.
+
+    Cassettes worden chronologisch afgespeeld, zodat interface rates tussen
+    opeenvolgende opnames van hetzelfde device kloppen. Zonder checks draait
+    elke cassette de checks (behalve backup) waarvan alle commands opgenomen
+    zijn; daemon cassettes bevatten enkel de checks van die tick. De monitor draait in
+    een tijdelijke map (rapporten, counters). Return (records, timings) met
+    per cassette het resultaat en de alerts, en de totale tijd per fase.
+    """
+    # Hier pas importeren: de monitor importeert zelf deze module
+    from part3b_check_plugins import get_checks, parse_outputs
+    from part3b_network_health_monitor import NetworkHealthMonitor
+
+    default_checks = [check for check in get_checks() if check.name != "backup"]
+    timings = {"load": 0.0, "parse": 0.0, "checks": 0.0}
+
+    cassettes = []
+    start = time.perf_counter()
+    for path in find_cassettes(paths):
+        cassettes.append(Cassette.load(path))
+    timings["load"] = time.perf_counter() - start
+    cassettes.sort(key=lambda cassette: (cassette.recorded_at, cassette.path))
+
+    records = []
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="cassette_replay_")
+    os.chdir(workdir)
+    try:
+        # Alert output van de monitor hoort niet in de replay output
+        with redirect_stdout(io.StringIO()):
+            monitor = NetworkHealthMonitor([], probe_timeout=None)
+            monitor.interface_counters = _ReplayCounterStore(f"{monitor.report_dir}/counters")
+
+            for cassette in cassettes:
+                recorded = cassette.commands()
+                # Parse cost apart gemeten: enkel de parsers, zonder check logica
+                start = time.perf_counter()
+                parse_outputs(recorded)
+                timings["parse"] += time.perf_counter() - start
+
+                check_objects = get_checks(checks) if checks else [
+                    check for check in default_checks
+                    if all(command in recorded for command in check.commands)]
+
+                monitor.interface_counters.recorded_at = cassette.recorded_at
+                monitor.start_device_history()
+                start = time.perf_counter()
+                try:
+                    if not check_objects:
+                        raise CassetteMiss(f"{cassette.device_name}: geen enkele check volledig opgenomen")
+                    result = monitor.run_checks(ReplayConnection(cassette), cassette.device_name,
+                                                checks=check_objects)
+                except CassetteMiss as e:
+                    result = {"status": "error", "error": str(e)}
+                timings["checks"] += time.perf_counter() - start
+                alerts = monitor.record_device_history(cassette.device_name, result)
+
+                records.append({
+                    "cassette": os.path.relpath(cassette.path, cwd),
+                    "device": cassette.device_name,
+                    "recorded_at": cassette.recorded_at,
+                    "result": result,
+                    "alerts": sorted([alert["severity"], alert.get("type") or "", alert.get("subject") or "",
+                                      alert["message"]] for alert in alerts)
+                })
+    finally:
+        os.chdir(cwd)
+    return records, timings
+
+
+def compare(records, previous_file):
+    """Vergelijk replay records met een vorige NDJSON. Return lijst van (cassette, verschil)."""
+    previous = {}
+    with open(previous_file) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                previous[record["cassette"]] = record
+
+    differences = []
+    for record in records:
+        old = previous.get(record["cassette"])
+        if old is None:
+            differences.append((record["cassette"], "nieuw (niet in de vorige run)"))
+            continue
+        # Via JSON vergelijken: tuples/lists en float afronding zoals in het bestand
+        current = json.loads(json.dumps(record, default=str))
+        for key in ("result", "alerts"):
+            if current[key] != old[key]:
+                differences.append((record["cassette"], f"{key} verschilt"))
+    return differences
+
+
+# Main execution: cassettes offline afspelen door de checks
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sessie cassettes offline afspelen")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay_parser = subparsers.add_parser("replay", help="Speel cassettes af door de parsers en checks")
+    replay_parser.add_argument("paths", nargs="+", help="Cassette bestanden of directories")
+    replay_parser.add_argument("--checks", nargs="+", help="Enkel deze checks (standaard alles behalve backup)")
+    replay_parser.add_argument("-o", "--output", help="Schrijf resultaten als NDJSON")
+    replay_parser.add_argument("--compare", help="Vergelijk met de NDJSON van een vorige replay")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Part 3b: Cassette Replay")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    records, timings = replay(args.paths, args.checks)
+    duration = time.perf_counter() - start
+
+    errors = sum(1 for record in records if record["result"].get("status") == "error")
+    print(f"Cassettes: {len(records)} ({errors} met ontbrekende opnames)")
+    print(f"Duur: {duration:.2f}s -> {len(records) / duration if duration else 0:.0f} sessies/s")
+    print(f"  laden:   {timings['load'] * 1000:.1f} ms")
+    print(f"  parsen:  {timings['parse'] * 1000:.1f} ms")
+    print(f"  checks:  {timings['checks'] * 1000:.1f} ms (inclusief parsen)")
+
+    if args.compare:
+        differences = compare(records, args.compare)
+        print(f"\nVergelijking met {args.compare}: {len(differences)} verschil(len)")
+        for cassette, difference in differences[:20]:
+            print(f"  {cassette}: {difference}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+        print(f"\nResultaten: {args.output}")
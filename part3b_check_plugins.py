@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Check plugins
+
+Elke health check is een plugin die declareert welke CLI commands (of
+NETCONF filters) hij nodig heeft. Voor een device wordt eerst een
+command plan gebouwd: de gededupliceerde lijst van alle commands van alle
+actieve checks. Elk command gaat dus maar één keer naar het device, hoeveel
+checks het ook gebruiken. De output wordt één keer geparsed en daarna aan
+elke check doorgegeven.
+
+Een nieuwe check toevoegen:
+
+    @register_check
+    class NtpCheck(HealthCheck):
+        name = "ntp"
+        commands = ["show ntp status"]
+
+        def evaluate(self, monitor, device_name, outputs):
+            synced = "synchronized" in outputs["show ntp status"]
+            if not synced:
+                monitor.add_alert("WARNING", device_name, "NTP niet gesynchroniseerd")
+            return {"synchronized": synced}
+"""
+
+import re
+
+from part3b_compliance import load_engine
+from part3b_interface_counters import parse_show_interfaces
+
+# name -> check instantie, in volgorde van registratie
+CHECK_REGISTRY = {}
+
+# command -> parser functie (raw output -> gestructureerde data)
+PARSERS = {}
+
+
+def register_check(cls):
+    """Class decorator: registreer een check plugin."""
+    CHECK_REGISTRY[cls.name] = cls()
+    return cls
+
+
+def register_parser(command):
+    """Decorator: registreer een parser voor de output van een command."""
+    def decorator(func):
+        PARSERS[command] = func
+        return func
+    return decorator
+
+
+class HealthCheck:
+    """Basisklasse voor een health check plugin."""
+
+    name = None
+    # Key in het results dict van het device (standaard gelijk aan name)
+    result_key = None
+    # CLI commands die de check nodig heeft
+    commands = []
+    # NETCONF subtree filters die de check nodig heeft
+    netconf_filters = []
+
+    def __init__(self):
+        if self.result_key is None:
+            self.result_key = self.name
+
+    def evaluate(self, monitor, device_name, outputs):
+        """Evalueer de (geparste) outputs en return het resultaat van de check."""
+        raise NotImplementedError
+
+
+class CommandPlan:
+    """Gededupliceerde lijst van CLI commands en NETCONF filters voor een device."""
+
+    def __init__(self, cli=None, netconf=None):
+        self.cli = cli or []
+        self.netconf = netconf or []
+
+    def __len__(self):
+        return len(self.cli) + len(self.netconf)
+
+    def __repr__(self):
+        return f"CommandPlan(cli={self.cli}, netconf={len(self.netconf)} filter(s))"
+
+
+def build_command_plan(checks):
+    """Bouw een minimaal command plan voor een lijst checks (volgorde blijft behouden)."""
+    cli = []
+    netconf = []
+    for check in checks:
+        for command in check.commands:
+            if command not in cli:
+                cli.append(command)
+        for netconf_filter in check.netconf_filters:
+            if netconf_filter not in netconf:
+                netconf.append(netconf_filter)
+    return CommandPlan(cli, netconf)
+
+
+def get_checks(names=None):
+    """Return de check instanties voor de gegeven namen (standaard alle checks)."""
+    if names is None:
+        return list(CHECK_REGISTRY.values())
+    return [CHECK_REGISTRY[name] for name in names]
+
+
+def parse_outputs(raw_outputs):
+    """Parse elke output één keer; commands zonder parser blijven raw tekst."""
+    parsed = {}
+    for key, output in raw_outputs.items():
+        parser = PARSERS.get(key)
+        parsed[key] = parser(output) if parser else output
+    return parsed
+
+
+# ---------------------------------------------------------------------------
+# Parsers
+# ---------------------------------------------------------------------------
+
+@register_parser("show ip interface brief")
+def parse_ip_interface_brief(output):
+    """Parse 'show ip interface brief' naar een lijst van interface dicts."""
+    interfaces = []
+    for line in output.strip().split("\n")[1:]:  # Skip header
+        parts = line.split()
+        if len(parts) >= 6:
+            interfaces.append({
+                "name": parts[0],
+                "ip": parts[1],
+                "status": parts[4],
+                "protocol": parts[5]
+            })
+    return interfaces
+
+
+# Volledige interface tellers (input/output errors, CRC, drops, packets)
+register_parser("show interfaces")(parse_show_interfaces)
+
+
+@register_parser("show processes cpu | include CPU")
+def parse_cpu(output):
+    """Return CPU usage (five seconds) als int of None."""
+    cpu_match = re.search(r'(\d+)%', output)
+    return int(cpu_match.group(1)) if cpu_match else None
+
+
+@register_parser("show memory statistics | include Processor")
+def parse_memory(output):
+    """Return (total, used, free) van de Processor pool of None."""
+    mem_match = re.search(r'Processor\s+(\d+)\s+(\d+)\s+(\d+)', output)
+    if not mem_match:
+        return None
+    return tuple(int(mem_match.group(i)) for i in range(1, 4))
+
+
+@register_parser("show ip route summary")
+def parse_route_summary(output):
+    """Return het aantal routes per bron (connected/static/ospf)."""
+    routes = {}
+    for line in output.split("\n"):
+        for source in ("connected", "static", "ospf"):
+            if source in line.lower():
+                match = re.search(r'(\d+)', line)
+                if match:
+                    routes[source] = int(match.group(1))
+                break
+    return routes
+
+
+@register_parser("show ip ospf neighbor")
+def parse_ospf_neighbors(output):
+    """Return het aantal OSPF neighbors in FULL state."""
+    return output.count("FULL")
+
+
+# ---------------------------------------------------------------------------
+# Ingebouwde checks
+# ---------------------------------------------------------------------------
+
+@register_check
+class InterfaceCheck(HealthCheck):
+    """Check interface status en statistieken."""
+
+    name = "interfaces"
+    commands = ["show ip interface brief", "show interfaces"]
+
+    def evaluate(self, monitor, device_name, outputs):
+        results = {"interfaces": [], "issues": []}
+
+        for iface in outputs["show ip interface brief"]:
+            results["interfaces"].append(iface)
+
+            # Check for down interfaces (exclude admin down)
+            if iface["status"] == "down" and iface["protocol"] == "down":
+                if "Loopback" not in iface["name"]:  # Ignore loopbacks
+                    monitor.add_alert("WARNING", device_name,
+                                      f"Interface {iface['name']} is down",
+                                      "interface_down", iface["name"])
+                    results["issues"].append(f"{iface['name']} is down")
+
+        # Error/drop rates t.o.v. de vorige poll in plaats van absolute tellers
+        rates = monitor.interface_counters.update(device_name, outputs["show interfaces"])
+        results["counter_rates"] = rates
+        for iface, counter, rate in monitor.interface_counters.exceeded(rates):
+            monitor.add_alert("WARNING", device_name,
+                              f"Interface {iface}: {counter} {rate:.2f}/s",
+                              "interface_errors", f"{iface} {counter}")
+
+        if monitor.timeseries is not None:
+            monitor.timeseries.record(device_name, "interfaces_down", len(results["issues"]))
+
+        return results
+
+
+@register_check
+class ResourceCheck(HealthCheck):
+    """Check CPU en memory usage."""
+
+    name = "resources"
+    commands = ["show processes cpu | include CPU", "show memory statistics | include Processor"]
+
+    def evaluate(self, monitor, device_name, outputs):
+        results = {"cpu": "unknown", "memory": "unknown"}
+
+        cpu_usage = outputs["show processes cpu | include CPU"]
+        if cpu_usage is not None:
+            results["cpu"] = f"{cpu_usage}%"
+            if monitor.timeseries is not None:
+                monitor.timeseries.record(device_name, "cpu", cpu_usage)
+
+            if cpu_usage > 80:
+                monitor.add_alert("CRITICAL", device_name, f"Hoge CPU usage: {cpu_usage}%",
+                                  "cpu", "cpu")
+            elif cpu_usage > 60:
+                monitor.add_alert("WARNING", device_name, f"Verhoogde CPU usage: {cpu_usage}%",
+                                  "cpu", "cpu")
+
+        memory = outputs["show memory statistics | include Processor"]
+        if memory is not None:
+            total, used, free = memory
+            usage_pct = (used / total) * 100 if total > 0 else 0
+            results["memory"] = f"{usage_pct:.1f}%"
+            if monitor.timeseries is not None:
+                monitor.timeseries.record(device_name, "memory", usage_pct)
+
+            if usage_pct > 85:
+                monitor.add_alert("CRITICAL", device_name, f"Hoge memory usage: {usage_pct:.1f}%",
+                                  "memory", "memory")
+            elif usage_pct > 70:
+                monitor.add_alert("WARNING", device_name, f"Verhoogde memory usage: {usage_pct:.1f}%",
+                                  "memory", "memory")
+
+        return results
+
+
+@register_check
+class RoutingCheck(HealthCheck):
+    """Check routing table health."""
+
+    name = "routing"
+    commands = ["show ip route summary", "show ip ospf neighbor"]
+
+    def evaluate(self, monitor, device_name, outputs):
+        results = {
+            "routes": outputs["show ip route summary"],
+            "ospf_neighbors": outputs["show ip ospf neighbor"]
+        }
+
+        if results["ospf_neighbors"]:
+            monitor.add_alert("INFO", device_name,
+                              f"OSPF: {results['ospf_neighbors']} neighbor(s) in FULL state",
+                              "ospf", "neighbors")
+
+        return results
+
+
+@register_check
+class SecurityCheck(HealthCheck):
+    """Check security configuratie."""
+
+    name = "security"
+    commands = ["show running-config"]
+
+    def evaluate(self, monitor, device_name, outputs):
+        # Alle regels uit de rule file in één pass over de running-config
+        rules_file = monitor.compliance_rules
+        results = load_engine(rules_file).evaluate(outputs["show running-config"])
+
+        checks = {}
+        for rule_id, result in results.items():
+            checks[rule_id] = result["passed"]
+            if not result["passed"]:
+                monitor.add_alert(result["severity"], device_name,
+                                  f"Security check gefaald: {rule_id}",
+                                  "security", rule_id)
+
+        return checks
+
+
+@register_check
+class BackupCheck(HealthCheck):
+    """Maak een config backup (deelt 'show running-config' met SecurityCheck)."""
+
+    name = "backup"
+    result_key = "backup_file"
+    commands = ["show running-config"]
+
+    def evaluate(self, monitor, device_name, outputs):
+        return monitor.write_backup(device_name, outputs["show running-config"])
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Circuit breaker per device
+
+Een device dat telkens faalt (authenticatie, timeout) kost bij elke cyclus
+opnieuw de volledige connect timeout. De circuit breaker houdt per device
+een toestand bij:
+
+- closed: normaal, elke connect wordt geprobeerd
+- open: na failure_threshold opeenvolgende fouten; connects worden
+  overgeslagen tot de backoff verstreken is
+- half_open: na de backoff mag precies één probe-connect door; lukt die,
+  dan gaat het circuit terug dicht, faalt hij, dan opnieuw open met een
+  dubbel zo lange backoff
+
+De backoff groeit exponentieel (base_delay * 2^n, max max_delay) met jitter,
+zodat niet alle kapotte devices tegelijk opnieuw geprobeerd worden. De
+toestand wordt als JSON bewaard en overleeft dus een herstart.
+"""
+
+from datetime import datetime
+import json
+import os
+import random
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker met exponentiële backoff per device, persistent in JSON."""
+
+    def __init__(self, path="health_reports/circuit_breaker.json", failure_threshold=3,
+                 base_delay=60, max_delay=3600, jitter=0.2, probe_timeout=300):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        # Een probe die langer dan dit "bezig" is (bv. crash) telt niet meer
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self.devices = {}
+
+        if os.path.exists(path):
+            with open(path) as f:
+                self.devices = json.load(f)
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.devices, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _entry(self, device):
+        return self.devices.setdefault(device, {"state": CLOSED, "failures": 0,
+                                                "retry_at": 0, "last_error": None})
+
+    def allow(self, device):
+        """True als er nu een connect naar het device geprobeerd mag worden."""
+        now = time.time()
+        with self._lock:
+            entry = self.devices.get(device)
+            if entry is None or entry["state"] == CLOSED:
+                return True
+            if entry["state"] == HALF_OPEN:
+                # Er loopt al een probe; enkel een vastgelopen probe wordt vervangen
+                if now - entry.get("probe_started", 0) < self.probe_timeout:
+                    return False
+            elif now < entry["retry_at"]:
+                return False
+
+            entry["state"] = HALF_OPEN
+            entry["probe_started"] = now
+            self._save()
+            return True
+
+    def record_success(self, device):
+        """Connect gelukt: circuit dicht en teller op nul."""
+        with self._lock:
+            entry = self.devices.get(device)
+            if entry is None or (entry["state"] == CLOSED and entry["failures"] == 0):
+                return
+            self.devices[device] = {"state": CLOSED, "failures": 0, "retry_at": 0, "last_error": None}
+            self._save()
+
+    def record_failure(self, device, error=None):
+        """Connect gefaald. Return de toestand na de fout."""
+        now = time.time()
+        with self._lock:
+            entry = self._entry(device)
+            entry["failures"] += 1
+            entry["last_error"] = str(error) if error is not None else None
+            entry.pop("probe_started", None)
+
+            if entry["state"] == HALF_OPEN or entry["failures"] >= self.failure_threshold:
+                exponent = max(0, entry["failures"] - self.failure_threshold)
+                delay = min(self.max_delay, self.base_delay * (2 ** exponent))
+                delay *= 1 + random.uniform(-self.jitter, self.jitter)
+                entry["state"] = OPEN
+                entry["retry_at"] = now + delay
+            self._save()
+            return entry["state"]
+
+    def retry_at(self, device):
+        """Tijdstip (unix tijd) van de volgende toegelaten poging, of None."""
+        with self._lock:
+            entry = self.devices.get(device)
+            return entry["retry_at"] if entry and entry["state"] == OPEN else None
+
+    def stats(self):
+        """Aantal devices per toestand."""
+        with self._lock:
+            counts = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+            for entry in self.devices.values():
+                counts[entry["state"]] += 1
+            return counts
+
+
+# Main execution: overzicht van de circuit breaker toestand
+if __name__ == "__main__":
+    breaker = CircuitBreaker()
+
+    print("=" * 60)
+    print("Part 3b: Circuit Breaker Status")
+    print("=" * 60)
+    for device, entry in sorted(breaker.devices.items()):
+        line = f"  {device}: {entry['state']} ({entry['failures']} fout(en))"
+        if entry["state"] == OPEN:
+            line += f", volgende poging {datetime.fromtimestamp(entry['retry_at']).strftime('%Y-%m-%d %H:%M:%S')}"
+        print(line)
+        if entry.get("last_error"):
+            print(f"      laatste fout: {entry['last_error'][:100]}")
+    print(f"\nTotaal: {breaker.stats()}")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Command batching
+
+Stuur meerdere show commands in één write naar het device in plaats van
+per command op de prompt te wachten. De gecombineerde output wordt daarna
+opgesplitst op de prompt + command echo:
+
+    show ip interface brief          <- echo command 1
+    ...output 1...
+    R1#show ip route summary         <- prompt + echo command 2
+    ...output 2...
+    R1#                              <- laatste prompt
+
+Zo kost een batch ongeveer één round trip in plaats van één per command.
+"""
+
+import re
+import time
+
+
+class BatchSplitError(Exception):
+    """De gecombineerde output kon niet betrouwbaar opgesplitst worden."""
+
+
+def normalize_output(raw):
+    """Zet CRLF/CR line endings om naar LF."""
+    return re.sub(r"\r+\n", "\n", raw).replace("\r", "")
+
+
+def count_prompts(raw, prompt):
+    """Tel hoe vaak de prompt aan het begin van een regel voorkomt."""
+    return len(re.findall(rf"(?m)^{re.escape(prompt)}", normalize_output(raw)))
+
+
+def strip_before_echo(raw, prompt, command):
+    """Return de (genormaliseerde) output vanaf de echo van command, of None als die er nog niet is.
+
+    Alles ervoor wordt weggegooid: lege regels en oude prompts die nog van
+    find_prompt() in het kanaal stonden (netmiko stuurt soms meerdere enters).
+    """
+    text = normalize_output(raw)
+    match = re.search(rf"(?m)^(?:{re.escape(prompt)})?({re.escape(command)})[ \t]*$", text)
+    if match is None:
+        return None
+    return text[match.start(1):]
+
+
+def split_batched_output(raw, prompt, commands):
+    """Splits de gecombineerde output van een batch in een dict command -> output.
+
+    raw bevat de echo van het eerste command (eventueel voorafgegaan door lege
+    regels of oude prompts) en eindigt met de prompt na het laatste command.
+    """
+    body = strip_before_echo(raw, prompt, commands[0])
+    if body is None:
+        raise BatchSplitError(f"geen echo van '{commands[0]}' gevonden")
+    segments = re.split(rf"(?m)^{re.escape(prompt)}", body)
+    # Laatste segment is wat na de laatste prompt staat (normaal leeg)
+    if len(segments) != len(commands) + 1 or segments[-1].strip():
+        raise BatchSplitError(
+            f"verwacht {len(commands)} outputs, kreeg {len(segments) - 1} prompt(s)"
+        )
+
+    outputs = {}
+    for command, segment in zip(commands, segments):
+        lines = segment.lstrip("\n").split("\n")
+        if lines[0].strip() != command:
+            raise BatchSplitError(f"echo '{lines[0].strip()}' hoort niet bij '{command}'")
+        outputs[command] = "\n".join(lines[1:]).strip("\n")
+    return outputs
+
+
+def send_command_batch(conn, commands, read_timeout=30):
+    """Stuur een batch show commands via een netmiko connectie in één write.
+
+    Valt terug op gewone send_command calls als de output niet betrouwbaar
+    opgesplitst kan worden.
+    """
+    if len(commands) <= 1:
+        return {command: conn.send_command(command) for command in commands}
+
+    prompt = conn.find_prompt()
+    # Wat nu al in het kanaal staat hoort nog bij find_prompt(); prompts die
+    # pas later binnenkomen (trage link) vallen weg in strip_before_echo
+    conn.read_channel()
+    conn.write_channel(conn.RETURN.join(commands) + conn.RETURN)
+
+    raw = ""
+    deadline = time.monotonic() + read_timeout
+    while time.monotonic() < deadline:
+        raw += conn.read_channel()
+        # Prompts pas tellen vanaf de echo van het eerste command
+        body = strip_before_echo(raw, prompt, commands[0])
+        if body is not None and count_prompts(body, prompt) >= len(commands) \
+                and body.rstrip().endswith(prompt):
+            break
+        time.sleep(0.05)
+    else:
+        raise TimeoutError(f"batch van {len(commands)} commands niet voltooid binnen {read_timeout}s")
+
+    try:
+        return split_batched_output(raw, prompt, commands)
+    except BatchSplitError:
+        # Onbetrouwbare output: sequentieel opnieuw ophalen
+        return {command: conn.send_command(command) for command in commands}
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Command output cache
+
+Per-device cache voor CLI output zodat hetzelfde command binnen één run
+(of binnen de TTL in daemon mode) maar één keer naar het device gaat.
+Bijvoorbeeld "show running-config" wordt zowel door check_security als
+door backup_config gebruikt.
+
+De key bevat ook de send_command opties die de output veranderen, zodat
+bv. send_command(cmd, use_textfsm=True) nooit de ruwe tekst van een
+eerdere send_command(cmd) terugkrijgt (of omgekeerd).
+"""
+
+import threading
+import time
+
+from part3b_command_batch import send_command_batch
+
+# send_command opties die enkel de timing beïnvloeden, niet de output
+TIMING_OPTIONS = ("read_timeout", "delay_factor", "max_loops")
+
+
+def options_key(kwargs):
+    """Genormaliseerde, hashbare vorm van de send_command opties voor de cache key."""
+    return tuple(sorted((name, repr(value)) for name, value in kwargs.items()
+                        if name not in TIMING_OPTIONS))
+
+
+class CommandCache:
+    """Thread-safe cache van command output per (device, command, opties)."""
+
+    def __init__(self, ttl=None):
+        # ttl=None: entries blijven geldig tot clear() (einde van de run)
+        self.ttl = ttl
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, device_name, command, options=()):
+        """Return de gecachte output of None als die er niet (meer) is.
+
+        options: options_key() van de send_command opties (leeg = ruwe output).
+        """
+        key = (device_name, command, options)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                fetched_at, output = entry
+                if self.ttl is None or time.monotonic() - fetched_at < self.ttl:
+                    self.hits += 1
+                    return output
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, device_name, command, output, options=()):
+        """Sla de output van een command (met deze opties) op."""
+        with self._lock:
+            self.entries[(device_name, command, options)] = (time.monotonic(), output)
+
+    def invalidate(self, device_name):
+        """Verwijder alle entries van een device (bv. na een config wijziging)."""
+        with self._lock:
+            for key in [k for k in self.entries if k[0] == device_name]:
+                del self.entries[key]
+
+    def clear(self):
+        """Leeg de cache volledig."""
+        with self._lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Return hit/miss statistieken."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": f"{(self.hits / total) * 100:.1f}%" if total else "n/a",
+            "entries": len(self.entries)
+        }
+
+
+class CachedConnection:
+    """Wrapper rond een netmiko connectie die send_command via de cache laat lopen.
+
+    Alle andere attributen en methods worden doorgegeven aan de echte connectie.
+    """
+
+    def __init__(self, conn, cache, device_name):
+        self.conn = conn
+        self.cache = cache
+        self.device_name = device_name
+
+    def send_command(self, command, **kwargs):
+        options = options_key(kwargs)
+        output = self.cache.get(self.device_name, command, options)
+        if output is None:
+            output = self.conn.send_command(command, **kwargs)
+            self.cache.put(self.device_name, command, output, options)
+        return output
+
+    def send_command_batch(self, commands):
+        """Haal enkel de niet-gecachte commands op, in één batch."""
+        outputs = {}
+        missing = []
+        for command in commands:
+            output = self.cache.get(self.device_name, command)
+            if output is None:
+                missing.append(command)
+            else:
+                outputs[command] = output
+
+        if missing:
+            if hasattr(self.conn, "send_command_batch"):
+                fetched = self.conn.send_command_batch(missing)
+            else:
+                fetched = send_command_batch(self.conn, missing)
+            for command, output in fetched.items():
+                self.cache.put(self.device_name, command, output)
+                outputs[command] = output
+
+        return {command: outputs[command] for command in commands}
+
+    def send_config_set(self, commands, **kwargs):
+        # Config wijzigt: gecachte show output is niet meer betrouwbaar
+        output = self.conn.send_config_set(commands, **kwargs)
+        self.cache.invalidate(self.device_name)
+        return output
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
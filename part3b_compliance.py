@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Compliance rule engine
+
+Compliance regels staan in een rule file (compliance_rules.json) in plaats
+van hardcoded in de scripts. Elke regel:
+
+    {
+      "id": "vty_ssh_only",
+      "description": "Elke vty lijn laat enkel SSH toe",
+      "match": "prefix" | "contains" | "regex",
+      "pattern": "transport input ssh",
+      "scope": "global" | "any" | "<sectie prefix, bv. line vty>",
+      "expect": "present" | "absent",
+      "severity": "WARNING"
+    }
+
+- scope "global": enkel niet ingesprongen regels
+- scope "any": elke regel
+- scope "<sectie prefix>": regels binnen elke sectie waarvan de header met
+  die prefix begint; "present" betekent dan dat ELKE zo'n sectie een
+  overeenkomende regel heeft (en dat er minstens één sectie is)
+
+De config wordt geparsed tot een (gecachte) ConfigTree. Globale regels en
+sectie regels zijn daardoor gerichte lookups: een "prefix" regel zoekt via
+de keyword index, een sectie regel test enkel de regels onder de secties
+met die header. Enkel regels met scope "any" moeten elke config regel zien;
+die worden gecompileerd tot twee regexes, een gecombineerde alternation als
+voorfilter en een matcher met per regel een named group in een lookahead,
+zodat de boom één keer overlopen wordt voor alle "any" regels samen.
+
+Omdat de regexes samengevoegd worden, zijn named groups, backreferences en
+conditionele groepen in een "regex" regel niet toegelaten (de nummering en
+namen gelden dan voor de hele matcher). Inline flags vooraan, bv. "(?i)ssh",
+worden herschreven naar een scoped groep "(?i:ssh)".
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+
+from part3b_config_tree import get_config_tree
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "compliance_rules.json")
+
+MATCH_TYPES = ("prefix", "contains", "regex")
+EXPECT_TYPES = ("present", "absent")
+
+
+_LEADING_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+
+
+def _combinable_regex(rule_id, pattern):
+    """Maak een "regex" patroon geschikt om met de andere regels samen te voegen.
+
+    Inline flags vooraan worden een scoped groep; constructies die naar
+    groepen verwijzen geven een ValueError met het id van de regel.
+    """
+    flags = _LEADING_FLAGS.match(pattern)
+    if flags:
+        pattern = f"(?{flags.group(1)}:{pattern[flags.end():]})"
+
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            # In een karakterklasse is \1 een octale escape, erbuiten een backreference
+            if not in_class and pattern[i + 1:i + 2] in tuple("123456789"):
+                raise ValueError(f"Backreference niet toegelaten in regel {rule_id}: {pattern}")
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # Een ] meteen na [ of [^ is een letterlijk teken
+            i += 2 if pattern[i + 1:i + 2] == "^" else 1
+            if pattern[i:i + 1] == "]":
+                i += 1
+            continue
+        elif pattern.startswith(("(?P<", "(?P="), i):
+            raise ValueError(f"Named group niet toegelaten in regel {rule_id}: {pattern}")
+        elif pattern.startswith("(?(", i):
+            raise ValueError(f"Conditionele groep niet toegelaten in regel {rule_id}: {pattern}")
+        i += 1
+    return pattern
+
+
+def _rule_regex(rule):
+    """Regex (zonder anchors van de matcher) voor één regel."""
+    if rule["match"] == "prefix":
+        return "^" + re.escape(rule["pattern"])
+    if rule["match"] == "contains":
+        return re.escape(rule["pattern"])
+    return _combinable_regex(rule["id"], rule["pattern"])
+
+
+class ComplianceEngine:
+    """Evalueert een set compliance regels over de (gecachte) config tree van een config."""
+
+    def __init__(self, rules):
+        self.rules = []
+        for rule in rules:
+            for field in ("id", "match", "pattern"):
+                if field not in rule:
+                    raise ValueError(f"Compliance regel zonder '{field}': {rule}")
+            if rule["match"] not in MATCH_TYPES:
+                raise ValueError(f"Onbekend match type in regel {rule['id']}: {rule['match']}")
+            expect = rule.get("expect", "present")
+            if expect not in EXPECT_TYPES:
+                raise ValueError(f"Onbekende expect waarde in regel {rule['id']}: {expect}")
+            # Ongeldige regexes vallen hier al op, met het id van de regel erbij.
+            # Ook gecompileerd zoals in de matcher, zodat een fout daar nooit anoniem is.
+            try:
+                regex = _rule_regex(rule)
+                re.compile(regex)
+                re.compile(f"(?:(?=.*?(?P<r0>{regex}))|)")
+            except re.error as e:
+                raise ValueError(f"Ongeldige regex in regel {rule['id']}: {e}")
+
+            self.rules.append({
+                "id": rule["id"],
+                "description": rule.get("description", rule["id"]),
+                "match": rule["match"],
+                "pattern": rule["pattern"],
+                "scope": rule.get("scope", "global"),
+                "expect": expect,
+                "severity": rule.get("severity", "WARNING")
+            })
+
+        # Per regel een eigen regex voor de globale en sectie lookups
+        self._regexes = [re.compile(_rule_regex(rule)) for rule in self.rules]
+
+        # Regels met scope "any": voorfilter + matcher over elke regel van de boom
+        self._any_rules = [i for i, rule in enumerate(self.rules) if rule["scope"] == "any"]
+        # Voorfilter: regels die geen enkele "any" regel raken worden met één search overgeslagen
+        self._prefilter = re.compile(
+            "|".join(f"(?:{_rule_regex(self.rules[i])})" for i in self._any_rules) or r"(?!)"
+        )
+        # Matcher: per regel een optionele lookahead met een named group
+        self._matcher = re.compile("".join(
+            f"(?:(?=.*?(?P<r{i}>{_rule_regex(self.rules[i])}))|)" for i in self._any_rules
+        ))
+        self._groups = [(i, f"r{i}") for i in self._any_rules]
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_RULES_FILE):
+        """Laad de regels uit een JSON rule file ({"rules": [...]} of een lijst)."""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["rules"] if isinstance(data, dict) else data)
+
+    def evaluate(self, config):
+        """Evalueer alle regels; return {rule id: resultaat} in de volgorde van de rule file.
+
+        Elk resultaat bevat passed, de regelnummers (1-based) van de
+        overeenkomende regels en, bij sectie scopes, de secties die faalden.
+        """
+        tree = get_config_tree(config)
+        lines_by_rule = [[] for _ in self.rules]
+        # Per sectie regel: lijst van (header, gematcht)
+        sections_by_rule = [[] for _ in self.rules]
+
+        for i, rule in enumerate(self.rules):
+            scope = rule["scope"]
+            if scope == "global":
+                if rule["match"] == "prefix":
+                    nodes = tree.global_lines(rule["pattern"])
+                else:
+                    nodes = tree.global_matches(self._regexes[i])
+                lines_by_rule[i] = [node.number for node in nodes]
+            elif scope != "any":
+                for section in tree.sections(scope):
+                    numbers = [node.number for node in section.descendants()
+                               if self._regexes[i].search(node.line)]
+                    lines_by_rule[i].extend(numbers)
+                    sections_by_rule[i].append((section.line, bool(numbers)))
+
+        if self._any_rules:
+            for node in tree.root.descendants():
+                if not self._prefilter.search(node.line):
+                    continue
+                groups = self._matcher.match(node.line).groupdict()
+                for i, group in self._groups:
+                    if groups[group] is not None:
+                        lines_by_rule[i].append(node.number)
+
+        results = {}
+        for i, rule in enumerate(self.rules):
+            lines = lines_by_rule[i]
+            sections = sections_by_rule[i]
+            if rule["scope"] in ("global", "any"):
+                failed_sections = []
+                passed = bool(lines) if rule["expect"] == "present" else not lines
+            elif rule["expect"] == "present":
+                failed_sections = [header for header, matched in sections if not matched]
+                passed = bool(sections) and not failed_sections
+            else:
+                failed_sections = [header for header, matched in sections if matched]
+                passed = not failed_sections
+
+            results[rule["id"]] = {
+                "passed": passed,
+                "description": rule["description"],
+                "severity": rule["severity"],
+                "lines": lines,
+                "failed_sections": failed_sections
+            }
+        return results
+
+
+# Gecompileerde engines per rule file, herladen als het bestand wijzigt
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def load_engine(path=DEFAULT_RULES_FILE):
+    """Return de (gecachte) ComplianceEngine van een rule file."""
+    mtime = os.path.getmtime(path)
+    with _ENGINES_LOCK:
+        cached = _ENGINES.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    engine = ComplianceEngine.from_file(path)
+
+    with _ENGINES_LOCK:
+        _ENGINES[path] = (mtime, engine)
+    return engine
+
+
+def print_results(results):
+    """Toon compliance resultaten leesbaar op de console."""
+    for rule_id, result in results.items():
+        status = "✓ PASS" if result["passed"] else "✗ FAIL"
+        print(f"  {result['description']} ({rule_id}): {status}")
+        if result["lines"]:
+            print(f"      regel(s): {', '.join(str(n) for n in result['lines'][:10])}")
+        for header in result["failed_sections"]:
+            print(f"      sectie: {header}")
+
+
+# Main execution: evalueer een config bestand tegen de rule file
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(f"Gebruik: python {sys.argv[0]} <config bestand> [rule file]")
+        sys.exit(1)
+
+    engine = load_engine(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_RULES_FILE)
+    with open(sys.argv[1]) as f:
+        results = engine.evaluate(f.read())
+
+    print("=" * 60)
+    print(f"Compliance: {sys.argv[1]} ({len(engine.rules)} regels)")
+    print("=" * 60)
+    print_results(results)
+    failed = sum(1 for result in results.values() if not result["passed"])
+    print(f"\n{len(results) - failed} geslaagd, {failed} gefaald")
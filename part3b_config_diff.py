@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Hiërarchische IOS config diff
+
+Vergelijkt twee IOS configuraties sectie per sectie in plaats van regel per
+regel met difflib:
+
+- De config wordt geparsed volgens de inspringing ("interface X" met de
+  regels eronder als kinderen)
+- Elke (sub)boom krijgt een hash van zijn regel + de hashes van zijn kinderen
+- Secties met dezelfde hash zijn identiek en worden in O(1) overgeslagen
+- Het resultaat is een lijst van gestructureerde records:
+  {"action": "add" | "remove" | "modify", "path": [...], ...}
+
+Gebruik vanaf de command line (vergelijkt standaard de laatste twee backups):
+
+    python part3b_config_diff.py CSR1000v-Lab
+    python part3b_config_diff.py CSR1000v-Lab <oude hash> <nieuwe hash>
+"""
+
+import argparse
+
+from part3b_backup_store import BackupStore
+from part3b_config_tree import get_config_tree, parse_config
+
+
+def _command_key(line):
+    """Regels met dezelfde command key worden als 'modify' gekoppeld (bv. 'ip address')."""
+    words = line.split()
+    if words and words[0] == "no":
+        words = words[1:]
+    return " ".join(words[:2]) if len(words) > 2 else " ".join(words[:1])
+
+
+def diff_trees(old, new, path=()):
+    """Vergelijk twee (sub)bomen en return een lijst van add/remove/modify records."""
+    if old.digest == new.digest:
+        return []
+
+    records = []
+    removed = []
+    added = []
+
+    for key, old_child in old.children.items():
+        new_child = new.children.get(key)
+        if new_child is None:
+            removed.append(old_child)
+        elif old_child.digest != new_child.digest:
+            # Zelfde sectie header, andere inhoud: enkel hier verder afdalen
+            records.extend(diff_trees(old_child, new_child, path + (old_child.line,)))
+    for key, new_child in new.children.items():
+        if key not in old.children:
+            added.append(new_child)
+
+    # Koppel één verwijderde en één toegevoegde regel met dezelfde command key als modify
+    added_by_key = {}
+    for node in added:
+        added_by_key.setdefault(_command_key(node.line), []).append(node)
+    removed_by_key = {}
+    for node in removed:
+        removed_by_key.setdefault(_command_key(node.line), []).append(node)
+
+    for node in removed:
+        key = _command_key(node.line)
+        if (len(removed_by_key[key]) == 1 and len(added_by_key.get(key, [])) == 1
+                and not node.children and not added_by_key[key][0].children):
+            records.append({"action": "modify", "path": list(path),
+                            "old": node.line, "new": added_by_key[key][0].line})
+            added.remove(added_by_key[key][0])
+        else:
+            records.append({"action": "remove", "path": list(path),
+                            "line": node.line, "children": node.lines()})
+    for node in added:
+        records.append({"action": "add", "path": list(path),
+                        "line": node.line, "children": node.lines()})
+
+    return records
+
+
+def diff_configs(old_text, new_text):
+    """Diff twee config teksten."""
+    return diff_trees(parse_config(old_text), parse_config(new_text))
+
+
+def diff_backups(store, device, old_hash=None, new_hash=None):
+    """Diff twee backups van een device uit de backup store.
+
+    Zonder hashes worden de voorlaatste en laatste versie vergeleken.
+    """
+    if old_hash is None or new_hash is None:
+        versions = store.versions(device)
+        if len(versions) < 2:
+            return []
+        old_hash = old_hash or versions[-2][1]
+        new_hash = new_hash or versions[-1][1]
+    if old_hash == new_hash:
+        return []
+
+    # Geparste bomen komen uit de gedeelde cache (key = hash van de backup)
+    old_tree = get_config_tree(store.load(old_hash), old_hash)
+    new_tree = get_config_tree(store.load(new_hash), new_hash)
+    return diff_trees(old_tree.root, new_tree.root)
+
+
+def summarize(records):
+    """Tel de records per actie, bv. {'add': 2, 'remove': 1, 'modify': 3}."""
+    summary = {"add": 0, "remove": 0, "modify": 0}
+    for record in records:
+        summary[record["action"]] += 1
+    return summary
+
+
+def print_records(records):
+    """Toon diff records leesbaar op de console."""
+    for record in records:
+        location = " > ".join(record["path"]) or "(global)"
+        if record["action"] == "modify":
+            print(f"~ [{location}] {record['old']}  ->  {record['new']}")
+        else:
+            sign = "+" if record["action"] == "add" else "-"
+            print(f"{sign} [{location}] {record['line']}")
+            for child in record["children"]:
+                print(f"{sign}     {child}")
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vergelijk config backups van een device")
+    parser.add_argument("device", help="Device naam zoals in de backup store")
+    parser.add_argument("old", nargs="?", help="Hash van de oude versie")
+    parser.add_argument("new", nargs="?", help="Hash van de nieuwe versie")
+    parser.add_argument("--store", default="health_reports/backups", help="Backup store directory")
+    args = parser.parse_args()
+
+    store = BackupStore(args.store)
+    records = diff_backups(store, args.device, args.old, args.new)
+
+    print("=" * 60)
+    print(f"Config diff: {args.device}")
+    print("=" * 60)
+    if records:
+        print_records(records)
+        print(f"\nSamenvatting: {summarize(records)}")
+    else:
+        print("Geen verschillen gevonden.")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - IOS config tree met query index
+
+Parser die een IOS configuratie omzet naar een boom volgens de inspringing
+("interface X" met de regels eronder als kinderen), plus een index op het
+eerste keyword van elke globale regel. Compliance regels worden daardoor
+gerichte lookups in plaats van tests over elke regel van de config:
+
+    tree = get_config_tree(running_config)
+    tree.has_global("ip ssh version 2")                      # globale regel
+    tree.every_section_has("line vty", "transport input ssh")  # elke vty sectie
+
+Elke node krijgt ook een hash van zijn subtree, zodat de config diff
+ongewijzigde secties in één vergelijking kan overslaan. Geparste bomen worden
+gecached op de hash van de config, zodat dezelfde config (bv. security check
++ backup, of opeenvolgende diffs) maar één keer geparsed wordt.
+"""
+
+from collections import OrderedDict
+import hashlib
+import threading
+
+
+class ConfigNode:
+    """Eén config regel met zijn kinderen (regels die dieper ingesprongen zijn)."""
+
+    __slots__ = ("line", "number", "children", "digest")
+
+    def __init__(self, line, number=0):
+        self.line = line
+        # Regelnummer (1-based) in de geparste tekst, 0 voor de root
+        self.number = number
+        self.children = {}
+        self.digest = None
+
+    def lines(self, indent=0):
+        """Alle regels van deze (sub)boom, opnieuw ingesprongen."""
+        result = []
+        for child in self.children.values():
+            result.append(" " * indent + child.line)
+            result.extend(child.lines(indent + 1))
+        return result
+
+    def descendants(self):
+        """Alle nodes onder deze node (diepte eerst, in config volgorde)."""
+        for child in self.children.values():
+            yield child
+            yield from child.descendants()
+
+    def has_child(self, prefix):
+        """True als een directe kindregel met prefix begint."""
+        return any(child.line.startswith(prefix) for child in self.children.values())
+
+
+def _compute_digests(node):
+    """Bereken bottom-up de hash van elke subtree."""
+    h = hashlib.sha1(node.line.encode())
+    for child in node.children.values():
+        h.update(_compute_digests(child).encode())
+    node.digest = h.hexdigest()
+    return node.digest
+
+
+def parse_config(text):
+    """Parse een IOS config naar een boom van ConfigNodes op basis van inspringing."""
+    root = ConfigNode("")
+    stack = [(-1, root)]
+
+    for number, raw_line in enumerate(text.splitlines(), 1):
+        line = raw_line.rstrip()
+        stripped = line.lstrip()
+        # Lege regels en "!" scheidingsregels/comments dragen geen configuratie
+        if not stripped or stripped.startswith("!"):
+            continue
+
+        indent = len(line) - len(stripped)
+        while stack[-1][0] >= indent:
+            stack.pop()
+        parent = stack[-1][1]
+
+        # Dubbele regels binnen dezelfde sectie krijgen een volgnummer als key
+        key = stripped
+        counter = 1
+        while key in parent.children:
+            counter += 1
+            key = f"{stripped}#{counter}"
+
+        node = ConfigNode(stripped, number)
+        parent.children[key] = node
+        stack.append((indent, node))
+
+    _compute_digests(root)
+    return root
+
+
+class ConfigTree:
+    """Geparste config met een index op het eerste keyword van elke globale regel."""
+
+    def __init__(self, root):
+        self.root = root
+        self.index = {}
+        for node in root.children.values():
+            keyword = node.line.split(None, 1)[0]
+            self.index.setdefault(keyword, []).append(node)
+
+    def _candidates(self, prefix):
+        """Globale nodes die met prefix kunnen beginnen (via de index als dat kan)."""
+        words = prefix.split(None, 1)
+        # Een prefix die midden in zijn eerste woord stopt ("logg") kan meerdere keywords raken
+        if not words or (len(words) == 1 and not prefix[-1].isspace()):
+            return self.root.children.values()
+        return self.index.get(words[0], [])
+
+    def global_lines(self, prefix):
+        """Alle globale (niet ingesprongen) nodes waarvan de regel met prefix begint."""
+        return [node for node in self._candidates(prefix) if node.line.startswith(prefix)]
+
+    def has_global(self, prefix):
+        """True als er een globale regel bestaat die met prefix begint."""
+        return any(node.line.startswith(prefix) for node in self._candidates(prefix))
+
+    def global_matches(self, regex):
+        """Globale nodes waarvan de regel de (gecompileerde) regex raakt."""
+        return [node for node in self.root.children.values() if regex.search(node.line)]
+
+    def sections(self, prefix):
+        """Globale secties (bv. 'interface', 'line vty') die met prefix beginnen."""
+        return self.global_lines(prefix)
+
+    def every_section_has(self, section_prefix, child_prefix):
+        """True als elke sectie die met section_prefix begint een kind met child_prefix heeft.
+
+        Zonder overeenkomende secties is het resultaat False: er is dan niets
+        geconfigureerd om aan de regel te voldoen.
+        """
+        sections = self.sections(section_prefix)
+        return bool(sections) and all(section.has_child(child_prefix) for section in sections)
+
+    def sections_missing(self, section_prefix, child_prefix):
+        """Secties die met section_prefix beginnen maar geen kind met child_prefix hebben."""
+        return [section.line for section in self.sections(section_prefix)
+                if not section.has_child(child_prefix)]
+
+
+# Cache van geparste bomen op config hash (LRU, thread-safe)
+_TREE_CACHE = OrderedDict()
+_TREE_CACHE_SIZE = 512
+_TREE_CACHE_LOCK = threading.Lock()
+
+
+def get_config_tree(config, digest=None):
+    """Return de (gecachte) ConfigTree van een config.
+
+    De config wordt geparsed zoals ze is, zodat de regelnummers van de nodes
+    overeenkomen met de tekst. digest: optioneel een hash die de config al
+    uniek bepaalt (bv. de hash van een backup in de backup store).
+    """
+    digest = digest or hashlib.sha256(config.encode()).hexdigest()
+    with _TREE_CACHE_LOCK:
+        tree = _TREE_CACHE.get(digest)
+        if tree is not None:
+            _TREE_CACHE.move_to_end(digest)
+            return tree
+
+    tree = ConfigTree(parse_config(config))
+
+    with _TREE_CACHE_LOCK:
+        _TREE_CACHE[digest] = tree
+        if len(_TREE_CACHE) > _TREE_CACHE_SIZE:
+            _TREE_CACHE.popitem(last=False)
+    return tree
@@ -0,0 +1,466 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - IOS-XE SSH device simulator
+
+Lokale SSH server (paramiko server side) die een vloot IOS-XE routers
+nabootst, zodat de netmiko scripts zonder echte routers getest en
+gebenchmarkt kunnen worden:
+
+- Elk gesimuleerd device luistert op een eigen poort (base_port + index)
+  op 127.0.0.1; één acceptor thread bedient alle poorten via selectors
+- Interactieve shell met IOS prompt (SIM-R0001#), echo van het command,
+  config mode (configure terminal / interface / end) en 'write mem'
+- Antwoorden op de show commands van part3a_* en de health monitor, met
+  gegenereerde output per device (interfaces, CPU, memory, routing, config)
+- Output filters '| include <regex>' en '| section <regex>'
+- Instelbare latency per command (vaste vertraging + jitter)
+
+Gebruik:
+
+    python part3b_device_simulator.py --devices 10 --base-port 10022
+
+en verbind met netmiko naar host 127.0.0.1, poort 10022..10031
+(username/password zijn vrij te kiezen).
+"""
+
+import argparse
+import logging
+import random
+import re
+import selectors
+import socket
+import threading
+import time
+
+import paramiko
+
+# Server transports loggen op "paramiko.simulator": TCP pre-probes die meteen
+# sluiten geven daar "Error reading SSH protocol banner". De resets aan de
+# client kant (logger "paramiko.transport") vermijdt _serve door de client
+# eerst te laten afsluiten.
+logging.getLogger("paramiko.simulator").setLevel(logging.CRITICAL)
+
+INTERFACES = ["GigabitEthernet1", "GigabitEthernet2", "GigabitEthernet3", "Loopback0"]
+
+
+def device_params(count, base_port=10022, host="127.0.0.1", username="cisco", password="cisco123!"):
+    """Netmiko device dicts voor count gesimuleerde devices vanaf base_port."""
+    return [{
+        "device_type": "cisco_ios",
+        "host": host,
+        "port": base_port + i,
+        "username": username,
+        "password": password,
+        "device_name": f"SIM-R{i + 1:04d}"
+    } for i in range(count)]
+
+
+class SimulatedDevice:
+    """Toestand en command output van één gesimuleerde router."""
+
+    def __init__(self, index):
+        self.index = index
+        self.hostname = f"SIM-R{index:04d}"
+        self.started = time.time()
+        self._random = random.Random(index)
+        self._lock = threading.Lock()
+
+        # Elk vijfde device heeft een interface down, elk zevende een CRC probleem
+        self.interfaces = {}
+        for number, name in enumerate(INTERFACES, 1):
+            down = name == "GigabitEthernet3" and index % 5 == 0
+            self.interfaces[name] = {
+                "ip": f"10.{index // 250}.{index % 250}.{number}" if name != "Loopback0" else f"192.168.{index % 250}.1",
+                "shutdown": False,
+                "down": down,
+                "description": None
+            }
+        self.crc_per_second = 2.0 if index % 7 == 0 else 0.0
+        self.cpu_base = self._random.randint(5, 70)
+        self.memory_used = self._random.randint(40, 90)
+        self.extra_config = []
+        self.saved_config = None
+
+    # -- gegenereerde output -------------------------------------------------
+
+    def show_ip_interface_brief(self):
+        lines = ["Interface              IP-Address      OK? Method Status                Protocol"]
+        for name, iface in self.interfaces.items():
+            if iface["shutdown"]:
+                status, protocol = "administratively down", "down"
+            elif iface["down"]:
+                status, protocol = "down", "down"
+            else:
+                status, protocol = "up", "up"
+            lines.append(f"{name:<22} {iface['ip']:<15} YES manual {status:<21} {protocol}")
+        return "\n".join(lines)
+
+    def show_interfaces(self):
+        elapsed = time.time() - self.started
+        blocks = []
+        for number, (name, iface) in enumerate(self.interfaces.items(), 1):
+            if iface["shutdown"]:
+                state = "administratively down, line protocol is down"
+            elif iface["down"]:
+                state = "down, line protocol is down"
+            else:
+                state = "up, line protocol is up"
+            packets = int(elapsed * 100 * number) + 1000 * self.index
+            crc = int(elapsed * self.crc_per_second) if name == "GigabitEthernet1" else 0
+            blocks.append(
+                f"{name} is {state} \n"
+                f"  Hardware is CSR vNIC, address is 0050.56bf.{self.index % 10000:04d}\n"
+                f"  Internet address is {iface['ip']}/24\n"
+                f"  Input queue: 0/375/0/0 (size/max/drops/flushes); Total output drops: 0\n"
+                f"     {packets} packets input, {packets * 120} bytes, 0 no buffer\n"
+                f"     {crc} input errors, {crc} CRC, 0 frame, 0 overrun, 0 ignored\n"
+                f"     {packets} packets output, {packets * 110} bytes, 0 underruns\n"
+                f"     0 output errors, 0 collisions, 0 interface resets"
+            )
+        return "\n".join(blocks)
+
+    def show_processes_cpu(self):
+        cpu = max(0, min(100, self.cpu_base + self._random.randint(-5, 5)))
+        return (f"CPU utilization for five seconds: {cpu}%/0%; one minute: {self.cpu_base}%; "
+                f"five minutes: {self.cpu_base}%")
+
+    def show_memory_statistics(self):
+        total = 2000000000
+        used = total * self.memory_used // 100
+        return ("                Head    Total(b)     Used(b)     Free(b)   Lowest(b)  Largest(b)\n"
+                f"Processor  7F2A4C3010  {total}  {used}  {total - used}  {total - used}  {total - used}")
+
+    def show_ip_route_summary(self):
+        return ("IP routing table name is default (0x0)\n"
+                "Route Source    Networks    Subnets     Replicates  Overhead    Memory (bytes)\n"
+                f"connected       0           {len(self.interfaces)}           0           384         1152\n"
+                "static          1           0           0           96          288\n"
+                "ospf 1          0           3           0           288         864\n"
+                f"Total           1           {len(self.interfaces) + 3}           0           768         2304")
+
+    def show_ip_ospf_neighbor(self):
+        return ("Neighbor ID     Pri   State           Dead Time   Address         Interface\n"
+                f"10.255.{self.index % 250}.2  1   FULL/DR         00:00:35    10.{self.index // 250}.{self.index % 250}.2  GigabitEthernet1")
+
+    def running_config(self):
+        lines = ["Building configuration...", "",
+                 f"Current configuration : 4096 bytes", "!",
+                 "! Last configuration change at 10:00:00 UTC Mon Jan 1 2024", "!",
+                 "version 17.3", "service timestamps debug datetime msec",
+                 "service password-encryption", "!", f"hostname {self.hostname}", "!",
+                 "enable secret 9 $9$simulated", "!",
+                 "ip ssh version 2", "logging buffered 16384"]
+        if self.index % 3:
+            lines.append("ntp server 10.0.0.1")
+        lines.append("!")
+        for name, iface in self.interfaces.items():
+            lines.append(f"interface {name}")
+            if iface["description"]:
+                lines.append(f" description {iface['description']}")
+            lines.append(f" ip address {iface['ip']} 255.255.255.0")
+            if iface["shutdown"]:
+                lines.append(" shutdown")
+            lines.append("!")
+        lines.extend(self.extra_config)
+        lines.extend(["!", "banner motd ^C Gesimuleerd device ^C", "!",
+                      "line vty 0 4", " transport input ssh", "!", "end"])
+        return "\n".join(lines)
+
+    def show_version(self):
+        uptime = int(time.time() - self.started)
+        return (f"Cisco IOS XE Software, Version 17.03.04a\n"
+                f"Cisco IOS Software [Amsterdam], Virtual XE Software, Version 17.3.4a, RELEASE SOFTWARE\n"
+                f"{self.hostname} uptime is {uptime // 60} minutes\n"
+                f"cisco CSR1000V (VXE) processor with 2072K/3075K bytes of memory.")
+
+    def show_cdp_neighbors(self):
+        return ("Capability Codes: R - Router, T - Trans Bridge, B - Source Route Bridge\n\n"
+                "Device ID        Local Intrfce     Holdtme    Capability  Platform  Port ID\n"
+                f"SIM-R{(self.index + 1):04d}       Gig 1             160              R    CSR1000V  Gig 1\n\n"
+                "Total cdp entries displayed : 1")
+
+    # -- command afhandeling -------------------------------------------------
+
+    def show(self, command):
+        """Return de output van een show command (zonder filters), of None als onbekend."""
+        words = command.split()
+        if words[:2] in (["show", "run"], ["show", "running-config"]):
+            config = self.running_config()
+            if len(words) >= 4 and words[2] == "interface":
+                return self._section(config, rf"^interface {re.escape(words[3])}$")
+            return config
+        handlers = {
+            "show ip interface brief": self.show_ip_interface_brief,
+            "show interfaces": self.show_interfaces,
+            "show processes cpu": self.show_processes_cpu,
+            "show memory statistics": self.show_memory_statistics,
+            "show ip route summary": self.show_ip_route_summary,
+            "show ip ospf neighbor": self.show_ip_ospf_neighbor,
+            "show startup-config": lambda: self.saved_config or self.running_config(),
+            "show version": self.show_version,
+            "show cdp neighbors": self.show_cdp_neighbors,
+            "show clock": lambda: time.strftime("*%H:%M:%S.000 UTC %a %b %d %Y"),
+            "show ip route": lambda: "Gateway of last resort is 10.0.0.254 to network 0.0.0.0\n\n"
+                                     "S*    0.0.0.0/0 [1/0] via 10.0.0.254",
+            "show interfaces status": lambda: "% Invalid input detected at '^' marker."
+        }
+        handler = handlers.get(" ".join(words))
+        return handler() if handler else None
+
+    @staticmethod
+    def _section(output, pattern):
+        """Emuleer '| section': matchende globale regels met hun ingesprongen kinderen."""
+        result = []
+        keep = False
+        for line in output.split("\n"):
+            if line and not line[0].isspace():
+                keep = bool(re.search(pattern, line))
+            if keep and line.strip() != "!":
+                result.append(line)
+        return "\n".join(result)
+
+    def execute(self, command, mode):
+        """Voer een command uit. Return (output, nieuwe mode)."""
+        command = command.strip()
+        if not command:
+            return "", mode
+
+        if mode != "exec":
+            return self._configure(command, mode)
+
+        if command in ("terminal length 0", "terminal width 511", "terminal no monitor"):
+            return "", mode
+        if command in ("exit", "logout", "quit"):
+            # Zoals IOS: de sessie wordt door het device afgesloten
+            return "", "closed"
+        if command in ("configure terminal", "conf t"):
+            return "Enter configuration commands, one per line.  End with CNTL/Z.", "config"
+        if command in ("write mem", "write memory", "copy running-config startup-config"):
+            with self._lock:
+                self.saved_config = self.running_config()
+            return "Building configuration...\n[OK]", mode
+
+        # Output filters: show ... | include <regex> / | section <regex>
+        base, _, pipe = command.partition("|")
+        output = self.show(base.strip())
+        if output is None:
+            return "                    ^\n% Invalid input detected at '^' marker.", mode
+        pipe = pipe.strip()
+        if pipe.startswith("include "):
+            pattern = pipe[len("include "):]
+            output = "\n".join(line for line in output.split("\n") if re.search(pattern, line))
+        elif pipe.startswith("section "):
+            output = self._section(output, pipe[len("section "):])
+        return output, mode
+
+    def _configure(self, command, mode):
+        if command in ("end", "\x1a"):
+            return "", "exec"
+        if command == "exit":
+            return "", "config" if mode.startswith("config-if") else "exec"
+
+        match = re.match(r"interface (\S+)$", command)
+        if match:
+            name = match.group(1)
+            with self._lock:
+                self.interfaces.setdefault(name, {"ip": "unassigned", "shutdown": False,
+                                                  "down": False, "description": None})
+            return "", f"config-if:{name}"
+
+        with self._lock:
+            if mode.startswith("config-if:"):
+                iface = self.interfaces[mode.split(":", 1)[1]]
+                if command == "shutdown":
+                    iface["shutdown"] = True
+                elif command == "no shutdown":
+                    # Een reset lost de (gesimuleerde) link down op
+                    iface["shutdown"] = False
+                    iface["down"] = False
+                elif command.startswith("description "):
+                    iface["description"] = command[len("description "):]
+                elif command.startswith("ip address "):
+                    iface["ip"] = command.split()[2]
+            else:
+                self.extra_config.append(command)
+        return "", mode
+
+    def prompt(self, mode):
+        if mode == "exec":
+            return f"{self.hostname}#"
+        if mode.startswith("config-if"):
+            return f"{self.hostname}(config-if)#"
+        return f"{self.hostname}(config)#"
+
+
+class _SSHServer(paramiko.ServerInterface):
+    """Accepteert elke username/password en een interactieve shell."""
+
+    def __init__(self):
+        self.shell_requested = threading.Event()
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        self.shell_requested.set()
+        return True
+
+
+class DeviceSimulator:
+    """Start een vloot gesimuleerde IOS-XE devices op opeenvolgende poorten."""
+
+    def __init__(self, count=10, base_port=10022, latency=0.0, jitter=0.0, host="127.0.0.1"):
+        self.host = host
+        self.base_port = base_port
+        self.latency = latency
+        self.jitter = jitter
+        self.devices = [SimulatedDevice(index) for index in range(1, count + 1)]
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.sessions = 0
+        # Elke sessie draait in een eigen thread: de teller enkel onder lock ophogen
+        self._sessions_lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._running = False
+        self._thread = None
+
+    def device_params(self, username="cisco", password="cisco123!"):
+        """Netmiko device dicts voor alle gesimuleerde devices."""
+        return device_params(len(self.devices), self.base_port, self.host, username, password)
+
+    def start(self):
+        """Open alle listening sockets en start de acceptor thread."""
+        for i, device in enumerate(self.devices):
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((self.host, self.base_port + i))
+            listener.listen(128)
+            listener.setblocking(False)
+            self._selector.register(listener, selectors.EVENT_READ, device)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()
+        self._selector.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _accept_loop(self):
+        while self._running:
+            for key, _ in self._selector.select(timeout=0.5):
+                try:
+                    client, _ = key.fileobj.accept()
+                except BlockingIOError:
+                    continue
+                client.setblocking(True)
+                threading.Thread(target=self._serve, args=(client, key.data), daemon=True).start()
+
+    def _serve(self, client, device):
+        """Eén SSH sessie: handshake, shell en command loop."""
+        transport = paramiko.Transport(client)
+        transport.set_log_channel("paramiko.simulator")
+        transport.add_server_key(self.host_key)
+        server = _SSHServer()
+        try:
+            transport.start_server(server=server)
+            channel = transport.accept(timeout=10)
+            if channel is None or not server.shell_requested.wait(10):
+                return
+            with self._sessions_lock:
+                self.sessions += 1
+            self._shell(channel, device)
+            # De client eerst laten afsluiten: sluiten we zelf terwijl zijn laatste
+            # pakketten nog ongelezen zijn, dan krijgt hij een TCP reset en logt
+            # paramiko aan de client kant "Socket exception: Connection reset"
+            deadline = time.monotonic() + 2
+            while transport.is_active() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        except (paramiko.SSHException, EOFError, OSError):
+            # Bv. een TCP reachability probe die meteen weer sluit
+            pass
+        finally:
+            transport.close()
+
+    def _shell(self, channel, device):
+        mode = "exec"
+        channel.sendall(f"\r\n{device.prompt(mode)}")
+        line = ""
+        previous = ""
+        while True:
+            data = channel.recv(4096)
+            if not data:
+                return
+            for char in data.decode(errors="replace"):
+                # \r\n telt als één enter
+                if char == "\n" and previous == "\r":
+                    previous = char
+                    continue
+                previous = char
+                if char in ("\r", "\n"):
+                    if self.latency or self.jitter:
+                        time.sleep(self.latency + random.uniform(0, self.jitter))
+                    output, mode = device.execute(line, mode)
+                    if mode == "closed":
+                        channel.sendall("\r\n")
+                        channel.send_exit_status(0)
+                        channel.close()
+                        return
+                    reply = "\r\n"
+                    if output:
+                        reply += output.replace("\n", "\r\n") + "\r\n"
+                    channel.sendall(reply + device.prompt(mode))
+                    line = ""
+                elif char == "\x1a":
+                    mode = "exec"
+                    channel.sendall(f"\r\n{device.prompt(mode)}")
+                    line = ""
+                else:
+                    line += char
+                    channel.sendall(char)
+
+
+# Main execution: start een gesimuleerde vloot tot Ctrl+C
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IOS-XE SSH device simulator")
+    parser.add_argument("--devices", type=int, default=10, help="Aantal gesimuleerde devices")
+    parser.add_argument("--base-port", type=int, default=10022, help="Poort van het eerste device")
+    parser.add_argument("--latency", type=float, default=0.0, help="Vertraging per command (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra willekeurige vertraging (s)")
+    args = parser.parse_args()
+
+    simulator = DeviceSimulator(args.devices, args.base_port, args.latency, args.jitter).start()
+
+    print("=" * 60)
+    print("Part 3b: IOS-XE Device Simulator")
+    print("=" * 60)
+    print(f"{args.devices} device(s) op 127.0.0.1:{args.base_port}-{args.base_port + args.devices - 1}")
+    print("Stop met Ctrl+C")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+        print(f"\nSimulator gestopt na {simulator.sessions} sessie(s).")
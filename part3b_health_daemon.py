@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Daemon mode
+
+Laat de NetworkHealthMonitor continu draaien in plaats van één keer.
+Elke check heeft zijn eigen interval (bv. CPU elke 30 s, security elke 6 u,
+backup elke nacht). Een priority queue (heapq) bepaalt welke (device, check)
+combinatie als volgende aan de beurt is. Jitter spreidt de checks zodat niet
+alle devices op hetzelfde moment gepolld worden.
+
+SSH sessies blijven open tussen de ticks (via de SessionPool), zodat we
+niet bij elke poll opnieuw moeten verbinden en authenticeren.
+
+Een tick wacht niet op de checks: hij dient ze in bij de thread pool en
+keert terug, zodat één traag device de planning van de rest niet ophoudt.
+Een device waarvan de vorige run nog loopt wordt voor die tick overgeslagen.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from part3b_check_plugins import get_checks
+from part3b_command_cache import CachedConnection
+from part3b_session_pool import SessionPool
+
+
+# Standaard interval per check in seconden
+DEFAULT_INTERVALS = {
+    "interfaces": 60,
+    "resources": 30,
+    "routing": 300,
+    "security": 6 * 3600,
+    "backup": 24 * 3600,
+}
+
+
+class HealthDaemon:
+    """Scheduler die de checks van een NetworkHealthMonitor periodiek uitvoert."""
+
+    def __init__(self, monitor, intervals=None, jitter=0.1, report_interval=3600, auto_fix=False):
+        self.monitor = monitor
+        self.intervals = dict(DEFAULT_INTERVALS, **(intervals or {}))
+        self.jitter = jitter
+        self.report_interval = report_interval
+        self.auto_fix = auto_fix
+        self.queue = []
+        self.running = False
+        self._counter = itertools.count()
+        # device -> future van de run die nog bezig is
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self.skipped = 0
+        self.devices = {device.get("device_name", device["host"]): device
+                        for device in monitor.devices}
+
+        # Zonder pool zou elke tick opnieuw verbinden
+        if monitor.session_pool is None:
+            monitor.session_pool = SessionPool(max_per_host=1)
+
+    def _jittered(self, interval):
+        """Interval met +/- jitter om thundering herds te vermijden."""
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def schedule(self, device_name, check_name, delay):
+        """Plan een check voor een device over delay seconden."""
+        heapq.heappush(self.queue, (time.monotonic() + delay, next(self._counter),
+                                    device_name, check_name))
+
+    def schedule_all(self):
+        """Plan alle checks voor alle devices, verspreid over hun eerste interval."""
+        for device_name in self.devices:
+            for check in get_checks():
+                interval = self.intervals.get(check.name, 300)
+                self.schedule(device_name, check.name, random.uniform(0, interval * self.jitter))
+
+    def run_device_checks(self, device_name, check_names):
+        """Voer de checks uit die voor dit device aan de beurt zijn."""
+        # Warme sessie uit de pool (liveness check + reconnect gebeuren daar)
+        self.monitor.start_device_history()
+        conn = self.monitor.connect_device(self.devices[device_name])
+        if conn is None:
+            self.monitor.record_device_history(device_name, {"status": "unreachable"})
+            with self.monitor._lock:
+                self.monitor.results[device_name] = {"status": "unreachable"}
+            return
+
+        # Met cassette_dir wordt elke tick een cassette met de checks van die tick
+        cached_conn, cassette = self.monitor.start_recording(
+            CachedConnection(conn, self.monitor.command_cache, device_name), device_name)
+        try:
+            result = self.monitor.run_checks(cached_conn, device_name, self.auto_fix,
+                                             checks=get_checks(check_names))
+            failed = self.monitor.remediate(conn, device_name, result)
+            self.monitor.release_device(conn, discard=failed)
+        except Exception as e:
+            self.monitor.add_alert("CRITICAL", device_name, f"Health check fout: {e}",
+                                   "health_check", "error")
+            self.monitor.release_device(conn, discard=True)
+            result = {"status": "error", "error": str(e)}
+        finally:
+            self.monitor.save_recording(cassette)
+
+        self.monitor.record_device_history(device_name, result)
+        with self.monitor._lock:
+            self.monitor.results.setdefault(device_name, {}).update(result)
+
+    def _run_finished(self, device_name, future):
+        """Callback van een afgewerkte run: het device mag weer ingepland worden."""
+        with self._in_flight_lock:
+            self._in_flight.pop(device_name, None)
+        error = future.exception()
+        if error is not None:
+            self.monitor.add_alert("CRITICAL", device_name, f"Daemon run fout: {error}",
+                                   "health_check", "error")
+
+    def tick(self, executor):
+        """Dien alle checks in die nu aan de beurt zijn en plan ze opnieuw in.
+
+        Blokkeert niet op de runs zelf. Remediation gebeurt binnen de run van
+        elk device, over zijn sessie.
+        """
+        now = time.monotonic()
+        due = {}
+        while self.queue and self.queue[0][0] <= now:
+            _, _, device_name, check_name = heapq.heappop(self.queue)
+            due.setdefault(device_name, []).append(check_name)
+
+        for device_name, check_names in due.items():
+            with self._in_flight_lock:
+                busy = device_name in self._in_flight
+                if not busy:
+                    # Alle checks van een device in één command plan over dezelfde sessie
+                    future = executor.submit(self.run_device_checks, device_name, check_names)
+                    self._in_flight[device_name] = future
+            if busy:
+                # Vorige run loopt nog: deze beurt vervalt, de checks komen na hun interval terug
+                self.skipped += len(check_names)
+            else:
+                future.add_done_callback(lambda f, name=device_name: self._run_finished(name, f))
+
+            for check_name in check_names:
+                self.schedule(device_name, check_name,
+                              self._jittered(self.intervals.get(check_name, 300)))
+
+        self.monitor.alert_manager.flush()
+
+    def run_forever(self):
+        """Draai de scheduler tot stop() of Ctrl+C."""
+        print("\n" + "=" * 60)
+        print("🔁 NETWORK HEALTH MONITOR - DAEMON MODE")
+        print("=" * 60)
+        print(f"Startijd: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Aantal devices: {len(self.devices)}")
+        for check_name, interval in self.intervals.items():
+            print(f"  - {check_name}: elke {interval}s")
+        print("=" * 60 + "\n")
+
+        self.running = True
+        self.schedule_all()
+        # Eén history run per daemon sessie
+        if self.monitor.history is not None:
+            self.monitor.history_run_id = self.monitor.history.start_run(len(self.devices))
+        next_report = time.monotonic() + self.report_interval
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.monitor.max_workers) as executor:
+                while self.running:
+                    self.tick(executor)
+
+                    if time.monotonic() >= next_report:
+                        self.monitor.generate_report()
+                        next_report = time.monotonic() + self.report_interval
+
+                    # Slaap tot de volgende check aan de beurt is
+                    if self.queue:
+                        time.sleep(max(0.0, min(self.queue[0][0] - time.monotonic(), 1.0)))
+        except KeyboardInterrupt:
+            print("\nDaemon gestopt door gebruiker.")
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop de daemon en sluit alle sessies."""
+        self.running = False
+        self.monitor.session_pool.close_all()
+        if self.monitor.history is not None and self.monitor.history_run_id is not None:
+            self.monitor.history.finish_run(self.monitor.history_run_id)
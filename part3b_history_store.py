@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Run history in SQLite
+
+Bewaart de resultaten van elke run in een lokale SQLite database (WAL mode),
+zodat ze niet verdwijnen zodra het HTML rapport geschreven is:
+
+- runs: één rij per health check run (of daemon sessie)
+- results: elke (geplatte) check waarde per device
+- alerts: de alerts die tijdens de check van een device gezien werden
+- resource_samples: CPU en memory per device
+- interface_states: status/protocol per interface
+
+Alles van één device wordt aan het einde van zijn check in één transactie
+weggeschreven (executemany per tabel). Indexen op (device, timestamp) en
+(severity, timestamp) houden queries over een jaar historiek snel:
+
+    history = HistoryStore()
+    history.devices_with_alerts("CRITICAL", "cpu", since=time.time() - 7 * 86400)
+"""
+
+from datetime import datetime
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+from part3b_result_export import flatten_result
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    finished REAL,
+    devices INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL,
+    device TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    status TEXT,
+    check_name TEXT,
+    key TEXT,
+    value
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    run_id INTEGER NOT NULL,
+    device TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    severity TEXT NOT NULL,
+    type TEXT,
+    subject TEXT,
+    message TEXT,
+    count INTEGER
+);
+CREATE TABLE IF NOT EXISTS resource_samples (
+    run_id INTEGER NOT NULL,
+    device TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    cpu REAL,
+    memory REAL
+);
+CREATE TABLE IF NOT EXISTS interface_states (
+    run_id INTEGER NOT NULL,
+    device TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    interface TEXT NOT NULL,
+    status TEXT,
+    protocol TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_device_time ON results (device, timestamp);
+CREATE INDEX IF NOT EXISTS idx_alerts_device_time ON alerts (device, timestamp);
+CREATE INDEX IF NOT EXISTS idx_alerts_severity_time ON alerts (severity, timestamp);
+CREATE INDEX IF NOT EXISTS idx_resources_device_time ON resource_samples (device, timestamp);
+CREATE INDEX IF NOT EXISTS idx_interfaces_device_time ON interface_states (device, timestamp);
+"""
+
+
+def _percentage(value):
+    """'65%' -> 65.0; 'unknown' of None -> None."""
+    try:
+        return float(str(value).rstrip("%"))
+    except ValueError:
+        return None
+
+
+class HistoryStore:
+    """Persistente run historiek in SQLite met gebatchte writes per device."""
+
+    def __init__(self, path="health_reports/history.db"):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Eén connectie gedeeld door de worker threads; writes gaan via de lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL: lezers (rapporten, dashboards) blokkeren de writer niet
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def start_run(self, devices=None):
+        """Registreer een nieuwe run en return het run id."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("INSERT INTO runs (started, devices) VALUES (?, ?)",
+                                        (time.time(), devices))
+            return cursor.lastrowid
+
+    def finish_run(self, run_id):
+        """Markeer een run als afgelopen."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE runs SET finished = ? WHERE id = ?", (time.time(), run_id))
+
+    def record_device(self, run_id, device, result, alerts=(), timestamp=None):
+        """Schrijf alles van één device in één transactie weg."""
+        timestamp = timestamp if timestamp is not None else time.time()
+        status = result.get("status", "unknown")
+
+        result_rows = [(run_id, device, timestamp, status, None, None, None)]
+        for check, value in result.items():
+            if check in ("status", "hostname"):
+                continue
+            for key, item in flatten_result(value):
+                result_rows.append((run_id, device, timestamp, status, check, key or None, item))
+
+        # Dezelfde alert kan meerdere keren gezien zijn tijdens de check: één rij per alert
+        alert_rows = {}
+        for alert in alerts:
+            alert_rows[id(alert)] = (run_id, alert["device"], timestamp, alert["severity"],
+                                     alert.get("type"), alert.get("subject"),
+                                     alert["message"], alert.get("count", 1))
+
+        resource_rows = []
+        resources = result.get("resources")
+        if resources:
+            resource_rows.append((run_id, device, timestamp,
+                                  _percentage(resources.get("cpu")),
+                                  _percentage(resources.get("memory"))))
+
+        interface_rows = [
+            (run_id, device, timestamp, iface["name"], iface["status"], iface["protocol"])
+            for iface in (result.get("interfaces") or {}).get("interfaces", [])
+        ]
+
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", result_rows)
+            if alert_rows:
+                self._conn.executemany("INSERT INTO alerts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                       list(alert_rows.values()))
+            if resource_rows:
+                self._conn.executemany("INSERT INTO resource_samples VALUES (?, ?, ?, ?, ?)",
+                                       resource_rows)
+            if interface_rows:
+                self._conn.executemany("INSERT INTO interface_states VALUES (?, ?, ?, ?, ?, ?)",
+                                       interface_rows)
+
+    def _query(self, sql, params):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def query_alerts(self, severity=None, alert_type=None, device=None, since=None, until=None):
+        """Alerts gefilterd op severity/type/device en tijdsvenster, nieuwste eerst."""
+        clauses = []
+        params = []
+        for column, value in (("severity", severity), ("type", alert_type), ("device", device)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._query(f"SELECT * FROM alerts {where} ORDER BY timestamp DESC", params)
+
+    def devices_with_alerts(self, severity, alert_type=None, since=None):
+        """Devices met minstens één alert van deze severity (en type) sinds een tijdstip."""
+        sql = "SELECT device, COUNT(*) AS alerts, MAX(timestamp) AS last FROM alerts WHERE severity = ?"
+        params = [severity]
+        if alert_type is not None:
+            sql += " AND type = ?"
+            params.append(alert_type)
+        if since is not None:
+            sql += " AND timestamp >= ?"
+            params.append(since)
+        return self._query(sql + " GROUP BY device ORDER BY alerts DESC", params)
+
+    def resource_history(self, device, since=None):
+        """CPU/memory samples van een device, oudste eerst."""
+        return self._query(
+            "SELECT timestamp, cpu, memory FROM resource_samples "
+            "WHERE device = ? AND timestamp >= ? ORDER BY timestamp",
+            (device, since or 0))
+
+    def interface_history(self, device, interface=None, since=None):
+        """Interface states van een device (optioneel één interface), oudste eerst."""
+        sql = ("SELECT timestamp, interface, status, protocol FROM interface_states "
+               "WHERE device = ? AND timestamp >= ?")
+        params = [device, since or 0]
+        if interface is not None:
+            sql += " AND interface = ?"
+            params.append(interface)
+        return self._query(sql + " ORDER BY timestamp", params)
+
+    def runs(self, limit=20):
+        """De laatste runs, nieuwste eerst."""
+        return self._query("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Main execution: devices met alerts van een severity in de laatste dagen
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query de health check historiek")
+    parser.add_argument("--db", default="health_reports/history.db", help="SQLite database")
+    parser.add_argument("--severity", default="CRITICAL", help="Alert severity")
+    parser.add_argument("--type", default=None, help="Alert type (bv. cpu, memory, interface_down)")
+    parser.add_argument("--days", type=float, default=7, help="Aantal dagen terug")
+    args = parser.parse_args()
+
+    history = HistoryStore(args.db)
+
+    print("=" * 60)
+    print(f"Devices met {args.severity} alerts"
+          f"{f' ({args.type})' if args.type else ''} in de laatste {args.days:g} dagen")
+    print("=" * 60)
+    start = time.perf_counter()
+    rows = history.devices_with_alerts(args.severity, args.type, since=time.time() - args.days * 86400)
+    elapsed = (time.perf_counter() - start) * 1000
+    for row in rows:
+        last = datetime.fromtimestamp(row["last"]).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"  {row['device']}: {row['alerts']} alert(s), laatste op {last}")
+    if not rows:
+        print("  Geen devices gevonden.")
+    print(f"\nQuery tijd: {elapsed:.1f} ms")
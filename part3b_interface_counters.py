@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Interface counter deltas
+
+Een interface met 5 oude CRC errors van vorig jaar mag niet bij elke run een
+alert geven. Daarom wordt de volledige 'show interfaces' output geparsed en
+per device een snapshot van de tellers bewaard:
+
+- Per interface: packets in/out, input/output errors, CRC, input/output drops
+- Bij elke poll worden de tellers vergeleken met de vorige snapshot en
+  omgezet naar een rate per seconde (NumPy, voor alle interfaces tegelijk)
+- Alerts gaan af op rate thresholds, niet op absolute tellers
+- Een teller die daalt (clear counters, reload) geeft geen rate voor die poll
+
+Snapshots worden als JSON per device bewaard, zodat ook een nieuwe run (of
+een herstart van de daemon) met de vorige poll kan vergelijken.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+COUNTERS = ("packets_in", "packets_out", "input_errors", "output_errors",
+            "crc", "input_drops", "output_drops")
+
+# Maximale rate per seconde per teller voor een alert (None = geen alert)
+DEFAULT_THRESHOLDS = {
+    "input_errors": 1.0,
+    "output_errors": 1.0,
+    "crc": 0.5,
+    "input_drops": 10.0,
+    "output_drops": 10.0
+}
+
+_HEADER = re.compile(r"^(\S+) is (.+?), line protocol is (\S+)", re.MULTILINE)
+_PATTERNS = {
+    "packets_in": re.compile(r"(\d+) packets input"),
+    "packets_out": re.compile(r"(\d+) packets output"),
+    "input_errors": re.compile(r"(\d+) input errors"),
+    "output_errors": re.compile(r"(\d+) output errors"),
+    "crc": re.compile(r"(\d+) CRC"),
+    "input_drops": re.compile(r"Input queue: \d+/\d+/(\d+)/"),
+    "output_drops": re.compile(r"Total output drops: (\d+)")
+}
+
+
+def parse_show_interfaces(output):
+    """Parse volledige 'show interfaces' output naar {interface: {teller: waarde}}."""
+    interfaces = {}
+    headers = list(_HEADER.finditer(output))
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(output)
+        block = output[header.end():end]
+        counters = {"status": header.group(2), "protocol": header.group(3)}
+        for counter, pattern in _PATTERNS.items():
+            match = pattern.search(block)
+            counters[counter] = int(match.group(1)) if match else 0
+        interfaces[header.group(1)] = counters
+    return interfaces
+
+
+class CounterStore:
+    """Snapshots van interface tellers per device met rate berekening."""
+
+    def __init__(self, path="health_reports/counters", thresholds=None):
+        self.path = path
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        # Threshold per kolom van de teller matrix (NaN = geen threshold)
+        self._threshold_vector = np.array(
+            [self.thresholds.get(counter) if self.thresholds.get(counter) is not None else np.nan
+             for counter in COUNTERS], dtype=np.float64)
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+    def _snapshot_path(self, device):
+        safe_name = re.sub(r"[^\w.\-]", "_", device)
+        return os.path.join(self.path, f"{safe_name}.json")
+
+    def _load(self, device):
+        snapshot = self._snapshots.get(device)
+        if snapshot is None and os.path.exists(self._snapshot_path(device)):
+            with open(self._snapshot_path(device)) as f:
+                data = json.load(f)
+            # Snapshots met een andere set tellers zijn niet vergelijkbaar
+            if tuple(data.get("counters", ())) == COUNTERS:
+                snapshot = (data["timestamp"], data["interfaces"],
+                            np.array(data["values"], dtype=np.float64).reshape(-1, len(COUNTERS)))
+        return snapshot
+
+    def update(self, device, interfaces, timestamp=None):
+        """Sla een nieuwe snapshot op en return {interface: {teller: rate per seconde}}.
+
+        Zonder vorige snapshot (eerste poll) zijn alle rates None.
+        """
+        timestamp = timestamp if timestamp is not None else time.time()
+        names = sorted(interfaces)
+        values = np.array([[interfaces[name][counter] for counter in COUNTERS] for name in names],
+                          dtype=np.float64).reshape(-1, len(COUNTERS))
+
+        with self._lock:
+            previous = self._load(device)
+            self._snapshots[device] = (timestamp, names, values)
+
+        rates = np.full(values.shape, np.nan)
+        if previous is not None and timestamp > previous[0]:
+            prev_timestamp, prev_names, prev_values = previous
+            prev_index = {name: i for i, name in enumerate(prev_names)}
+            positions = np.array([prev_index.get(name, -1) for name in names], dtype=np.int64)
+            known = positions >= 0
+
+            delta = np.full(values.shape, np.nan)
+            delta[known] = values[known] - prev_values[positions[known]]
+            # Dalende teller: counters gecleared of device herstart
+            delta[delta < 0] = np.nan
+            rates = delta / (timestamp - prev_timestamp)
+
+        with open(self._snapshot_path(device), "w") as f:
+            json.dump({"timestamp": timestamp, "counters": COUNTERS,
+                       "interfaces": names, "values": values.tolist()}, f)
+
+        return {name: {counter: (None if np.isnan(rate) else round(float(rate), 3))
+                       for counter, rate in zip(COUNTERS, row)}
+                for name, row in zip(names, rates)}
+
+    def exceeded(self, rates):
+        """Lijst van (interface, teller, rate) boven de threshold."""
+        names = list(rates)
+        if not names:
+            return []
+        matrix = np.array([[rates[name][counter] if rates[name][counter] is not None else np.nan
+                            for counter in COUNTERS] for name in names], dtype=np.float64)
+        # NaN (geen rate of geen threshold) vergelijkt altijd als False
+        rows, columns = np.nonzero(matrix > self._threshold_vector)
+        return [(names[row], COUNTERS[column], float(matrix[row, column]))
+                for row, column in zip(rows, columns)]
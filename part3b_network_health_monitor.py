@@ -16,350 +16,483 @@ Perfect voor dagelijks gebruik door een network engineer!
 """
 
 from netmiko import ConnectHandler
+from part3b_alert_manager import AlertManager
+from part3b_backup_store import BackupStore
+from part3b_cassette import Cassette, RecordingConnection
+from part3b_config_diff import diff_backups, summarize
+from part3b_compliance import DEFAULT_RULES_FILE
+from part3b_command_cache import CommandCache, CachedConnection
+from part3b_circuit_breaker import CircuitBreaker
+from part3b_check_plugins import CHECK_REGISTRY, build_command_plan, get_checks, parse_outputs
+from part3b_health_daemon import HealthDaemon
+from part3b_history_store import HistoryStore
+from part3b_interface_counters import CounterStore
+from part3b_reachability import device_key, probe_devices
+from part3b_remediation import RemediationExecutor, plan_interface_resets
+from part3b_report_writer import ReportWriter
+from part3b_result_export import ResultExporter
+from part3b_session_pool import SessionPool
+from part3b_timeseries import TimeSeriesStore
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import argparse
+import contextvars
 import os
 import json
-import re
+import threading
+
+# Alerts verzameld tijdens de check van één device. Een ContextVar in plaats
+# van threading.local: elke worker thread én elke asyncio task heeft zijn eigen lijst.
+_DEVICE_ALERTS = contextvars.ContextVar("device_alerts", default=None)
 
 
 class NetworkHealthMonitor:
     """Comprehensive network health monitoring and automation tool."""
     
-    def __init__(self, devices):
+    def __init__(self, devices, max_workers=10, cache_ttl=None, batch_commands=True,
+                 session_pool=None, timeseries=None, compliance_rules=DEFAULT_RULES_FILE,
+                 history=None, probe_timeout=1.5, cassette_dir=None):
         self.devices = devices
         self.results = {}
-        self.alerts = []
         self.report_dir = "health_reports"
+        self.max_workers = max_workers
+        
+        # Gedeelde command output cache voor alle checks
+        # cache_ttl=None: cache geldt per run, anders max cache_ttl seconden (daemon mode)
+        self.command_cache = CommandCache(ttl=cache_ttl)
+        
+        # Stuur alle show commands van een device in één batch (één round trip)
+        self.batch_commands = batch_commands
+        
+        # Optionele SessionPool: sessies hergebruiken in plaats van telkens te verbinden
+        self.session_pool = session_pool
+        
+        # Optionele TimeSeriesStore voor CPU/memory/interface trends
+        self.timeseries = timeseries
+        
+        # Optionele HistoryStore (SQLite): resultaten en alerts blijven bewaard na de run
+        self.history = history
+        self.history_run_id = None
+        
+        # Deadline van de TCP pre-probe (None = geen pre-probe)
+        self.probe_timeout = probe_timeout
+        
+        # Optionele map waarin elke sessie als cassette wordt opgenomen (offline replay)
+        self.cassette_dir = cassette_dir
+        
+        # Rule file met de compliance regels voor de security check
+        self.compliance_rules = compliance_rules
+        
+        # Lock voor results: meerdere worker threads schrijven tegelijk
+        self._lock = threading.Lock()
         
         if not os.path.exists(self.report_dir):
             os.makedirs(self.report_dir)
+        
+        # Elke unieke config wordt maar één keer (gecomprimeerd) opgeslagen
+        self.backup_store = BackupStore(f"{self.report_dir}/backups")
+        
+        # Geplande remediation acties, per device samengevoegd tot één config-set
+        self.remediation = RemediationExecutor(max_workers=max_workers)
+        
+        # Circuit breaker per device: chronisch falende devices kosten bijna niets per cyclus
+        self.circuit_breaker = CircuitBreaker(f"{self.report_dir}/circuit_breaker.json")
+        
+        # Snapshots van interface tellers voor error/drop rates tussen twee polls
+        self.interface_counters = CounterStore(f"{self.report_dir}/counters")
+        
+        # Gededupliceerde, begrensde alerts met gebufferde console/log output
+        self.alert_manager = AlertManager(log_file=f"{self.report_dir}/alerts.log")
+    
+    @property
+    def alerts(self):
+        """Lijst van alle bewaarde alerts (één per device/type/subject)."""
+        return self.alert_manager.list()
+    
+    def circuit_allows(self, device):
+        """True als het circuit van het device een connect toelaat, anders een alert.
+        
+        Het circuit hoort bij host en SSH poort, zodat devices achter één
+        adres (bv. port forwards of de simulator) elkaar niet blokkeren.
+        """
+        breaker_key = "%s:%s" % device_key(device)
+        if self.circuit_breaker.allow(breaker_key):
+            return True
+        retry_at = datetime.fromtimestamp(self.circuit_breaker.retry_at(breaker_key) or 0)
+        self.add_alert("WARNING", device.get("device_name", device["host"]),
+                       f"Overgeslagen: circuit open tot {retry_at.strftime('%H:%M:%S')}",
+                       "connection", "circuit_open")
+        return False
+    
+    def record_connect(self, device, error=None):
+        """Verwerk de uitkomst van een connect (error=None: gelukt) in het circuit."""
+        breaker_key = "%s:%s" % device_key(device)
+        if error is None:
+            self.circuit_breaker.record_success(breaker_key)
+            return
+        state = self.circuit_breaker.record_failure(breaker_key, error)
+        # Vast subject: de message verschilt per poging (foutmelding, circuit status)
+        self.add_alert("CRITICAL", device.get("device_name", device["host"]),
+                       f"Verbindingsfout: {error} (circuit {state})", "connection", "connection")
     
     def connect_device(self, device):
-        """Maak verbinding met een device."""
+        """Maak verbinding met een device.
+        
+        Devices met een open circuit worden overgeslagen tot hun backoff
+        verstreken is; dat kost dan geen connect timeout meer.
+        """
+        if not self.circuit_allows(device):
+            return None
+        
+        params = {k: v for k, v in device.items() if k != "device_name"}
         try:
-            conn = ConnectHandler(**device)
-            return conn
+            if self.session_pool is not None:
+                conn = self.session_pool.acquire(params)
+            else:
+                conn = ConnectHandler(**params)
         except Exception as e:
-            self.add_alert("CRITICAL", device["host"], f"Verbindingsfout: {e}")
+            self.record_connect(device, e)
             return None
-    
-    def add_alert(self, severity, device, message):
-        """Voeg een alert toe."""
-        alert = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "severity": severity,
-            "device": device,
-            "message": message
-        }
-        self.alerts.append(alert)
         
-        # Print alert direct
-        icon = {"CRITICAL": "🔴", "WARNING": "🟡", "INFO": "🟢"}.get(severity, "⚪")
-        print(f"{icon} [{severity}] {device}: {message}")
+        self.record_connect(device)
+        return conn
+    
+    def release_device(self, conn, discard=False):
+        """Geef een verbinding terug aan de pool, of sluit ze zonder pool."""
+        if self.session_pool is not None:
+            self.session_pool.release(conn, discard=discard)
+        else:
+            conn.disconnect()
+    
+    def add_alert(self, severity, device, message, alert_type=None, subject=None):
+        """Voeg een alert toe.
+        
+        Alerts met dezelfde (device, alert_type, subject) worden samengevoegd;
+        zonder subject telt de message zelf als subject.
+        """
+        alert = self.alert_manager.add(severity, device, message, alert_type, subject)
+        collected = _DEVICE_ALERTS.get()
+        if collected is not None:
+            collected.append(alert)
+        return alert
+    
+    def start_device_history(self):
+        """Begin met het verzamelen van de alerts van het device in deze thread of task."""
+        _DEVICE_ALERTS.set([])
+    
+    def record_device_history(self, device_name, result):
+        """Schrijf result en verzamelde alerts van een device in één transactie weg.
+        
+        Return de verzamelde alerts.
+        """
+        alerts = _DEVICE_ALERTS.get() or []
+        _DEVICE_ALERTS.set(None)
+        if self.history is not None and self.history_run_id is not None:
+            self.history.record_device(self.history_run_id, device_name, result, alerts)
+        return alerts
+    
+    def start_recording(self, conn, device_name):
+        """Neem de sessie op als cassette_dir gezet is. Return (conn, cassette of None).
+        
+        Wrap de CachedConnection: ook outputs uit de cache komen in de cassette.
+        """
+        if not self.cassette_dir:
+            return conn, None
+        cassette = Cassette(device_name)
+        return RecordingConnection(conn, cassette), cassette
+    
+    def save_recording(self, cassette):
+        """Bewaar een cassette, ook als een parser of check faalde (net die sessies wil je afspelen)."""
+        if cassette is None or not cassette.interactions:
+            return
+        try:
+            cassette.save(self.cassette_dir)
+        except OSError as e:
+            self.add_alert("WARNING", cassette.device_name, f"Cassette niet bewaard: {e}", "cassette")
+    
+    def execute_plan(self, conn, plan, netconf=None):
+        """Haal alle outputs van een command plan op (elk command maar één keer)."""
+        if self.batch_commands and hasattr(conn, "send_command_batch"):
+            raw_outputs = conn.send_command_batch(plan.cli)
+        else:
+            raw_outputs = {command: conn.send_command(command) for command in plan.cli}
+        
+        # NETCONF filters enkel als er een ncclient sessie is meegegeven
+        if netconf is not None:
+            for netconf_filter in plan.netconf:
+                raw_outputs[netconf_filter] = netconf.get(filter=("subtree", netconf_filter)).data_xml
+        
+        return parse_outputs(raw_outputs)
+    
+    def run_check(self, name, conn, device_name):
+        """Voer een enkele geregistreerde check uit."""
+        check = CHECK_REGISTRY[name]
+        outputs = self.execute_plan(conn, build_command_plan([check]))
+        return check.evaluate(self, device_name, outputs)
     
     def check_interfaces(self, conn, device_name):
         """Check interface status en statistieken."""
-        output = conn.send_command("show ip interface brief")
-        interface_stats = conn.send_command("show interfaces | include errors|drops|CRC")
-        
-        results = {"interfaces": [], "issues": []}
-        
-        for line in output.strip().split("\n")[1:]:
-            parts = line.split()
-            if len(parts) >= 6:
-                iface = {
-                    "name": parts[0],
-                    "ip": parts[1],
-                    "status": parts[4],
-                    "protocol": parts[5]
-                }
-                results["interfaces"].append(iface)
-                
-                # Check for down interfaces (exclude admin down)
-                if parts[4] == "down" and parts[5] == "down":
-                    if "Loopback" not in parts[0]:  # Ignore loopbacks
-                        self.add_alert("WARNING", device_name, 
-                                      f"Interface {parts[0]} is down")
-                        results["issues"].append(f"{parts[0]} is down")
-        
-        # Check voor errors in interface stats
-        if "errors" in interface_stats.lower():
-            error_count = len(re.findall(r'[1-9]\d* \w+ errors', interface_stats))
-            if error_count > 0:
-                self.add_alert("WARNING", device_name, 
-                              f"Interface errors gedetecteerd op {error_count} interface(s)")
-        
-        return results
+        return self.run_check("interfaces", conn, device_name)
     
     def check_cpu_memory(self, conn, device_name):
         """Check CPU en memory usage."""
-        cpu_output = conn.send_command("show processes cpu | include CPU")
-        memory_output = conn.send_command("show memory statistics | include Processor")
-        
-        results = {"cpu": "unknown", "memory": "unknown"}
-        
-        # Parse CPU
-        cpu_match = re.search(r'(\d+)%', cpu_output)
-        if cpu_match:
-            cpu_usage = int(cpu_match.group(1))
-            results["cpu"] = f"{cpu_usage}%"
-            
-            if cpu_usage > 80:
-                self.add_alert("CRITICAL", device_name, f"Hoge CPU usage: {cpu_usage}%")
-            elif cpu_usage > 60:
-                self.add_alert("WARNING", device_name, f"Verhoogde CPU usage: {cpu_usage}%")
-        
-        # Parse Memory
-        mem_match = re.search(r'Processor\s+(\d+)\s+(\d+)\s+(\d+)', memory_output)
-        if mem_match:
-            total = int(mem_match.group(1))
-            used = int(mem_match.group(2))
-            free = int(mem_match.group(3))
-            usage_pct = (used / total) * 100 if total > 0 else 0
-            results["memory"] = f"{usage_pct:.1f}%"
-            
-            if usage_pct > 85:
-                self.add_alert("CRITICAL", device_name, f"Hoge memory usage: {usage_pct:.1f}%")
-            elif usage_pct > 70:
-                self.add_alert("WARNING", device_name, f"Verhoogde memory usage: {usage_pct:.1f}%")
-        
-        return results
+        return self.run_check("resources", conn, device_name)
     
     def check_routing(self, conn, device_name):
         """Check routing table health."""
-        route_output = conn.send_command("show ip route summary")
-        ospf_output = conn.send_command("show ip ospf neighbor")
-        
-        results = {"routes": {}, "ospf_neighbors": 0}
-        
-        # Parse route summary
-        for line in route_output.split("\n"):
-            if "connected" in line.lower():
-                match = re.search(r'(\d+)', line)
-                if match:
-                    results["routes"]["connected"] = int(match.group(1))
-            elif "static" in line.lower():
-                match = re.search(r'(\d+)', line)
-                if match:
-                    results["routes"]["static"] = int(match.group(1))
-            elif "ospf" in line.lower():
-                match = re.search(r'(\d+)', line)
-                if match:
-                    results["routes"]["ospf"] = int(match.group(1))
-        
-        # Check OSPF neighbors
-        if "FULL" in ospf_output:
-            results["ospf_neighbors"] = ospf_output.count("FULL")
-            self.add_alert("INFO", device_name, 
-                          f"OSPF: {results['ospf_neighbors']} neighbor(s) in FULL state")
-        
-        return results
+        return self.run_check("routing", conn, device_name)
     
     def check_security(self, conn, device_name):
         """Check security configuratie."""
-        config = conn.send_command("show running-config")
-        
-        checks = {
-            "ssh_enabled": "ip ssh version 2" in config,
-            "enable_secret": "enable secret" in config,
-            "service_password_encryption": "service password-encryption" in config,
-            "logging_enabled": "logging" in config,
-            "ntp_configured": "ntp server" in config,
-            "banner_configured": "banner" in config
-        }
-        
-        for check, passed in checks.items():
-            if not passed:
-                self.add_alert("WARNING", device_name, 
-                              f"Security check gefaald: {check}")
-        
-        return checks
+        return self.run_check("security", conn, device_name)
     
     def backup_config(self, conn, device_name):
         """Maak config backup."""
-        config = conn.send_command("show running-config")
+        return self.run_check("backup", conn, device_name)
+    
+    def write_backup(self, device_name, config):
+        """Sla een config backup op in de content-addressed backup store.
+        
+        Een ongewijzigde config wordt niet opnieuw weggeschreven; het
+        resultaat verwijst naar het (gedeelde) blob van die versie.
+        """
+        digest, changed = self.backup_store.save(device_name, config)
+        if changed:
+            # Vergelijk met de vorige versie (indien die er is)
+            changes = summarize(diff_backups(self.backup_store, device_name))
+            if any(changes.values()):
+                self.add_alert("WARNING", device_name,
+                               f"Config gewijzigd: +{changes['add']} -{changes['remove']} "
+                               f"~{changes['modify']} ({digest[:12]})", "config_change")
+            else:
+                self.add_alert("INFO", device_name, f"Nieuwe config versie opgeslagen ({digest[:12]})",
+                               "config_backup")
+        return self.backup_store.blob_path(digest)
+    
+    def plan_remediation(self, device_name, issues):
+        """Plan remediation acties in; ze worden na de checks als één config-set uitgevoerd."""
+        actions = plan_interface_resets(device_name, issues)
+        self.remediation.add_many(actions)
+        return [f"Interface {action.target} reset gepland" for action in actions]
+    
+    def apply_remediation_records(self, result, records):
+        """Verwerk de uitkomst van uitgevoerde remediation acties in het result van een device."""
+        remediation_log = []
+        for record in records:
+            if record["outcome"] == "ok":
+                remediation_log.append(f"Interface {record['target']} reset uitgevoerd "
+                                       f"({record['latency']:.2f}s)")
+                self.add_alert("INFO", record["device"],
+                               f"Automatische remediation: {record['target']} reset",
+                               "remediation", record["target"])
+            else:
+                remediation_log.append(f"Remediation gefaald voor {record['target']}: {record['error']}")
+        result["remediation"] = remediation_log
+        result["remediation_records"] = records
+        # De config is gewijzigd: gecachte show output is niet meer geldig
+        self.command_cache.invalidate(records[0]["device"])
+    
+    def remediate(self, conn, device_name, result):
+        """Voer de geplande remediation van een device uit over zijn nog open verbinding.
+        
+        Return True als de config-set faalde (de sessie wordt dan niet hergebruikt).
+        """
+        records = self.remediation.run_device(device_name, conn)
+        if not records:
+            return False
+        self.apply_remediation_records(result, records)
+        return any(record["outcome"] != "ok" for record in records)
+    
+    def run_remediation(self):
+        """Voer de resterende geplande remediation acties uit: één config-set per device, parallel.
+        
+        Normaal voert check_device de acties al uit over de open sessie; dit
+        verbindt opnieuw voor acties die daarbuiten gepland werden.
+        """
+        if not self.remediation.pending():
+            return []
+        
+        devices = {device.get("device_name", device["host"]): device for device in self.devices}
+        
+        def connect(device_name):
+            return self.connect_device(devices[device_name])
+        
+        records = self.remediation.run(connect, self.release_device)
+        
+        by_device = {}
+        for record in records:
+            by_device.setdefault(record["device"], []).append(record)
+        for device_name, device_records in by_device.items():
+            with self._lock:
+                result = self.results.setdefault(device_name, {})
+            self.apply_remediation_records(result, device_records)
+        
+        failed = sum(1 for record in records if record["outcome"] != "ok")
+        print(f"\n🔧 Remediation: {len(records)} actie(s) op {len(by_device)} device(s), "
+              f"{failed} gefaald")
+        return records
+    
+    def run_checks(self, conn, device_name, auto_fix=False, checks=None, netconf=None):
+        """Voer alle (of de gegeven) checks uit over een open verbinding.
+        
+        Eerst wordt een gededupliceerd command plan gebouwd voor alle checks,
+        zodat het aantal round trips niet meegroeit met het aantal checks.
+        """
+        checks = checks or get_checks()
+        plan = build_command_plan(checks)
+        outputs = self.execute_plan(conn, plan, netconf)
+        
+        result = {
+            "status": "checked",
+            "hostname": conn.find_prompt().replace("#", "").replace(">", "")
+        }
+        for check in checks:
+            result[check.result_key] = check.evaluate(self, device_name, outputs)
+        
+        # Auto remediation indien gewenst: enkel inplannen, uitvoeren gebeurt
+        # als één config-set per device nadat alle checks gedaan zijn
+        if auto_fix and result.get("interfaces", {}).get("issues"):
+            result["remediation"] = self.plan_remediation(
+                device_name,
+                result["interfaces"]["issues"]
+            )
+        
+        return result
+    
+    def check_device(self, device, auto_fix=False):
+        """Voer alle checks uit op een enkel device (draait in een worker thread)."""
+        device_name = device.get("device_name", device["host"])
+        
+        print(f"📡 Controleren: {device_name}")
+        self.start_device_history()
+        
+        conn = self.connect_device(device)
+        if not conn:
+            result = {"status": "unreachable"}
+        else:
+            cached_conn, cassette = self.start_recording(
+                CachedConnection(conn, self.command_cache, device_name), device_name)
+            try:
+                result = self.run_checks(cached_conn, device_name, auto_fix)
+                # Remediation over dezelfde sessie, vóór de history: de uitkomst komt mee in SQLite
+                failed = self.remediate(conn, device_name, result)
+                self.release_device(conn, discard=failed)
+                self.add_alert("INFO", device_name, "Health check voltooid", "health_check")
+                
+            except Exception as e:
+                self.add_alert("CRITICAL", device_name, f"Health check fout: {e}",
+                               "health_check", "error")
+                result = {"status": "error", "error": str(e)}
+                self.release_device(conn, discard=True)
+            finally:
+                self.save_recording(cassette)
+        
+        self.record_device_history(device_name, result)
+        with self._lock:
+            self.results[device_name] = result
+        return result
+    
+    def filter_reachable(self, devices):
+        """TCP pre-probe van alle devices tegelijk; return enkel de bereikbare devices.
+        
+        Onbereikbare devices worden meteen als 'unreachable' gemarkeerd in plaats
+        van de volledige netmiko connect timeout af te wachten.
+        """
+        open_ports = probe_devices(devices, timeout=self.probe_timeout)
+        reachable = []
+        for device in devices:
+            if open_ports.get(device_key(device)):
+                reachable.append(device)
+                continue
+            device_name = device.get("device_name", device["host"])
+            self.start_device_history()
+            self.add_alert("CRITICAL", device_name,
+                           "Niet bereikbaar (geen antwoord op TCP pre-probe)",
+                           "connection", "connection")
+            result = {"status": "unreachable"}
+            self.record_device_history(device_name, result)
+            with self._lock:
+                self.results[device_name] = result
+        
+        if len(reachable) < len(devices):
+            print(f"⚡ Pre-probe: {len(devices) - len(reachable)} van {len(devices)} device(s) onbereikbaar\n")
+        return reachable
+    
+    def run_health_check(self, auto_fix=False, max_workers=None):
+        """Voer complete health check uit op alle devices.
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{self.report_dir}/{device_name}_backup_{timestamp}.cfg"
+        Devices worden parallel gecontroleerd met een begrensde thread pool:
+        de totale duur hangt dan af van het traagste device in plaats van
+        de som van alle devices. max_workers=1 geeft het oude sequentiële gedrag.
+        """
+        workers = max_workers or self.max_workers
         
-        with open(filename, "w") as f:
-            f.write(config)
+        # Zonder TTL is de cache enkel geldig binnen deze run
+        if self.command_cache.ttl is None:
+            self.command_cache.clear()
         
-        return filename
-    
-    def auto_remediate(self, conn, device_name, issues):
-        """Probeer automatisch problemen op te lossen."""
-        remediation_log = []
+        if self.history is not None:
+            self.history_run_id = self.history.start_run(len(self.devices))
         
-        for issue in issues:
-            if "down" in issue and "Loopback" not in issue:
-                # Probeer interface te resetten
-                interface = issue.split()[0]
-                try:
-                    commands = [
-                        f"interface {interface}",
-                        "shutdown",
-                        "no shutdown"
-                    ]
-                    conn.send_config_set(commands)
-                    remediation_log.append(f"Interface {interface} reset uitgevoerd")
-                    self.add_alert("INFO", device_name, 
-                                  f"Automatische remediation: {interface} reset")
-                except Exception as e:
-                    remediation_log.append(f"Remediation gefaald voor {interface}: {e}")
-        
-        return remediation_log
-    
-    def run_health_check(self, auto_fix=False):
-        """Voer complete health check uit op alle devices."""
         print("\n" + "=" * 60)
         print("🔍 NETWORK HEALTH MONITOR")
         print("=" * 60)
         print(f"Startijd: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Aantal devices: {len(self.devices)}")
+        print(f"Parallelle workers: {workers}")
         print(f"Auto-remediation: {'Aan' if auto_fix else 'Uit'}")
         print("=" * 60 + "\n")
         
-        for device in self.devices:
-            device_name = device.get("device_name", device["host"])
-            device_params = {k: v for k, v in device.items() if k != "device_name"}
-            
-            print(f"\n📡 Controleren: {device_name}")
-            print("-" * 40)
-            
-            conn = self.connect_device(device_params)
-            if not conn:
-                self.results[device_name] = {"status": "unreachable"}
-                continue
-            
-            try:
-                # Voer alle checks uit
-                self.results[device_name] = {
-                    "status": "checked",
-                    "hostname": conn.find_prompt().replace("#", "").replace(">", ""),
-                    "interfaces": self.check_interfaces(conn, device_name),
-                    "resources": self.check_cpu_memory(conn, device_name),
-                    "routing": self.check_routing(conn, device_name),
-                    "security": self.check_security(conn, device_name),
-                    "backup_file": self.backup_config(conn, device_name)
-                }
-                
-                # Auto remediation indien gewenst
-                if auto_fix and self.results[device_name]["interfaces"]["issues"]:
-                    self.results[device_name]["remediation"] = self.auto_remediate(
-                        conn, device_name, 
-                        self.results[device_name]["interfaces"]["issues"]
-                    )
-                
-                conn.disconnect()
-                self.add_alert("INFO", device_name, "Health check voltooid")
-                
-            except Exception as e:
-                self.add_alert("CRITICAL", device_name, f"Health check fout: {e}")
-                self.results[device_name] = {"status": "error", "error": str(e)}
+        devices = self.devices
+        if self.probe_timeout is not None:
+            devices = self.filter_reachable(devices)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() zorgt dat exceptions uit de workers niet verloren gaan
+            list(executor.map(lambda d: self.check_device(d, auto_fix), devices))
         
+        if auto_fix:
+            self.run_remediation()
+        
+        self.alert_manager.flush()
+        if self.history is not None:
+            self.history.finish_run(self.history_run_id)
         self.generate_report()
     
     def generate_report(self):
-        """Genereer HTML rapport."""
+        """Genereer HTML rapport (index pagina + gepagineerde detail pagina's) en NDJSON/CSV export."""
+        alerts = self.alerts
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_file = f"{self.report_dir}/health_report_{timestamp}.html"
-        
-        html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Network Health Report</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-        .container { max-width: 1200px; margin: 0 auto; }
-        h1 { color: #333; border-bottom: 3px solid #007bff; padding-bottom: 10px; }
-        .device-card { background: white; border-radius: 8px; padding: 20px; margin: 15px 0; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-        .device-header { font-size: 1.3em; font-weight: bold; color: #007bff; }
-        .status-ok { color: green; }
-        .status-warning { color: orange; }
-        .status-critical { color: red; }
-        .check-item { margin: 5px 0; padding: 5px; background: #f8f9fa; border-radius: 4px; }
-        .alert-box { padding: 10px; margin: 5px 0; border-radius: 4px; }
-        .alert-CRITICAL { background: #ffebee; border-left: 4px solid red; }
-        .alert-WARNING { background: #fff8e1; border-left: 4px solid orange; }
-        .alert-INFO { background: #e3f2fd; border-left: 4px solid blue; }
-        table { width: 100%; border-collapse: collapse; }
-        th, td { padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }
-        th { background: #007bff; color: white; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🔍 Network Health Report</h1>
-        <p><strong>Generated:</strong> """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """</p>
-        
-        <h2>📋 Alerts Summary</h2>
-"""
         
-        # Alerts section
-        for alert in self.alerts:
-            html += f"""
-        <div class="alert-box alert-{alert['severity']}">
-            <strong>[{alert['severity']}]</strong> {alert['device']}: {alert['message']}
-            <small>({alert['timestamp']})</small>
-        </div>
-"""
-        
-        # Device sections
-        html += "<h2>📡 Device Details</h2>"
-        
-        for device_name, data in self.results.items():
-            status_class = "status-ok" if data.get("status") == "checked" else "status-critical"
-            html += f"""
-        <div class="device-card">
-            <div class="device-header">{device_name}</div>
-            <p class="{status_class}">Status: {data.get('status', 'unknown').upper()}</p>
-"""
-            
-            if data.get("resources"):
-                html += f"""
-            <div class="check-item">
-                <strong>Resources:</strong> CPU: {data['resources'].get('cpu', 'N/A')} | 
-                Memory: {data['resources'].get('memory', 'N/A')}
-            </div>
-"""
-            
-            if data.get("security"):
-                passed = sum(1 for v in data['security'].values() if v)
-                total = len(data['security'])
-                html += f"""
-            <div class="check-item">
-                <strong>Security Checks:</strong> {passed}/{total} passed
-            </div>
-"""
-            
-            if data.get("backup_file"):
-                html += f"""
-            <div class="check-item">
-                <strong>Backup:</strong> {data['backup_file']}
-            </div>
-"""
-            
-            html += "</div>"
-        
-        html += """
-    </div>
-</body>
-</html>
-"""
-        
-        with open(report_file, "w") as f:
-            f.write(html)
+        # Fragmenten gaan rechtstreeks naar de bestanden; geen html += over de hele vloot.
+        # HTML en export worden in dezelfde pass over de resultaten geschreven.
+        with ReportWriter(self.report_dir, timestamp) as report, \
+                ResultExporter(self.report_dir, timestamp) as export:
+            for alert in alerts:
+                report.write_alert(alert)
+                export.write_alert(alert)
+            for device_name, data in self.results.items():
+                report.write_device(device_name, data)
+                export.write_device(device_name, data)
+        report_file = report.index_file
         
         print("\n" + "=" * 60)
         print("📊 RAPPORT GEGENEREERD")
         print("=" * 60)
         print(f"Bestand: {report_file}")
-        print(f"Totaal alerts: {len(self.alerts)}")
-        print(f"  - Critical: {sum(1 for a in self.alerts if a['severity'] == 'CRITICAL')}")
-        print(f"  - Warning: {sum(1 for a in self.alerts if a['severity'] == 'WARNING')}")
-        print(f"  - Info: {sum(1 for a in self.alerts if a['severity'] == 'INFO')}")
+        print(f"Export: {export.ndjson_file}, {export.csv_file} ({export.records} records)")
+        print(f"Totaal alerts: {len(alerts)}")
+        print(f"  - Critical: {report.severity_counts['CRITICAL']}")
+        print(f"  - Warning: {report.severity_counts['WARNING']}")
+        print(f"  - Info: {report.severity_counts['INFO']}")
+        print(f"  - Onderdrukte herhalingen: {self.alert_manager.suppressed}")
+        
+        if self.timeseries is not None:
+            self.timeseries.flush()
+        
+        cache_stats = self.command_cache.stats()
+        print(f"Command cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+              f"(hit rate {cache_stats['hit_rate']})")
 
 
 # Main execution
@@ -384,13 +517,32 @@ if __name__ == "__main__":
         # Voeg meer devices toe indien nodig
     ]
     
-    # Maak monitor object
-    monitor = NetworkHealthMonitor(devices)
-    
-    # Vraag of auto-remediation gewenst is
-    auto_fix = input("Auto-remediation inschakelen? (ja/nee): ").lower() == "ja"
-    
-    # Voer health check uit
-    monitor.run_health_check(auto_fix=auto_fix)
+    parser = argparse.ArgumentParser(description="Network Health Monitor")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Blijf continu monitoren met een interval per check")
+    parser.add_argument("--auto-fix", action="store_true",
+                        help="Auto-remediation inschakelen zonder te vragen")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Neem elke sessie op als cassette in DIR (zie part3b_cassette.py)")
+    args = parser.parse_args()
     
-    print("\n✅ Health check voltooid!")
+    if args.daemon:
+        # In daemon mode blijft command output maximaal 25 s in de cache
+        # en blijven de SSH sessies warm in de pool
+        monitor = NetworkHealthMonitor(devices, cache_ttl=25,
+                                       session_pool=SessionPool(max_per_host=1),
+                                       timeseries=TimeSeriesStore(),
+                                       history=HistoryStore(),
+                                       cassette_dir=args.record)
+        HealthDaemon(monitor, auto_fix=args.auto_fix).run_forever()
+    else:
+        # Maak monitor object
+        monitor = NetworkHealthMonitor(devices, history=HistoryStore(), cassette_dir=args.record)
+        
+        # Vraag of auto-remediation gewenst is
+        auto_fix = args.auto_fix or input("Auto-remediation inschakelen? (ja/nee): ").lower() == "ja"
+        
+        # Voer health check uit
+        monitor.run_health_check(auto_fix=auto_fix)
+        
+        print("\n✅ Health check voltooid!")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Offline compliance scan
+
+Beantwoordt compliance vragen voor de hele vloot zonder de routers zelf te
+contacteren, enkel op basis van de opgeslagen backups:
+
+- Losse .cfg bestanden (oudere backups) onder de opgegeven directories
+- Backup stores (directories met objects/ en index/): per device de laatste
+  versie; elke unieke config (hash) wordt maar één keer gescand en het
+  resultaat geldt voor alle devices met die config
+
+Elk bestand wordt via mmap ingelezen en de evaluatie wordt verdeeld over een
+process pool (standaard één worker per core). Elke worker compileert de
+regels één keer bij het opstarten. Er staan hoogstens workers * 4 taken
+tegelijk uit; zodra er één klaar is wordt het resultaat als NDJSON (één
+JSON object per regel) weggeschreven en wordt de volgende taak uit de
+bestandslijst ingediend. Zo blijft het geheugen begrensd, ook bij miljoenen
+backups (de volgorde van de records volgt wel de afwerking, niet de schijf).
+
+Gebruik:
+
+    python part3b_offline_compliance_scan.py
+    python part3b_offline_compliance_scan.py backups health_reports -o audit.ndjson -w 16
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
+import argparse
+import gzip
+import json
+import mmap
+import os
+import time
+
+from part3b_backup_store import BackupStore
+from part3b_compliance import DEFAULT_RULES_FILE, load_engine
+
+DEFAULT_DIRS = ["backups", "health_reports"]
+
+# Engine van het worker proces (gezet door _init_worker)
+_ENGINE = None
+
+
+def _init_worker(rules_file):
+    """Initializer van elk worker proces: compileer de regels één keer."""
+    global _ENGINE
+    _ENGINE = load_engine(rules_file)
+
+
+def _read_config(path):
+    """Lees een config via mmap; .gz blobs worden rechtstreeks uit de mapping gedecomprimeerd."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = gzip.decompress(mm) if path.endswith(".gz") else mm[:]
+    return data.decode("utf-8", errors="replace")
+
+
+def scan_file(task):
+    """Scan één config bestand (draait in een worker proces).
+
+    task: (path, [device namen]) - een store blob kan bij meerdere devices horen.
+    """
+    path, devices = task
+    try:
+        results = _ENGINE.evaluate(_read_config(path))
+    except (OSError, EOFError, ValueError) as e:
+        return {"path": path, "devices": devices, "error": str(e)}
+
+    failed = [rule_id for rule_id, result in results.items() if not result["passed"]]
+    return {
+        "path": path,
+        "devices": devices,
+        "passed": len(results) - len(failed),
+        "failed": failed,
+        "results": {rule_id: {"passed": result["passed"],
+                              "lines": result["lines"],
+                              "failed_sections": result["failed_sections"]}
+                    for rule_id, result in results.items()}
+    }
+
+
+def scan_files(tasks):
+    """Scan een chunk bestanden in één worker call (minder IPC per bestand)."""
+    return [scan_file(task) for task in tasks]
+
+
+def _is_store(directory):
+    return (os.path.isdir(os.path.join(directory, "objects"))
+            and os.path.isdir(os.path.join(directory, "index")))
+
+
+def find_configs(directories):
+    """Genereer (path, [devices]) taken voor alle backups onder de directories."""
+    for top in directories:
+        if not os.path.isdir(top):
+            continue
+        for dirpath, dirnames, filenames in os.walk(top):
+            if _is_store(dirpath):
+                # Enkel de laatste versie per device; gelijke configs één keer scannen
+                store = BackupStore(dirpath)
+                by_hash = {}
+                for device in store.devices():
+                    digest = store.latest(device)
+                    if digest:
+                        by_hash.setdefault(digest, []).append(device)
+                for digest, devices in by_hash.items():
+                    yield store.blob_path(digest), devices
+                dirnames[:] = [d for d in dirnames if d not in ("objects", "index")]
+                continue
+
+            for filename in filenames:
+                if filename.endswith(".cfg"):
+                    yield os.path.join(dirpath, filename), [filename[:-len(".cfg")]]
+
+
+def run_scan(directories, output, rules_file=DEFAULT_RULES_FILE, workers=None, chunksize=32):
+    """Scan alle backups en stream de resultaten naar output (NDJSON). Return een samenvatting.
+
+    Elke taak is een chunk van chunksize bestanden; er staan nooit meer dan
+    workers * 4 chunks tegelijk uit, dus find_configs wordt maar zo ver
+    ingelezen als nodig.
+    """
+    summary = {"files": 0, "devices": 0, "errors": 0, "compliant": 0, "rule_failures": {}}
+    start = time.time()
+    workers = workers or os.cpu_count() or 1
+    tasks = find_configs(directories)
+
+    def submit_next(executor, pending):
+        chunk = list(islice(tasks, chunksize))
+        if chunk:
+            pending.add(executor.submit(scan_files, chunk))
+        return bool(chunk)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(rules_file,)) as executor, open(output, "w") as out:
+        pending = set()
+        while len(pending) < workers * 4 and submit_next(executor, pending):
+            pass
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for record in future.result():
+                    summary["files"] += 1
+                    summary["devices"] += len(record["devices"])
+                    if "error" in record:
+                        summary["errors"] += 1
+                    else:
+                        if not record["failed"]:
+                            summary["compliant"] += len(record["devices"])
+                        for rule_id in record["failed"]:
+                            summary["rule_failures"][rule_id] = (
+                                summary["rule_failures"].get(rule_id, 0) + len(record["devices"]))
+                    out.write(json.dumps(record) + "\n")
+                # Vul het venster aan met de volgende chunk
+                submit_next(executor, pending)
+
+    summary["duration"] = time.time() - start
+    return summary
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline compliance scan over de config backups")
+    parser.add_argument("directories", nargs="*", default=DEFAULT_DIRS,
+                        help="Directories met backups (standaard: backups health_reports)")
+    parser.add_argument("-r", "--rules", default=DEFAULT_RULES_FILE, help="Compliance rule file")
+    parser.add_argument("-o", "--output",
+                        default=f"compliance_scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson",
+                        help="NDJSON uitvoerbestand")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Aantal worker processen (standaard: aantal cores)")
+    parser.add_argument("--chunksize", type=int, default=32,
+                        help="Aantal bestanden per taak voor een worker")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Part 3b: Offline Compliance Scan")
+    print("=" * 60)
+    print(f"Directories: {', '.join(args.directories)}")
+    print(f"Rule file: {args.rules}")
+
+    summary = run_scan(args.directories, args.output, args.rules, args.workers, args.chunksize)
+
+    print(f"\nGescand: {summary['files']} config(s) voor {summary['devices']} device(s) "
+          f"in {summary['duration']:.1f}s")
+    print(f"Volledig compliant: {summary['compliant']}")
+    if summary["errors"]:
+        print(f"Onleesbare bestanden: {summary['errors']}")
+    if summary["rule_failures"]:
+        print("\nGefaalde regels (aantal devices):")
+        for rule_id, count in sorted(summary["rule_failures"].items(), key=lambda item: -item[1]):
+            print(f"  {rule_id}: {count}")
+    print(f"\nResultaten: {args.output}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - TCP reachability pre-probe
+
+Voor de SSH stage wordt de hele inventory in één keer afgetast met
+non-blocking TCP connects (selectors) naar poort 22 (of de poort van het
+device), 830 (NETCONF) en 443 (RESTCONF), met een korte deadline:
+
+- Een device is bereikbaar zodra minstens één poort een verbinding accepteert
+- Devices die binnen de deadline op geen enkele poort antwoorden worden
+  meteen als 'unreachable' gemarkeerd, zonder op de netmiko timeout te wachten
+
+Alle connects lopen tegelijk (begrensd door max_sockets en de file
+descriptor limiet van het proces), dus de totale duur is ongeveer één
+deadline, ongeacht het aantal devices. De hostnamen worden vooraf parallel
+opgelost, zodat een trage DNS server de connect lus niet blokkeert.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import errno
+import selectors
+import socket
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows: geen RLIMIT_NOFILE, enkel max_sockets begrenst
+    resource = None
+
+DEFAULT_PORTS = (22, 830, 443)
+
+# File descriptors die vrij blijven voor de rest van het proces (logs, SSH sessies, ...)
+FD_MARGIN = 64
+RESOLVE_WORKERS = 32
+
+
+def socket_limit(max_sockets):
+    """Begrens max_sockets tot de soft RLIMIT_NOFILE min FD_MARGIN (minstens 1)."""
+    if resource is None:
+        return max_sockets
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return max_sockets
+    return max(1, min(max_sockets, soft - FD_MARGIN))
+
+
+def _resolve(host):
+    """Return (family, socktype, proto, sockaddr) van een host, of None als hij niet bestaat."""
+    try:
+        family, socktype, proto, _, address = socket.getaddrinfo(
+            host, None, type=socket.SOCK_STREAM)[0]
+    except (socket.gaierror, UnicodeError):
+        return None
+    return family, socktype, proto, address
+
+
+def resolve_hosts(hosts, workers=RESOLVE_WORKERS):
+    """Los een lijst hostnamen parallel op. Return {host: _resolve resultaat}."""
+    hosts = list(dict.fromkeys(hosts))
+    if not hosts:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(workers, len(hosts))) as executor:
+        return dict(zip(hosts, executor.map(_resolve, hosts)))
+
+
+def _start_connect(resolved, port):
+    """Start een non-blocking connect naar een opgeloste host.
+
+    Return (socket, status) met status 'pending', 'open', 'closed' of
+    'no_fds' (geen file descriptors meer vrij in het proces).
+    """
+    if resolved is None:
+        return None, "closed"
+    family, socktype, proto, address = resolved
+    # Zelfde sockaddr met de poort van het target (IPv6 heeft 4 velden)
+    address = (address[0], port) + tuple(address[2:])
+
+    try:
+        sock = socket.socket(family, socktype, proto)
+    except OSError as e:
+        return None, "no_fds" if e.errno in (errno.EMFILE, errno.ENFILE) else "closed"
+    try:
+        sock.setblocking(False)
+        result = sock.connect_ex(address)
+    except OSError as e:
+        sock.close()
+        return None, "no_fds" if e.errno in (errno.EMFILE, errno.ENFILE) else "closed"
+    if result == 0:
+        sock.close()
+        return None, "open"
+    if result in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, getattr(errno, "WSAEWOULDBLOCK", -1)):
+        return sock, "pending"
+    sock.close()
+    return None, "closed"
+
+
+def probe_ports(targets, timeout=1.5, max_sockets=1000):
+    """Test TCP connects naar een lijst (host, poort) tegelijk.
+
+    Return {(host, poort): True/False}. Elke connect krijgt maximaal timeout
+    seconden; er staan nooit meer dan max_sockets sockets tegelijk open, en
+    nooit meer dan de file descriptor limiet toelaat. Loopt het proces toch
+    tegen die limiet aan, dan wacht het target op vrije sockets; zijn er
+    geen lopende connects meer, dan telt het als niet bereikbaar.
+    """
+    targets = list(targets)
+    max_sockets = socket_limit(max_sockets)
+    addresses = resolve_hosts(host for host, _ in targets)
+    results = {}
+    queue = targets[::-1]
+    selector = selectors.DefaultSelector()
+    # socket -> ((host, poort), deadline)
+    in_flight = {}
+
+    try:
+        while queue or in_flight:
+            # Vul aan tot max_sockets gelijktijdige connects
+            while queue and len(in_flight) < max_sockets:
+                target = queue.pop()
+                sock, status = _start_connect(addresses[target[0]], target[1])
+                if status == "pending":
+                    in_flight[sock] = (target, time.monotonic() + timeout)
+                    selector.register(sock, selectors.EVENT_WRITE)
+                elif status == "no_fds" and in_flight:
+                    # Opnieuw proberen zodra lopende connects hun socket vrijgeven
+                    queue.append(target)
+                    break
+                else:
+                    results[target] = status == "open"
+
+            if not in_flight:
+                continue
+
+            next_deadline = min(deadline for _, deadline in in_flight.values())
+            for key, _ in selector.select(max(0.0, next_deadline - time.monotonic())):
+                sock = key.fileobj
+                target, _ = in_flight.pop(sock)
+                # Schrijfbaar betekent: connect afgerond, SO_ERROR zegt of hij gelukt is
+                results[target] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+                selector.unregister(sock)
+                sock.close()
+
+            now = time.monotonic()
+            for sock, (target, deadline) in list(in_flight.items()):
+                if deadline <= now:
+                    results[target] = False
+                    del in_flight[sock]
+                    selector.unregister(sock)
+                    sock.close()
+    finally:
+        for sock in in_flight:
+            sock.close()
+        selector.close()
+
+    return results
+
+
+def device_key(device):
+    """Key van een device in de resultaten van probe_devices: (host, SSH poort)."""
+    return device["host"], device.get("port", 22)
+
+
+def probe_devices(devices, ports=DEFAULT_PORTS, timeout=1.5, max_sockets=1000):
+    """Return {(host, SSH poort): [open poorten]} voor een lijst netmiko device dicts.
+
+    De SSH poort van het device (device["port"], standaard 22) wordt altijd getest.
+    Devices op dezelfde host met een andere SSH poort (zoals de simulator) krijgen
+    elk hun eigen resultaat; gedeelde (host, poort) targets worden één keer getest.
+    """
+    device_ports = {}
+    for device in devices:
+        host, ssh_port = device_key(device)
+        device_ports[(host, ssh_port)] = list(dict.fromkeys([ssh_port] + [port for port in ports if port != 22]))
+
+    targets = dict.fromkeys((host, port) for (host, _), candidates in device_ports.items()
+                            for port in candidates)
+    results = probe_ports(targets, timeout, max_sockets)
+
+    return {(host, ssh_port): [port for port in candidates if results.get((host, port))]
+            for (host, ssh_port), candidates in device_ports.items()}
+
+
+# Main execution: test de bereikbaarheid van hosts vanaf de command line
+if __name__ == "__main__":
+    hosts = sys.argv[1:] or ["10.176.161.43"]
+
+    print("=" * 60)
+    print("Part 3b: TCP Reachability Probe")
+    print("=" * 60)
+    start = time.monotonic()
+    open_ports = probe_devices([{"host": host} for host in hosts])
+    for (host, _), ports in open_ports.items():
+        status = f"bereikbaar (poort {', '.join(str(p) for p in ports)})" if ports else "NIET bereikbaar"
+        print(f"  {host}: {status}")
+    print(f"\nDuur: {time.monotonic() - start:.2f}s voor {len(hosts)} host(s)")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Gebatchte, parallelle auto-remediation
+
+In plaats van per down interface meteen een aparte send_config_set te
+sturen, verzamelt de RemediationExecutor alle geplande acties van een run:
+
+- Acties worden per device gegroepeerd (dubbele acties vallen weg) en
+  samengevoegd tot één config-set per device
+- De config-sets worden parallel uitgevoerd, met een globale limiet op het
+  aantal gelijktijdige devices (max_workers) en op het aantal wijzigingen
+  per minuut (token bucket)
+- Per actie worden de wachttijd, de latency en de uitkomst bijgehouden
+- Tokens van de change-rate limiet worden pas genomen als er een verbinding
+  is; een onbereikbaar device verbruikt geen wijzigingen
+
+De monitor voert de acties van een device meteen na zijn checks uit over de
+sessie die nog open staat (run_device); run() verbindt zelf opnieuw en is
+er voor acties die buiten een check om gepland werden.
+
+    executor.add(RemediationAction("R1", "interface_reset", "Gi2",
+                                   ["interface Gi2", "shutdown", "no shutdown"]))
+    records = executor.run_device("R1", conn)
+    records = executor.run(connect, release)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+
+class RemediationAction:
+    """Eén geplande wijziging op een device."""
+
+    def __init__(self, device_name, action, target, commands):
+        self.device_name = device_name
+        self.action = action
+        self.target = target
+        self.commands = commands
+
+    @property
+    def key(self):
+        return (self.device_name, self.action, self.target)
+
+    def __repr__(self):
+        return f"RemediationAction({self.device_name}, {self.action}, {self.target})"
+
+
+def plan_interface_resets(device_name, issues):
+    """Plan een shutdown/no shutdown voor elke down interface (behalve loopbacks)."""
+    actions = []
+    for issue in issues:
+        if "down" in issue and "Loopback" not in issue:
+            interface = issue.split()[0]
+            actions.append(RemediationAction(device_name, "interface_reset", interface, [
+                f"interface {interface}",
+                "shutdown",
+                "no shutdown"
+            ]))
+    return actions
+
+
+def make_records(actions, outcome, error, waited, latency):
+    """Eén record per actie van een uitgevoerde config-set."""
+    return [{
+        "device": action.device_name,
+        "action": action.action,
+        "target": action.target,
+        "outcome": outcome,
+        "error": error,
+        "waited": round(waited, 3),
+        "latency": round(latency, 3),
+        "batch_size": len(actions)
+    } for action in actions]
+
+
+class RateLimiter:
+    """Token bucket: maximaal rate wijzigingen per period seconden."""
+
+    def __init__(self, rate, period=60.0):
+        self.capacity = float(rate)
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self.updated = time.monotonic()
+        self._condition = threading.Condition()
+
+    def acquire(self, amount=1):
+        """Wacht tot er amount tokens zijn. Return de wachttijd in seconden."""
+        amount = min(amount, self.capacity)
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return now - start
+                self._condition.wait((amount - self.tokens) / self.fill_rate)
+
+
+class RemediationExecutor:
+    """Verzamelt remediation acties per device en voert ze gebatcht en parallel uit."""
+
+    def __init__(self, max_workers=10, max_changes_per_minute=60):
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(max_changes_per_minute)
+        # device -> {action key: RemediationAction}, in volgorde van toevoegen
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def add(self, action):
+        """Plan een actie in (een identieke actie voor hetzelfde device telt maar één keer)."""
+        with self._lock:
+            self._pending.setdefault(action.device_name, {})[action.key] = action
+
+    def add_many(self, actions):
+        for action in actions:
+            self.add(action)
+
+    def pending(self):
+        """Aantal geplande acties over alle devices."""
+        with self._lock:
+            return sum(len(actions) for actions in self._pending.values())
+
+    def take(self, device_name):
+        """Haal de geplande acties van één device weg. Return (acties, samengevoegde commands)."""
+        with self._lock:
+            actions = list(self._pending.pop(device_name, {}).values())
+        commands = [command for action in actions for command in action.commands]
+        return actions, commands
+
+    def _execute(self, actions, commands, conn):
+        """Voer een samengevoegde config-set uit over een open verbinding."""
+        # Elke actie telt als één wijziging voor de globale change-rate limiet
+        waited = self.rate_limiter.acquire(len(actions))
+
+        start = time.monotonic()
+        try:
+            conn.send_config_set(commands)
+            outcome, error = "ok", None
+        except Exception as e:
+            outcome, error = "failed", str(e)
+        return make_records(actions, outcome, error, waited, time.monotonic() - start)
+
+    def run_device(self, device_name, conn):
+        """Voer de geplande acties van één device uit over een open verbinding.
+
+        Return een record per actie (leeg als er niets gepland was).
+        """
+        actions, commands = self.take(device_name)
+        if not actions:
+            return []
+        return self._execute(actions, commands, conn)
+
+    def _run_device(self, device_name, connect, release):
+        actions, commands = self.take(device_name)
+        if not actions:
+            return []
+
+        start = time.monotonic()
+        try:
+            conn = connect(device_name)
+            error = "geen verbinding"
+        except Exception as e:
+            conn, error = None, str(e)
+        if conn is None:
+            return make_records(actions, "skipped", error, 0.0, time.monotonic() - start)
+
+        records = self._execute(actions, commands, conn)
+        release(conn, discard=records[0]["outcome"] == "failed")
+        return records
+
+    def run(self, connect, release):
+        """Voer alle geplande acties uit: één config-set per device, parallel.
+
+        connect(device_name) -> verbinding of None; release(conn, discard) geeft ze terug.
+        Return een record per actie met outcome, wachttijd en latency.
+        """
+        with self._lock:
+            device_names = list(self._pending)
+
+        records = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for device_records in executor.map(
+                    lambda name: self._run_device(name, connect, release), device_names):
+                records.extend(device_records)
+        return records
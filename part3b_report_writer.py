@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Streaming HTML rapport
+
+Schrijft het health rapport fragment per fragment rechtstreeks naar de
+bestanden in plaats van één grote string op te bouwen met html +=:
+
+- health_report_<timestamp>.html: compacte index pagina met tellers
+  (devices per status, alerts per severity, security checks) en links naar
+  de detail pagina's
+- health_report_<timestamp>/devices_001.html, ...: device details,
+  page_size devices per pagina
+- health_report_<timestamp>/alerts_001.html, ...: alerts, page_size per pagina
+
+Enkel de tellers en de lijst van pagina's blijven in het geheugen; het
+geheugengebruik hangt dus niet af van het aantal devices of alerts.
+
+    with ReportWriter("health_reports") as report:
+        for device_name, data in results.items():
+            report.write_device(device_name, data)
+        for alert in alerts:
+            report.write_alert(alert)
+    print(report.index_file)
+"""
+
+from datetime import datetime
+from html import escape
+import os
+
+STYLE = """
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        h1 { color: #333; border-bottom: 3px solid #007bff; padding-bottom: 10px; }
+        .device-card { background: white; border-radius: 8px; padding: 20px; margin: 15px 0; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+        .device-header { font-size: 1.3em; font-weight: bold; color: #007bff; }
+        .status-ok { color: green; }
+        .status-warning { color: orange; }
+        .status-critical { color: red; }
+        .check-item { margin: 5px 0; padding: 5px; background: #f8f9fa; border-radius: 4px; }
+        .alert-box { padding: 10px; margin: 5px 0; border-radius: 4px; }
+        .alert-CRITICAL { background: #ffebee; border-left: 4px solid red; }
+        .alert-WARNING { background: #fff8e1; border-left: 4px solid orange; }
+        .alert-INFO { background: #e3f2fd; border-left: 4px solid blue; }
+        .nav { margin: 10px 0; }
+        .nav a { margin-right: 15px; }
+        table { width: 100%; border-collapse: collapse; }
+        th, td { padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }
+        th { background: #007bff; color: white; }
+"""
+
+
+def _page_header(title):
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>{escape(title)}</title>
+    <style>{STYLE}    </style>
+</head>
+<body>
+    <div class="container">
+"""
+
+
+PAGE_FOOTER = """
+    </div>
+</body>
+</html>
+"""
+
+
+class _Pager:
+    """Schrijft items naar genummerde pagina's van maximaal page_size items."""
+
+    def __init__(self, directory, index_name, prefix, title, page_size):
+        self.directory = directory
+        self.index_name = index_name
+        self.prefix = prefix
+        self.title = title
+        self.page_size = page_size
+        # Per pagina: (bestandsnaam, eerste label, laatste label)
+        self.pages = []
+        self.count = 0
+        self._file = None
+        self._on_page = 0
+        self._nav_offset = None
+
+    def _filename(self, number):
+        return f"{self.prefix}_{number:03d}.html"
+
+    def _open_page(self):
+        number = len(self.pages) + 1
+        filename = self._filename(number)
+        self._file = open(os.path.join(self.directory, filename), "w", encoding="utf-8")
+        self._file.write(_page_header(f"{self.title} - pagina {number}"))
+        self._file.write(f"        <h1>{escape(self.title)} - pagina {number}</h1>\n")
+        # Of er een volgende pagina komt is pas bij het sluiten geweten: reserveer
+        # plaats voor de volledige nav en vul ze dan in (zie _close_page)
+        self._nav_offset = self._file.tell()
+        self._file.write(self._nav(number).ljust(len(self._nav(number, has_next=True))))
+        self.pages.append([filename, None, None])
+        self._on_page = 0
+
+    def _nav(self, number, has_next=False):
+        links = [f'<a href="../{self.index_name}">Index</a>']
+        if number > 1:
+            links.append(f'<a href="{self._filename(number - 1)}">&laquo; Vorige</a>')
+        if has_next:
+            links.append(f'<a href="{self._filename(number + 1)}">Volgende &raquo;</a>')
+        return f'        <div class="nav">{"".join(links)}</div>\n'
+
+    def _close_page(self, has_next=False):
+        # Pas bij het sluiten is geweten of er nog een volgende pagina komt;
+        # dezelfde nav komt bovenaan (over de gereserveerde plaats) en onderaan
+        if self._file is not None:
+            nav = self._nav(len(self.pages), has_next)
+            if has_next:
+                self._file.seek(self._nav_offset)
+                self._file.write(nav)
+                self._file.seek(0, os.SEEK_END)
+            self._file.write(nav)
+            self._file.write(PAGE_FOOTER)
+            self._file.close()
+            self._file = None
+
+    def write(self, label, fragment):
+        """Schrijf één item (HTML fragment) naar de huidige pagina."""
+        if self._file is None or self._on_page >= self.page_size:
+            self._close_page(has_next=True)
+            self._open_page()
+        self._file.write(fragment)
+        page = self.pages[-1]
+        page[1] = page[1] if page[1] is not None else label
+        page[2] = label
+        self._on_page += 1
+        self.count += 1
+
+    def close(self):
+        self._close_page()
+
+
+class ReportWriter:
+    """Streaming, gepagineerd HTML rapport met een index pagina."""
+
+    def __init__(self, report_dir="health_reports", timestamp=None, page_size=200):
+        self.timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.generated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.index_file = os.path.join(report_dir, f"health_report_{self.timestamp}.html")
+        self.pages_dir = os.path.join(report_dir, f"health_report_{self.timestamp}")
+        os.makedirs(self.pages_dir, exist_ok=True)
+
+        index_name = os.path.basename(self.index_file)
+        self.devices = _Pager(self.pages_dir, index_name, "devices", "Device Details", page_size)
+        self.alerts = _Pager(self.pages_dir, index_name, "alerts", "Alerts", page_size)
+
+        # Tellers voor de index pagina
+        self.status_counts = {}
+        self.severity_counts = {"CRITICAL": 0, "WARNING": 0, "INFO": 0}
+        self.security_passed = 0
+        self.security_total = 0
+
+    def write_device(self, device_name, data):
+        """Schrijf de details van één device."""
+        status = data.get("status", "unknown")
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        status_class = "status-ok" if status == "checked" else "status-critical"
+
+        parts = [f"""
+        <div class="device-card">
+            <div class="device-header">{escape(device_name)}</div>
+            <p class="{status_class}">Status: {escape(status.upper())}</p>
+"""]
+
+        if data.get("error"):
+            parts.append(f"""            <div class="check-item"><strong>Fout:</strong> {escape(str(data['error']))}</div>
+""")
+
+        if data.get("resources"):
+            parts.append(f"""            <div class="check-item">
+                <strong>Resources:</strong> CPU: {escape(str(data['resources'].get('cpu', 'N/A')))} |
+                Memory: {escape(str(data['resources'].get('memory', 'N/A')))}
+            </div>
+""")
+
+        if data.get("security"):
+            passed = sum(1 for v in data["security"].values() if v)
+            total = len(data["security"])
+            self.security_passed += passed
+            self.security_total += total
+            failed = [check for check, v in data["security"].items() if not v]
+            parts.append(f"""            <div class="check-item">
+                <strong>Security Checks:</strong> {passed}/{total} passed{f" (gefaald: {escape(', '.join(failed))})" if failed else ""}
+            </div>
+""")
+
+        if data.get("backup_file"):
+            parts.append(f"""            <div class="check-item">
+                <strong>Backup:</strong> {escape(str(data['backup_file']))}
+            </div>
+""")
+
+        parts.append("        </div>\n")
+        self.devices.write(device_name, "".join(parts))
+
+    def write_alert(self, alert):
+        """Schrijf één alert."""
+        severity = alert["severity"]
+        self.severity_counts[severity] = self.severity_counts.get(severity, 0) + 1
+        repeat = f", {alert['count']}x sinds {alert['first_seen']}" if alert.get("count", 1) > 1 else ""
+        self.alerts.write(alert["device"], f"""
+        <div class="alert-box alert-{escape(severity)}">
+            <strong>[{escape(severity)}]</strong> {escape(str(alert['device']))}: {escape(alert['message'])}
+            <small>({escape(alert['timestamp'])}{escape(repeat)})</small>
+        </div>
+""")
+
+    def _page_table(self, pager):
+        if not pager.pages:
+            return "        <p>Geen items.</p>\n"
+        rows = "".join(
+            f'            <tr><td><a href="{os.path.basename(self.pages_dir)}/{filename}">'
+            f'Pagina {number}</a></td><td>{escape(str(first))}</td><td>{escape(str(last))}</td></tr>\n'
+            for number, (filename, first, last) in enumerate(pager.pages, 1)
+        )
+        return ("        <table>\n            <tr><th>Pagina</th><th>Van</th><th>Tot</th></tr>\n"
+                + rows + "        </table>\n")
+
+    def close(self):
+        """Sluit de detail pagina's en schrijf de index pagina."""
+        self.devices.close()
+        self.alerts.close()
+
+        with open(self.index_file, "w", encoding="utf-8") as f:
+            f.write(_page_header("Network Health Report"))
+            f.write(f"""        <h1>🔍 Network Health Report</h1>
+        <p><strong>Generated:</strong> {self.generated}</p>
+
+        <h2>📊 Samenvatting</h2>
+        <table>
+            <tr><th>Teller</th><th>Waarde</th></tr>
+            <tr><td>Devices</td><td>{self.devices.count}</td></tr>
+""")
+            for status, count in sorted(self.status_counts.items()):
+                f.write(f"            <tr><td>Status {escape(status)}</td><td>{count}</td></tr>\n")
+            for severity, count in self.severity_counts.items():
+                f.write(f'            <tr><td class="alert-{escape(severity)}">Alerts {escape(severity)}</td>'
+                        f"<td>{count}</td></tr>\n")
+            f.write(f"            <tr><td>Security checks passed</td>"
+                    f"<td>{self.security_passed}/{self.security_total}</td></tr>\n")
+            f.write("        </table>\n")
+
+            f.write("\n        <h2>📋 Alerts</h2>\n")
+            f.write(self._page_table(self.alerts))
+            f.write("\n        <h2>📡 Device Details</h2>\n")
+            f.write(self._page_table(self.devices))
+            f.write(PAGE_FOOTER)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
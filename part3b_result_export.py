@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Export van resultaten (NDJSON/CSV)
+
+Schrijft de resultaten en alerts van een run in een machine-leesbaar formaat,
+in dezelfde pass als het HTML rapport:
+
+- health_results_<timestamp>.ndjson: één JSON object per regel
+- health_results_<timestamp>.csv: dezelfde records als platte CSV
+
+Elk record heeft exact de velden uit FIELDS (ontbrekende waarden zijn
+null/leeg), zodat dashboards en scripts een vast schema kunnen verwachten:
+
+- record_type "device": één record per device met de status
+- record_type "check": één record per (device, check, key); geneste
+  resultaten worden plat gemaakt ("routes.ospf"), lijsten als JSON tekst
+- record_type "alert": één record per alert
+
+Records worden meteen naar de bestanden geschreven, dus ook een run met
+10k devices kan regel per regel ingelezen worden.
+"""
+
+from datetime import datetime
+import csv
+import json
+import os
+
+SCHEMA_VERSION = 1
+
+FIELDS = [
+    "schema_version", "run_id", "record_type", "device", "status",
+    "check", "key", "value",
+    "severity", "alert_type", "subject", "message", "count", "first_seen", "last_seen"
+]
+
+
+def flatten_result(value, prefix=""):
+    """Maak een (genest) check resultaat plat tot (key, waarde) paren."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten_result(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, (list, tuple)):
+        yield prefix, json.dumps(value)
+    else:
+        yield prefix, value
+
+
+class ResultExporter:
+    """Streaming export van device resultaten en alerts naar NDJSON en CSV."""
+
+    def __init__(self, report_dir="health_reports", timestamp=None):
+        self.run_id = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.ndjson_file = os.path.join(report_dir, f"health_results_{self.run_id}.ndjson")
+        self.csv_file = os.path.join(report_dir, f"health_results_{self.run_id}.csv")
+        self.records = 0
+
+        self._ndjson = open(self.ndjson_file, "w", encoding="utf-8")
+        self._csv_handle = open(self.csv_file, "w", newline="", encoding="utf-8")
+        self._csv = csv.DictWriter(self._csv_handle, fieldnames=FIELDS)
+        self._csv.writeheader()
+
+    def _write(self, record_type, **fields):
+        record = dict.fromkeys(FIELDS)
+        record.update(fields, schema_version=SCHEMA_VERSION, run_id=self.run_id,
+                      record_type=record_type)
+        self._ndjson.write(json.dumps(record) + "\n")
+        self._csv.writerow(record)
+        self.records += 1
+
+    def write_device(self, device_name, data):
+        """Schrijf het device record en een record per check waarde."""
+        status = data.get("status", "unknown")
+        self._write("device", device=device_name, status=status, message=data.get("error"))
+
+        for check, result in data.items():
+            if check in ("status", "hostname", "error"):
+                continue
+            for key, value in flatten_result(result):
+                self._write("check", device=device_name, status=status,
+                            check=check, key=key or None, value=value)
+
+    def write_alert(self, alert):
+        """Schrijf één alert record."""
+        self._write("alert", device=alert["device"], severity=alert["severity"],
+                    alert_type=alert.get("type"), subject=alert.get("subject"),
+                    message=alert["message"], count=alert.get("count", 1),
+                    first_seen=alert.get("first_seen"), last_seen=alert.get("last_seen"))
+
+    def close(self):
+        self._ndjson.close()
+        self._csv_handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
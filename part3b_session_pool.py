@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - SSH session pool
+
+Herbruikbare netmiko sessies per host. Een SSH handshake + session
+preparation + find_prompt kost op IOS-XE al snel 2-5 seconden; met de pool
+betalen we dat maar één keer per sessie in plaats van bij elke taak.
+
+- Maximaal max_per_host sessies per (host, port, username)
+- Liveness check (is_alive) voor hergebruik, anders transparant reconnect
+- Keepalives op idle sessies zodat firewalls/NAT ze niet afsluiten
+- Idle sessies die langer dan idle_timeout ongebruikt zijn worden gesloten
+
+Gebruik:
+
+    pool = SessionPool(max_per_host=2)
+    with pool.session(device) as conn:
+        print(conn.send_command("show clock"))
+    pool.close_all()
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+
+from netmiko import ConnectHandler
+
+
+class SessionPool:
+    """Thread-safe pool van netmiko sessies, gegroepeerd per host."""
+
+    def __init__(self, max_per_host=2, idle_timeout=300, keepalive_interval=60,
+                 connect=ConnectHandler):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.connect = connect
+
+        self.idle = {}          # key -> lijst van [conn, last_used, last_keepalive]
+        self.in_use = {}        # key -> aantal uitgeleende sessies
+        self.owners = {}        # id(conn) -> key
+        self.stats = {"created": 0, "reused": 0, "evicted": 0, "dead": 0}
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self._reaper = threading.Thread(target=self._maintain, daemon=True)
+        self._reaper.start()
+
+    @staticmethod
+    def key(device):
+        """Sessies worden gedeeld per (host, port, username)."""
+        return (device["host"], device.get("port", 22), device.get("username"))
+
+    def acquire(self, device, timeout=None):
+        """Leen een werkende sessie uit voor dit device (blokkeert als de host vol zit).
+
+        De liveness check (een round trip) en het sluiten van dode sessies
+        gebeuren buiten de lock: een trage sessie houdt andere hosts niet op.
+        """
+        key = self.key(device)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._cond:
+                while True:
+                    idle = self.idle.get(key)
+                    # Plaats reserveren: een sessie in de liveness check telt als in gebruik
+                    if idle:
+                        conn = idle.pop()[0]
+                        self.in_use[key] = self.in_use.get(key, 0) + 1
+                        break
+                    if self.in_use.get(key, 0) < self.max_per_host:
+                        conn = None
+                        self.in_use[key] = self.in_use.get(key, 0) + 1
+                        break
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"Geen vrije sessie voor {key[0]} binnen {timeout}s")
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                break
+            if self._is_alive(conn):
+                with self._cond:
+                    self.stats["reused"] += 1
+                return conn
+
+            # Dode sessie: weggooien, plaats vrijgeven en verder zoeken
+            with self._cond:
+                self.stats["dead"] += 1
+                self.owners.pop(id(conn), None)
+                self.in_use[key] -= 1
+                self._cond.notify()
+            self._disconnect(conn)
+
+        # Verbinden gebeurt buiten de lock
+        try:
+            params = dict(device)
+            params.setdefault("keepalive", self.keepalive_interval)
+            conn = self.connect(**params)
+        except Exception:
+            with self._cond:
+                self.in_use[key] -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self.owners[id(conn)] = key
+            self.stats["created"] += 1
+        return conn
+
+    def release(self, conn, discard=False):
+        """Geef een sessie terug aan de pool (discard=True sluit ze, bv. na een fout)."""
+        with self._cond:
+            key = self.owners.get(id(conn))
+            if key is None:
+                return
+            self.in_use[key] -= 1
+            discard = discard or self._closed
+            if discard:
+                self.owners.pop(id(conn), None)
+            else:
+                now = time.monotonic()
+                self.idle.setdefault(key, []).append([conn, now, now])
+            self._cond.notify()
+        if discard:
+            self._disconnect(conn)
+
+    @contextmanager
+    def session(self, device):
+        """Context manager: sessie uitlenen en automatisch teruggeven."""
+        conn = self.acquire(device)
+        try:
+            yield conn
+        except Exception:
+            self.release(conn, discard=True)
+            raise
+        else:
+            self.release(conn)
+
+    def close_all(self):
+        """Sluit alle idle sessies en stop de onderhoudsthread."""
+        with self._cond:
+            self._closed = True
+            closing = [conn for sessions in self.idle.values() for conn, _, _ in sessions]
+            for conn in closing:
+                self.owners.pop(id(conn), None)
+            self.idle.clear()
+            self._cond.notify_all()
+        for conn in closing:
+            self._disconnect(conn)
+
+    def _is_alive(self, conn):
+        try:
+            return conn.is_alive()
+        except Exception:
+            return False
+
+    def _disconnect(self, conn):
+        """Sessie sluiten (blokkerende I/O): nooit aanroepen met de lock vast."""
+        try:
+            conn.disconnect()
+        except Exception:
+            pass
+
+    def _maintain(self):
+        """Achtergrondthread: idle eviction en keepalives.
+
+        Onder de lock worden enkel de sessies uit de idle lijst gehaald; de
+        keepalive round trips en disconnects gebeuren erbuiten.
+        """
+        while True:
+            time.sleep(min(self.keepalive_interval, self.idle_timeout, 5))
+            evicted = []
+            probing = []
+            with self._cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                for key, sessions in self.idle.items():
+                    for entry in list(sessions):
+                        conn, last_used, last_keepalive = entry
+                        if now - last_used > self.idle_timeout:
+                            sessions.remove(entry)
+                            self.owners.pop(id(conn), None)
+                            self.stats["evicted"] += 1
+                            evicted.append(conn)
+                        elif now - last_keepalive > self.keepalive_interval:
+                            # Tijdens de keepalive telt de sessie als in gebruik
+                            sessions.remove(entry)
+                            self.in_use[key] = self.in_use.get(key, 0) + 1
+                            probing.append((key, entry))
+
+            for conn in evicted:
+                self._disconnect(conn)
+
+            for key, entry in probing:
+                conn = entry[0]
+                # is_alive() stuurt een null byte en fungeert als keepalive
+                alive = self._is_alive(conn)
+                with self._cond:
+                    self.in_use[key] -= 1
+                    keep = alive and not self._closed
+                    if keep:
+                        entry[2] = time.monotonic()
+                        self.idle.setdefault(key, []).append(entry)
+                    else:
+                        self.owners.pop(id(conn), None)
+                        if not alive:
+                            self.stats["dead"] += 1
+                    self._cond.notify()
+                if not keep:
+                    self._disconnect(conn)
@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+"""
+Part 3b: Network Health Monitor - Time-series store
+
+Compacte opslag van meetwaarden (CPU, memory, interface counters) per device
+en metric, zodat trends over maanden zichtbaar worden zonder opnieuw te pollen.
+
+- Elke (device, metric) reeks heeft een rij in drie ring buffers:
+  ruwe samples (standaard 1 dag aan 30 s samples), 5 minuten buckets
+  (14 dagen) en 1 uur buckets (90 dagen)
+- Een bucket bewaart gemiddelde en maximum van zijn samples; de lopende
+  bucket wordt bij elk sample bijgewerkt, dus queries zien hem meteen
+- Alle ring buffers zitten in NumPy memory-mapped bestanden
+  (ruw: float32 waarde + uint32 timestamp = 8 bytes, bucket: 12 bytes)
+- Zijn alle rijen in gebruik, dan groeit het bestand (aantal rijen x2),
+  maar nooit voorbij max_bytes; daarna worden nieuwe reeksen overgeslagen
+- De index (welke reeks in welke rij, schrijfposities) staat in index.json
+- Queries (min/max/mean/percentielen) zijn gevectoriseerd met NumPy en
+  kiezen de fijnste resolutie die het gevraagde venster nog bevat
+
+Geheugen/disk per reeks: 2880 * 8 + 4032 * 12 + 2160 * 12 bytes, ongeveer
+95 KB. De checks schrijven 3 reeksen per device (cpu, memory, interfaces_down):
+1000 devices is 3000 reeksen, ongeveer 290 MB voor 90 dagen historiek.
+"""
+
+from datetime import datetime
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# Rollup resoluties: (bucket grootte in seconden, aantal buckets)
+DEFAULT_ROLLUPS = ((300, 4032), (3600, 2160))
+
+
+class _Tier:
+    """Eén resolutie: ruwe samples (bucket None) of een rollup met vaste bucket grootte."""
+
+    def __init__(self, bucket, capacity):
+        self.bucket = bucket
+        self.capacity = capacity
+        suffix = "" if bucket is None else f"_{bucket}s"
+        self.values = f"values{suffix}.f32"
+        self.times = f"times{suffix}.u32"
+        # Ruwe samples zijn hun eigen maximum
+        self.maxima = self.values if bucket is None else f"max{suffix}.f32"
+
+    @property
+    def files(self):
+        files = [(self.values, np.float32), (self.times, np.uint32)]
+        if self.bucket is not None:
+            files.append((self.maxima, np.float32))
+        return files
+
+    @property
+    def row_bytes(self):
+        return self.capacity * 4 * len(self.files)
+
+    def state(self, entry):
+        """Schrijfpositie en lopende bucket van een reeks in deze resolutie."""
+        if self.bucket is None:
+            return entry
+        return entry["rollups"].setdefault(str(self.bucket), {
+            "head": 0, "count": 0, "start": None, "n": 0, "sum": 0.0, "max": 0.0
+        })
+
+
+class TimeSeriesStore:
+    """Ring buffers per (device, metric) in memory-mapped NumPy arrays, met rollups."""
+
+    def __init__(self, path="health_reports/timeseries", capacity=2880, max_series=3072,
+                 flush_interval=300, rollups=DEFAULT_ROLLUPS, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.capacity = capacity
+        self.max_series = max_series
+        self.rollups = [tuple(rollup) for rollup in rollups]
+        self.flush_interval = flush_interval
+        # Bovengrens voor alle bestanden samen; groeien stopt daar
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._full_warned = False
+
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        index_file = os.path.join(path, "index.json")
+        existing = os.path.exists(index_file)
+        if existing:
+            with open(index_file) as f:
+                index = json.load(f)
+            # Bestaand bestand bepaalt de afmetingen; stores zonder rollups krijgen ze erbij
+            self.capacity = index["capacity"]
+            self.max_series = index["max_series"]
+            self.rollups = [tuple(rollup) for rollup in index.get("rollups", self.rollups)]
+            self.series = {tuple(key.split("|", 1)): entry for key, entry in index["series"].items()}
+            for entry in self.series.values():
+                entry.setdefault("rollups", {})
+        else:
+            self.series = {}
+
+        self.tiers = [_Tier(None, self.capacity)] + [_Tier(bucket, capacity)
+                                                     for bucket, capacity in self.rollups]
+        self.arrays = {}
+        for tier in self.tiers:
+            for name, dtype in tier.files:
+                exists = existing and os.path.exists(os.path.join(path, name))
+                self._map(name, dtype, tier.capacity, "r+" if exists else "w+")
+
+    def _map(self, name, dtype, capacity, mode):
+        self.arrays[name] = np.memmap(os.path.join(self.path, name), dtype=dtype,
+                                      mode=mode, shape=(self.max_series, capacity))
+
+    @property
+    def values(self):
+        return self.arrays[self.tiers[0].values]
+
+    @property
+    def times(self):
+        return self.arrays[self.tiers[0].times]
+
+    def _grow(self):
+        """Verdubbel het aantal rijen, begrensd door max_bytes. Rijen liggen na
+        elkaar in het bestand, dus bestaande reeksen blijven op hun plaats staan."""
+        row_bytes = sum(tier.row_bytes for tier in self.tiers)
+        max_series = min(self.max_series * 2, self.max_bytes // row_bytes)
+        if max_series <= self.max_series:
+            raise MemoryError(f"limiet van {self.max_bytes // (1024 * 1024)} MB bereikt")
+
+        for array in self.arrays.values():
+            array.flush()
+        for tier in self.tiers:
+            for name, _ in tier.files:
+                with open(os.path.join(self.path, name), "r+b") as f:
+                    f.truncate(max_series * tier.capacity * 4)
+        self.max_series = max_series
+        for tier in self.tiers:
+            for name, dtype in tier.files:
+                self._map(name, dtype, tier.capacity, "r+")
+
+    def _slot(self, device, metric):
+        """Return de index entry van een reeks, maak er een aan indien nodig.
+
+        Return None als de store niet kan groeien (disk/geheugen vol of max_bytes bereikt).
+        """
+        entry = self.series.get((device, metric))
+        if entry is None:
+            if len(self.series) >= self.max_series:
+                try:
+                    self._grow()
+                except (OSError, MemoryError) as e:
+                    # Een volle store mag nooit een health check laten falen
+                    if not self._full_warned:
+                        print(f"⚠️  Time-series store vol ({self.max_series} reeksen), "
+                              f"nieuwe reeksen worden overgeslagen: {e}")
+                        self._full_warned = True
+                    return None
+            entry = {"row": len(self.series), "head": 0, "count": 0, "rollups": {}}
+            self.series[(device, metric)] = entry
+        return entry
+
+    def _record_rollup(self, tier, entry, value, timestamp):
+        """Verwerk een sample in de lopende bucket van een rollup resolutie."""
+        state = tier.state(entry)
+        start = timestamp - timestamp % tier.bucket
+        if state["start"] != start:
+            # Nieuwe bucket op de volgende positie van de ring
+            state.update(start=start, n=0, sum=0.0, max=value,
+                         head=(state["head"] + 1) % tier.capacity,
+                         count=min(state["count"] + 1, tier.capacity))
+        state["n"] += 1
+        state["sum"] += value
+        state["max"] = max(state["max"], value)
+
+        position = (state["head"] - 1) % tier.capacity
+        row = entry["row"]
+        self.arrays[tier.values][row, position] = state["sum"] / state["n"]
+        self.arrays[tier.maxima][row, position] = state["max"]
+        self.arrays[tier.times][row, position] = start
+
+    def record(self, device, metric, value, timestamp=None):
+        """Voeg een sample toe aan de ring buffers van (device, metric).
+
+        Return False als het sample overgeslagen werd omdat de store vol is.
+        """
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        value = float(value)
+        with self._lock:
+            entry = self._slot(device, metric)
+            if entry is None:
+                return False
+            self.values[entry["row"], entry["head"]] = value
+            self.times[entry["row"], entry["head"]] = timestamp
+            entry["head"] = (entry["head"] + 1) % self.capacity
+            entry["count"] = min(entry["count"] + 1, self.capacity)
+            for tier in self.tiers[1:]:
+                self._record_rollup(tier, entry, value, timestamp)
+
+            if time.monotonic() - self._last_flush > self.flush_interval:
+                self._flush()
+        return True
+
+    def _ordered(self, tier, entry, name):
+        """Return (times, array[name]) van een reeks in chronologische volgorde (views/kopie)."""
+        state = tier.state(entry)
+        row, head, count = entry["row"], state["head"], state["count"]
+        if count < tier.capacity:
+            return self.arrays[tier.times][row, :count], self.arrays[name][row, :count]
+        order = np.r_[head:tier.capacity, 0:head]
+        return self.arrays[tier.times][row, order], self.arrays[name][row, order]
+
+    def _covers(self, tier, entry, since):
+        """True als de ring nog alles vanaf since bevat (niets ouder overschreven)."""
+        state = tier.state(entry)
+        if since is None or state["count"] < tier.capacity:
+            return True
+        return self.arrays[tier.times][entry["row"], state["head"]] <= since
+
+    def _tier_for(self, entries, since):
+        """Fijnste resolutie die het venster vanaf since voor alle entries bevat."""
+        for tier in self.tiers:
+            if all(self._covers(tier, entry, since) for entry in entries):
+                return tier
+        return self.tiers[-1]
+
+    def query(self, device, metric, since=None, maxima=False):
+        """Return (timestamps, values) als NumPy arrays, optioneel vanaf unix tijd since.
+
+        Reikt since verder terug dan de ruwe samples, dan komen de waarden uit
+        de fijnste rollup die het venster bevat: gemiddelden per bucket, of
+        met maxima=True het maximum per bucket.
+        """
+        with self._lock:
+            entry = self.series.get((device, metric))
+            if entry is None:
+                return np.empty(0, np.uint32), np.empty(0, np.float32)
+            tier = self._tier_for([entry], since)
+            times, values = self._ordered(tier, entry, tier.maxima if maxima else tier.values)
+            if since is not None:
+                start = np.searchsorted(times, since)
+                times, values = times[start:], values[start:]
+            return np.array(times), np.array(values)
+
+    def stats(self, device, metric, since=None, percentiles=(50, 95, 99)):
+        """Min/max/mean en percentielen van een reeks.
+
+        Uit een rollup zijn min, mean en percentielen berekend op de bucket
+        gemiddelden; max is het echte maximum van de samples.
+        """
+        _, values = self.query(device, metric, since)
+        if values.size == 0:
+            return None
+        _, peaks = self.query(device, metric, since, maxima=True)
+        result = {
+            "samples": int(values.size),
+            "min": float(values.min()),
+            "max": float(peaks.max()),
+            "mean": float(values.mean()),
+        }
+        for p, value in zip(percentiles, np.percentile(values, percentiles)):
+            result[f"p{p}"] = float(value)
+        return result
+
+    def fleet_max(self, metric, since):
+        """Maximum van een metric per device sinds unix tijd since, voor alle devices tegelijk."""
+        with self._lock:
+            keys = [(device, entry) for (device, m), entry in self.series.items() if m == metric]
+            if not keys:
+                return {}
+            tier = self._tier_for([entry for _, entry in keys], since)
+            rows = np.array([entry["row"] for _, entry in keys])
+            values = np.where(self.arrays[tier.times][rows] >= since,
+                              self.arrays[tier.maxima][rows], -np.inf)
+            maxima = values.max(axis=1)
+        return {device: float(value) for (device, _), value in zip(keys, maxima)
+                if np.isfinite(value)}
+
+    def _flush(self):
+        for array in self.arrays.values():
+            array.flush()
+        index = {
+            "capacity": self.capacity,
+            "max_series": self.max_series,
+            "rollups": self.rollups,
+            "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "series": {f"{device}|{metric}": entry for (device, metric), entry in self.series.items()}
+        }
+        tmp_file = os.path.join(self.path, "index.json.tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_file, os.path.join(self.path, "index.json"))
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Schrijf de ring buffers en de index naar disk."""
+        with self._lock:
+            self._flush()
+
+
+# Main execution: toon statistieken van de opgeslagen metingen
+if __name__ == "__main__":
+    store = TimeSeriesStore()
+    since = time.time() - 30 * 24 * 3600
+
+    print("=" * 60)
+    print("Part 3b: Time-series statistieken (laatste 30 dagen)")
+    print("=" * 60)
+    for device, metric in sorted(store.series):
+        stats = store.stats(device, metric, since=since)
+        if stats:
+            print(f"{device:20} {metric:12} min {stats['min']:6.1f}  max {stats['max']:6.1f}  "
+                  f"p95 {stats['p95']:6.1f}  ({stats['samples']} samples)")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Part 6: Use RESTCONF to Access an IOS XE Device
+Benchmark van de HTTP client patronen tegen de lokale RESTCONF server
+
+De part6 scripts doen per request een losse requests.get(): elke call
+opent een nieuwe TCP verbinding met een volledige TLS handshake. Deze
+benchmark vergelijkt per-request latency en requests/sec voor:
+
+- one-shot: requests.get() per request (het huidige patroon)
+- session: één requests.Session (keep-alive, connection pooling)
+- concurrent: N threads met elk een eigen Session tegelijk
+
+De server (part6_restconf_server.py) draait in een apart proces.
+
+    python part6_restconf_benchmark.py --requests 200 --workers 8
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+import requests
+
+from part6_restconf_server import DATA_PREFIX, CONTENT_TYPE, Datastore, RestconfServer
+
+# Disable SSL warnings voor self-signed certificates
+requests.packages.urllib3.disable_warnings()
+
+AUTH = ("cisco", "cisco123!")
+HEADERS = {
+    "Accept": CONTENT_TYPE,
+    "Content-type": CONTENT_TYPE
+}
+
+
+def _serve(interfaces, port, latency, ready, stop):
+    """Draait in een apart proces: server starten tot stop gezet wordt."""
+    server = RestconfServer(Datastore(interfaces), port, latency=latency).start()
+    ready.set()
+    stop.wait()
+    server.stop()
+
+
+def _timed_get(get, url):
+    start = time.perf_counter()
+    resp = get(url, auth=AUTH, headers=HEADERS, verify=False)
+    elapsed = time.perf_counter() - start
+    if resp.status_code != 200:
+        raise RuntimeError(f"GET {url}: status {resp.status_code}")
+    return elapsed
+
+
+def one_shot(url, count):
+    """Huidig patroon: requests.get() per request."""
+    return [_timed_get(requests.get, url) for _ in range(count)]
+
+
+def with_session(url, count):
+    """Eén Session: de TCP/TLS verbinding wordt hergebruikt."""
+    with requests.Session() as session:
+        return [_timed_get(session.get, url) for _ in range(count)]
+
+
+def concurrent(url, count, workers):
+    """workers threads, elk met een eigen Session (Session is niet thread-safe)."""
+    local = threading.local()
+    sessions = []
+    lock = threading.Lock()
+
+    def fetch(_):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+            with lock:
+                sessions.append(local.session)
+        return _timed_get(local.session.get, url)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(fetch, range(count)))
+    finally:
+        for session in sessions:
+            session.close()
+
+
+def summarize(latencies, duration):
+    data = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / duration, 1),
+        "p50_ms": round(float(np.percentile(data, 50)), 2),
+        "p95_ms": round(float(np.percentile(data, 95)), 2),
+        "max_ms": round(float(data.max()), 2)
+    }
+
+
+def run_benchmark(count=200, workers=8, interfaces=10, port=18443, latency=0.0,
+                  path="ietf-interfaces:interfaces"):
+    """Vergelijk de client patronen. Return {patroon: samenvatting}."""
+    ready = multiprocessing.Event()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve, args=(interfaces, port, latency, ready, stop),
+                                     daemon=True)
+    server.start()
+    if not ready.wait(60):
+        server.terminate()
+        raise RuntimeError("RESTCONF server niet gestart binnen 60 s")
+
+    url = f"https://127.0.0.1:{port}{DATA_PREFIX}{path}"
+    patterns = {
+        "one-shot": lambda: one_shot(url, count),
+        "session": lambda: with_session(url, count),
+        f"concurrent ({workers})": lambda: concurrent(url, count, workers)
+    }
+
+    results = {}
+    try:
+        for name, run in patterns.items():
+            start = time.perf_counter()
+            latencies = run()
+            results[name] = summarize(latencies, time.perf_counter() - start)
+    finally:
+        stop.set()
+        server.join(10)
+    return results
+
+
+# Main execution: vergelijk de client patronen
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RESTCONF client benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="Aantal requests per patroon")
+    parser.add_argument("--workers", type=int, default=8, help="Threads voor het concurrent patroon")
+    parser.add_argument("--interfaces", type=int, default=10, help="Aantal interfaces in de datastore")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server vertraging per request (s)")
+    parser.add_argument("--port", type=int, default=18443, help="HTTPS poort van de server")
+    parser.add_argument("--path", default="ietf-interfaces:interfaces", help="RESTCONF data pad")
+    parser.add_argument("-o", "--output", help="Schrijf de resultaten ook als JSON")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Part 6: RESTCONF Client Benchmark")
+    print("=" * 60)
+    print(f"GET {DATA_PREFIX}{args.path} ({args.interfaces} interfaces, "
+          f"latency {args.latency} s), {args.requests} requests per patroon\n")
+
+    results = run_benchmark(args.requests, args.workers, args.interfaces, args.port,
+                            args.latency, args.path)
+
+    print(f"  {'patroon':<16} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name, stats in results.items():
+        print(f"  {name:<16} {stats['requests_per_second']:>8} {stats['p50_ms']:>9} "
+              f"{stats['p95_ms']:>9} {stats['max_ms']:>9}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultaten: {args.output}")
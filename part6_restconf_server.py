@@ -0,0 +1,448 @@
+#!/usr/bin/env python
+"""
+Part 6: Use RESTCONF to Access an IOS XE Device
+Lokale RESTCONF server (HTTPS stand-in voor de router)
+
+Zodat part6_restconf_get_interfaces.py en part6_restconf_create_loopback.py
+zonder echte router getest en gebenchmarkt kunnen worden:
+
+- HTTPS met een self-signed certificaat (eenmalig gegenereerd in restconf_cert/)
+- Gebouwd op http.server (ThreadingHTTPServer, HTTP/1.1 keep-alive)
+- /restconf/data/ietf-interfaces:interfaces en Cisco-IOS-XE-native:native
+  uit een in-memory boom, inclusief list entries zoals interface=Loopback100
+- GET, PUT, PATCH, POST en DELETE met RFC 8040 statuscodes en foutmeldingen
+- Elke gebruikersnaam/wachtwoord via Basic auth wordt aanvaard
+- Instelbare latency per request
+
+Gebruik:
+
+    python part6_restconf_server.py --interfaces 100 --port 8443
+
+en zet in de scripts IP_ADDRESS op "127.0.0.1:8443".
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+import argparse
+import datetime
+import ipaddress
+import json
+import os
+import ssl
+import threading
+import time
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+CONTENT_TYPE = "application/yang-data+json"
+DATA_PREFIX = "/restconf/data/"
+
+# YANG lists en hun key leaf; intern bewaard als dict {key: entry}
+LIST_KEYS = {
+    "interface": "name",
+    "address": "ip"
+}
+
+
+def ensure_certificate(cert_dir="restconf_cert"):
+    """Maak (eenmalig) een self-signed certificaat voor localhost. Return (certfile, keyfile)."""
+    certfile = os.path.join(cert_dir, "server.crt")
+    keyfile = os.path.join(cert_dir, "server.key")
+    if os.path.exists(certfile) and os.path.exists(keyfile):
+        return certfile, keyfile
+
+    if not os.path.exists(cert_dir):
+        os.makedirs(cert_dir)
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=365))
+        .add_extension(x509.SubjectAlternativeName([
+            x509.DNSName("localhost"),
+            x509.IPAddress(ipaddress.ip_address("127.0.0.1"))
+        ]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+
+    with open(keyfile, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM,
+                                  serialization.PrivateFormat.TraditionalOpenSSL,
+                                  serialization.NoEncryption()))
+    with open(certfile, "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    return certfile, keyfile
+
+
+def _local(name):
+    """Naam zonder module prefix ('ietf-ip:ipv4' -> 'ipv4')."""
+    return name.split(":", 1)[-1]
+
+
+def _entry_key(name, entry):
+    """Key van een YANG list entry; een entry moet een object met de key leaf zijn."""
+    key = LIST_KEYS[_local(name)]
+    if not isinstance(entry, dict) or entry.get(key) is None:
+        raise RestconfError(400, "invalid-value", f"Entry van {_local(name)} moet een object met '{key}' zijn")
+    return str(entry[key])
+
+
+def _to_internal(name, value):
+    """JSON waarde naar de interne vorm: YANG lists worden dicts op hun key."""
+    key = LIST_KEYS.get(_local(name))
+    if key is not None and isinstance(value, list):
+        return {_entry_key(name, entry): _members_to_internal(entry) for entry in value}
+    if isinstance(value, dict):
+        return _members_to_internal(value)
+    return value
+
+
+def _members_to_internal(members):
+    return {name: _to_internal(name, value) for name, value in members.items()}
+
+
+def _to_json(name, value):
+    """Interne vorm terug naar JSON (lists weer als JSON array)."""
+    if LIST_KEYS.get(_local(name)) is not None and isinstance(value, dict):
+        return [_members_to_json(entry) for entry in value.values()]
+    if isinstance(value, dict):
+        return _members_to_json(value)
+    return value
+
+
+def _members_to_json(members):
+    return {name: _to_json(name, value) for name, value in members.items()}
+
+
+def _merge(target, source):
+    """PATCH semantiek: source recursief in target samenvoegen."""
+    for name, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(name), dict):
+            _merge(target[name], value)
+        else:
+            target[name] = value
+
+
+class RestconfError(Exception):
+    """Fout die als ietf-restconf:errors met een HTTP status teruggaat."""
+
+    def __init__(self, status, tag, message):
+        super().__init__(message)
+        self.status = status
+        self.tag = tag
+
+
+class Datastore:
+    """In-memory RESTCONF data boom (ietf-interfaces + Cisco native)."""
+
+    def __init__(self, interfaces=10, hostname="CSR1000v-Sim"):
+        self._lock = threading.Lock()
+        entries = []
+        for index in range(interfaces):
+            name = "Loopback0" if index == 0 else f"GigabitEthernet{index}"
+            entries.append({
+                "name": name,
+                "description": f"Gesimuleerde interface {index}",
+                "type": "iana-if-type:softwareLoopback" if index == 0 else "iana-if-type:ethernetCsmacd",
+                "enabled": True,
+                "ietf-ip:ipv4": {"address": [{
+                    "ip": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+                    "netmask": "255.255.255.255"
+                }]},
+                "ietf-ip:ipv6": {}
+            })
+        self.tree = _members_to_internal({
+            "ietf-interfaces:interfaces": {"interface": entries},
+            "Cisco-IOS-XE-native:native": {"version": "17.3", "hostname": hostname}
+        })
+
+    @staticmethod
+    def _member(container, name):
+        """De echte naam van name in container (met of zonder module prefix), of None."""
+        if name in container:
+            return name
+        for member in container:
+            if _local(member) == _local(name):
+                return member
+        return None
+
+    def _resolve(self, path, create=False):
+        """Loop het pad af. Return (container, slot, member naam, is list entry).
+
+        container[slot] is de doelnode (of ontbreekt nog); voor een list entry is
+        container de list (dict op key) en slot de key waarde. Met create wordt
+        een nog onbestaande list aangemaakt (eerste entry via PUT).
+        """
+        segments = [segment for segment in path.split("/") if segment]
+        if not segments:
+            raise RestconfError(400, "invalid-value", "Leeg pad")
+
+        current = self.tree
+        container, slot, member, is_entry = None, None, None, False
+        for position, segment in enumerate(segments):
+            if not isinstance(current, dict):
+                raise RestconfError(404, "invalid-value", f"Pad bestaat niet: {segment}")
+            name, is_entry, key = segment.partition("=")
+            member = self._member(current, name) or name
+            last = position == len(segments) - 1
+            if is_entry:
+                entries = current.get(member)
+                if entries is None:
+                    if not (create and last):
+                        raise RestconfError(404, "invalid-value", f"Pad bestaat niet: {segment}")
+                    entries = current[member] = {}
+                container, slot = entries, unquote(key)
+            else:
+                container, slot = current, member
+            if not last and slot not in container:
+                raise RestconfError(404, "invalid-value", f"Pad bestaat niet: {segment}")
+            current = container.get(slot)
+        return container, slot, member, bool(is_entry)
+
+    @staticmethod
+    def _body_value(member, body, key=None):
+        """Haal de waarde voor member uit een request body {"module:naam": waarde}."""
+        if not isinstance(body, dict) or len(body) != 1:
+            raise RestconfError(400, "malformed-message", "Body moet precies één top-level member bevatten")
+        name, value = next(iter(body.items()))
+        if _local(name) != _local(member):
+            raise RestconfError(400, "invalid-value", f"Body member {name} past niet bij {member}")
+        if key is not None:
+            if isinstance(value, list):
+                if len(value) != 1:
+                    raise RestconfError(400, "invalid-value", "Precies één list entry verwacht")
+                value = value[0]
+            if LIST_KEYS.get(_local(member)) is not None:
+                if _entry_key(member, value) != key:
+                    raise RestconfError(400, "invalid-value", "Key in de body verschilt van de key in de URL")
+            elif not isinstance(value, dict):
+                raise RestconfError(400, "invalid-value", f"Entry van {_local(member)} moet een object zijn")
+            return _members_to_internal(value)
+        return _to_internal(name, value)
+
+    def get(self, path):
+        """Return het JSON antwoord voor een GET."""
+        with self._lock:
+            container, slot, member, is_entry = self._resolve(path)
+            if slot not in container:
+                raise RestconfError(404, "invalid-value", "Data bestaat niet")
+            value = container[slot]
+            module = path.strip("/").split("/")[0].split(":")[0]
+            name = member if ":" in member else f"{module}:{member}"
+            if is_entry:
+                # List entry: antwoord is een array met één entry
+                return {name: [_members_to_json(value)]}
+            return {name: _to_json(member, value)}
+
+    def put(self, path, body):
+        """Maak of vervang de node. Return True als ze nieuw is."""
+        with self._lock:
+            container, slot, member, is_entry = self._resolve(path, create=True)
+            created = slot not in container
+            container[slot] = self._body_value(member, body, slot if is_entry else None)
+            return created
+
+    def patch(self, path, body):
+        """Voeg de body samen met een bestaande node."""
+        with self._lock:
+            container, slot, member, is_entry = self._resolve(path)
+            if slot not in container:
+                raise RestconfError(404, "invalid-value", "Data bestaat niet")
+            value = self._body_value(member, body, slot if is_entry else None)
+            if isinstance(value, dict) and isinstance(container[slot], dict):
+                _merge(container[slot], value)
+            else:
+                container[slot] = value
+
+    def post(self, path, body):
+        """Maak een nieuw kind aan onder path (409 als het al bestaat)."""
+        with self._lock:
+            container, slot, _, _ = self._resolve(path)
+            if slot not in container or not isinstance(container[slot], dict):
+                raise RestconfError(404, "invalid-value", "Parent bestaat niet")
+            parent = container[slot]
+            if not isinstance(body, dict) or len(body) != 1:
+                raise RestconfError(400, "malformed-message", "Body moet precies één top-level member bevatten")
+            name, value = next(iter(body.items()))
+            member = self._member(parent, name) or name
+            list_key = LIST_KEYS.get(_local(name))
+            if list_key is not None:
+                if isinstance(value, list):
+                    if len(value) != 1:
+                        raise RestconfError(400, "invalid-value", "Precies één list entry verwacht")
+                    value = value[0]
+                key = _entry_key(name, value)
+                entry = _members_to_internal(value)
+                entries = parent.setdefault(member, {})
+                if key in entries:
+                    raise RestconfError(409, "data-exists", f"{_local(name)}={key} bestaat al")
+                entries[key] = entry
+            else:
+                if member in parent:
+                    raise RestconfError(409, "data-exists", f"{_local(name)} bestaat al")
+                parent[member] = _to_internal(name, value)
+
+    def delete(self, path):
+        with self._lock:
+            container, slot, _, _ = self._resolve(path)
+            if slot not in container:
+                raise RestconfError(404, "data-missing", "Data bestaat niet")
+            del container[slot]
+
+
+class RestconfHandler(BaseHTTPRequestHandler):
+    """HTTP handler; de server geeft datastore en latency mee."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "RestconfSim/1.0"
+    # Headers en body zijn aparte writes: zonder TCP_NODELAY wacht elke
+    # keep-alive response ~40 ms op de delayed ACK van de client
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Geen regel per request op stderr (de benchmark doet duizenden requests)
+        pass
+
+    def _send(self, status, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _error(self, status, tag, message):
+        self._send(status, {"ietf-restconf:errors": {"error": [{
+            "error-type": "application",
+            "error-tag": tag,
+            "error-message": message
+        }]}})
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw) if raw else {}
+        except ValueError:
+            raise RestconfError(400, "malformed-message", "Ongeldige JSON body")
+
+    def _handle(self, method):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        # Body altijd lezen, ook bij fouten, anders raakt de keep-alive verbinding uit sync
+        body = self._body() if method in ("PUT", "PATCH", "POST") else None
+
+        if not self.headers.get("Authorization", "").startswith("Basic "):
+            self._error(401, "access-denied", "Basic authenticatie vereist")
+            return
+
+        path = self.path.split("?", 1)[0]
+        if path.rstrip("/") == "/restconf" and method == "GET":
+            self._send(200, {"ietf-restconf:restconf": {"data": {}, "operations": {},
+                                                       "yang-library-version": "2016-06-21"}})
+            return
+        if not path.startswith(DATA_PREFIX):
+            self._error(404, "invalid-value", f"Onbekende resource: {path}")
+            return
+
+        datastore = self.server.datastore
+        path = path[len(DATA_PREFIX):]
+        if method == "GET":
+            self._send(200, datastore.get(path))
+        elif method == "PUT":
+            self._send(201 if datastore.put(path, body) else 204)
+        elif method == "PATCH":
+            datastore.patch(path, body)
+            self._send(204)
+        elif method == "POST":
+            datastore.post(path, body)
+            self._send(201)
+        elif method == "DELETE":
+            datastore.delete(path)
+            self._send(204)
+
+    def _dispatch(self, method):
+        try:
+            self._handle(method)
+        except RestconfError as e:
+            self._error(e.status, e.tag, str(e))
+        except Exception as e:
+            # Een bug in de datastore mag de verbinding niet zonder antwoord laten
+            self._error(500, "operation-failed", f"Interne fout: {e}")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class RestconfServer(ThreadingHTTPServer):
+    """HTTPS RESTCONF server rond een Datastore."""
+
+    daemon_threads = True
+
+    def __init__(self, datastore=None, port=8443, host="127.0.0.1", latency=0.0, cert_dir="restconf_cert"):
+        super().__init__((host, port), RestconfHandler)
+        self.datastore = datastore if datastore is not None else Datastore()
+        self.latency = latency
+        certfile, keyfile = ensure_certificate(cert_dir)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        # Handshake pas in de handler thread, niet in de accept loop
+        self.socket = context.wrap_socket(self.socket, server_side=True, do_handshake_on_connect=False)
+        self._thread = None
+
+    def start(self):
+        """Serveer in een achtergrond thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+# Main execution: start een RESTCONF server tot Ctrl+C
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lokale RESTCONF server stand-in")
+    parser.add_argument("--interfaces", type=int, default=10, help="Aantal interfaces in de datastore")
+    parser.add_argument("--port", type=int, default=8443, help="HTTPS poort")
+    parser.add_argument("--latency", type=float, default=0.0, help="Vertraging per request (s)")
+    args = parser.parse_args()
+
+    server = RestconfServer(Datastore(args.interfaces), args.port, latency=args.latency)
+
+    print("=" * 60)
+    print("Part 6: RESTCONF Server Stand-in")
+    print("=" * 60)
+    print(f"https://127.0.0.1:{args.port}{DATA_PREFIX}ietf-interfaces:interfaces "
+          f"({args.interfaces} interface(s))")
+    print("Stop met Ctrl+C")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+        print("\nServer gestopt.")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+"""
+Part 8: Getting Started with NETCONF/YANG – Part 2
+Benchmark van NETCONF RPC's tegen de lokale server (part8_netconf_server.py)
+
+Per datastore grootte (standaard 10 tot 100k interfaces) wordt gemeten:
+
+- RPC throughput (RPC's per seconde) en latency per RPC type:
+  volledige get-config, get-config van één interface (subtree filter),
+  get van de interface statistieken en een edit-config (description)
+- Grootte van de reply en de parse cost aan de client kant (lxml parse van
+  de reply XML, los van het netwerk en de server)
+
+De server draait in een apart proces zodat server en client niet om
+dezelfde GIL strijden. Let op: ncclient verstuurt wachtende RPC's maar om de
+0.1 s (TICK in ncclient.transport.session), dus kleine RPC's halen ongeveer
+10 rpc/s per sessie; het verschil tussen groottes zit in wat daarboven komt.
+
+    python part8_netconf_benchmark.py --sizes 10 100 1000 10000 100000
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+
+from lxml import etree
+from ncclient import manager
+
+from part8_netconf_server import Datastore, IF_NS, NetconfServer
+
+FILTER_ALL_INTERFACES = f"""
+<filter>
+    <interfaces xmlns="{IF_NS}"/>
+</filter>
+"""
+
+FILTER_ONE_INTERFACE = f"""
+<filter>
+    <interfaces xmlns="{IF_NS}">
+        <interface>
+            <name>GigabitEthernet1</name>
+        </interface>
+    </interfaces>
+</filter>
+"""
+
+FILTER_STATISTICS = f"""
+<filter>
+    <interfaces-state xmlns="{IF_NS}">
+        <interface>
+            <name/>
+            <oper-status/>
+            <statistics/>
+        </interface>
+    </interfaces-state>
+</filter>
+"""
+
+EDIT_DESCRIPTION = f"""
+<config>
+    <interfaces xmlns="{IF_NS}">
+        <interface>
+            <name>GigabitEthernet1</name>
+            <description>Benchmark {{counter}}</description>
+        </interface>
+    </interfaces>
+</config>
+"""
+
+
+def _serve(interfaces, port, latency, ready, stop):
+    """Draait in een apart proces: datastore opbouwen en serveren tot stop gezet wordt."""
+    server = NetconfServer(Datastore(interfaces), port, latency=latency).start()
+    ready.set()
+    stop.wait()
+    server.stop()
+
+
+def measure(rpc, min_runs=3, duration=2.0):
+    """Voer rpc herhaaldelijk uit (minstens min_runs keer of duration seconden).
+
+    Return (latencies in s, laatste reply).
+    """
+    latencies = []
+    reply = None
+    start = time.perf_counter()
+    while len(latencies) < min_runs or time.perf_counter() - start < duration:
+        begin = time.perf_counter()
+        reply = rpc(len(latencies))
+        latencies.append(time.perf_counter() - begin)
+    return latencies, reply
+
+
+def parse_cost(xml, runs=3):
+    """Snelste van runs keer een reply parsen met lxml (zoals ncclient dat doet)."""
+    raw = xml.encode()
+    parser = etree.XMLParser(huge_tree=True)
+    # Opwarmen: de eerste parse na het vrijgeven van een grote reply betaalt de opkuis
+    etree.fromstring(raw, parser)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        etree.fromstring(raw, parser)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(interfaces, port=18830, latency=0.0, duration=2.0):
+    """Benchmark één datastore grootte. Return een resultaat dict."""
+    ready = multiprocessing.Event()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=_serve, args=(interfaces, port, latency, ready, stop),
+                                     daemon=True)
+    started = time.perf_counter()
+    server.start()
+    if not ready.wait(600):
+        server.terminate()
+        raise RuntimeError("NETCONF server niet gestart binnen 600 s")
+    build_time = time.perf_counter() - started
+
+    try:
+        start = time.perf_counter()
+        m = manager.connect(host="127.0.0.1", port=port, username="cisco", password="cisco123!",
+                            hostkey_verify=False, look_for_keys=False, allow_agent=False)
+        connect_time = time.perf_counter() - start
+        # Grote replies: geen lxml limiet op de boomdiepte/tekstgrootte en ruime RPC timeout
+        m.huge_tree = True
+        m.timeout = 600
+
+        rpcs = {
+            "get-config (alles)": lambda i: m.get_config(source="running", filter=FILTER_ALL_INTERFACES),
+            "get-config (1 interface)": lambda i: m.get_config(source="running", filter=FILTER_ONE_INTERFACE),
+            "get (statistieken)": lambda i: m.get(filter=FILTER_STATISTICS),
+            "edit-config (description)": lambda i: m.edit_config(EDIT_DESCRIPTION.format(counter=i),
+                                                                 target="running")
+        }
+
+        results = {}
+        for name, rpc in rpcs.items():
+            latencies, reply = measure(rpc, duration=duration)
+            latencies.sort()
+            results[name] = {
+                "runs": len(latencies),
+                "rpc_per_second": round(len(latencies) / sum(latencies), 1),
+                "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+                "max_ms": round(latencies[-1] * 1000, 2),
+                "reply_bytes": len(reply.xml),
+                "parse_ms": round(parse_cost(reply.xml) * 1000, 2)
+            }
+        m.close_session()
+    finally:
+        stop.set()
+        server.join(10)
+
+    return {
+        "interfaces": interfaces,
+        "startup_s": round(build_time, 2),
+        "connect_ms": round(connect_time * 1000, 1),
+        "rpcs": results
+    }
+
+
+def print_result(result):
+    print(f"\n{result['interfaces']} interfaces (server start {result['startup_s']} s, "
+          f"connect {result['connect_ms']} ms)")
+    print(f"  {'RPC':<27} {'rpc/s':>8} {'p50 ms':>9} {'max ms':>9} {'reply':>12} {'parse ms':>9}")
+    for name, stats in result["rpcs"].items():
+        print(f"  {name:<27} {stats['rpc_per_second']:>8} {stats['p50_ms']:>9} {stats['max_ms']:>9} "
+              f"{stats['reply_bytes']:>12} {stats['parse_ms']:>9}")
+
+
+# Main execution: benchmark bij oplopende datastore groottes
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NETCONF RPC benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000],
+                        help="Aantal interfaces in de datastore per run")
+    parser.add_argument("--port", type=int, default=18830, help="Poort van de NETCONF server")
+    parser.add_argument("--latency", type=float, default=0.0, help="Vertraging per RPC (s)")
+    parser.add_argument("--duration", type=float, default=2.0, help="Meetduur per RPC type (s)")
+    parser.add_argument("-o", "--output", help="Schrijf de resultaten ook als JSON")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Part 8: NETCONF Benchmark")
+    print("=" * 60)
+
+    results = []
+    for size in args.sizes:
+        result = run_benchmark(size, args.port, args.latency, args.duration)
+        print_result(result)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultaten: {args.output}")
@@ -0,0 +1,530 @@
+#!/usr/bin/env python
+"""
+Part 8: Getting Started with NETCONF/YANG – Part 2
+Lokale NETCONF server (stand-in voor de CSR1000v op poort 830)
+
+Zodat part4_yang_explorer.py, part5_* en part8_* zonder echte router getest
+en gebenchmarkt kunnen worden:
+
+- NETCONF over SSH (paramiko, subsystem 'netconf'), base 1.0 framing (]]>]]>)
+- hello met capabilities (ietf-interfaces, ietf-ip, Cisco-IOS-XE-native)
+- get, get-config (running) met subtree filters volgens RFC 6241
+  (containment, selection en content match nodes)
+- edit-config op running met merge/replace/create/delete/remove
+- In-memory XML datastore met een instelbaar aantal interfaces
+- Instelbare latency per RPC
+
+Gebruik:
+
+    python part8_netconf_server.py --interfaces 1000 --port 8830
+
+en verbind met ncclient naar 127.0.0.1 poort 8830 (username/password vrij).
+"""
+
+import argparse
+import copy
+import io
+import itertools
+import logging
+import socket
+import threading
+import time
+
+import paramiko
+from lxml import etree
+
+NC_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+IF_NS = "urn:ietf:params:xml:ns:yang:ietf-interfaces"
+IP_NS = "urn:ietf:params:xml:ns:yang:ietf-ip"
+IANA_NS = "urn:ietf:params:xml:ns:yang:iana-if-type"
+NATIVE_NS = "http://cisco.com/ns/yang/Cisco-IOS-XE-native"
+
+EOM = b"]]>]]>"
+
+# Clients die de sessie gewoon dichtgooien geven geen "Connection reset" meldingen
+logging.getLogger("paramiko.netconf_server").setLevel(logging.CRITICAL)
+
+CAPABILITIES = [
+    "urn:ietf:params:netconf:base:1.0",
+    "urn:ietf:params:netconf:capability:writable-running:1.0",
+    f"{IF_NS}?module=ietf-interfaces&revision=2014-05-08",
+    f"{IP_NS}?module=ietf-ip&revision=2014-06-16",
+    f"{IANA_NS}?module=iana-if-type&revision=2014-05-08",
+    f"{NATIVE_NS}?module=Cisco-IOS-XE-native&revision=2020-07-01"
+]
+
+_OPERATION = f"{{{NC_NS}}}operation"
+
+
+def _qname(namespace, tag):
+    return f"{{{namespace}}}{tag}"
+
+
+def _text(element):
+    return (element.text or "").strip()
+
+
+def _elements(element):
+    """Kind-elementen zonder commentaar en processing instructions."""
+    return [child for child in element if isinstance(child.tag, str)]
+
+
+def _child(element, name):
+    """Kind met lokale naam name, met of zonder NETCONF namespace (templates laten die vaak weg)."""
+    for child in element:
+        if isinstance(child.tag, str) and etree.QName(child).localname == name:
+            return child
+    return None
+
+
+class RPCError(Exception):
+    """Fout die als <rpc-error> naar de client gaat."""
+
+    def __init__(self, tag, message, error_type="application"):
+        super().__init__(message)
+        self.tag = tag
+        self.error_type = error_type
+
+
+class Datastore:
+    """In-memory running datastore (ietf-interfaces + Cisco native) met operationele data."""
+
+    def __init__(self, interfaces=10, hostname="CSR1000v-Sim"):
+        self._lock = threading.RLock()
+        # (parent, list tag, key leaf tag) -> {key waarde: [elementen]}, lazy opgebouwd
+        self._indexes = {}
+        self._state = None
+        self.version = 0
+
+        self.running = etree.Element(_qname(NC_NS, "data"), nsmap={None: NC_NS})
+        native = etree.SubElement(self.running, _qname(NATIVE_NS, "native"), nsmap={None: NATIVE_NS})
+        etree.SubElement(native, _qname(NATIVE_NS, "hostname")).text = hostname
+        container = etree.SubElement(self.running, _qname(IF_NS, "interfaces"), nsmap={None: IF_NS})
+        for index in range(interfaces):
+            container.append(self._make_interface(index))
+
+    @property
+    def _interfaces(self):
+        """Huidige <interfaces> container: een edit (replace/delete) kan het element vervangen."""
+        return self.running.find(_qname(IF_NS, "interfaces"))
+
+    @staticmethod
+    def _make_interface(index):
+        if index == 0:
+            name, if_type = "Loopback0", "ianaift:softwareLoopback"
+        else:
+            name, if_type = f"GigabitEthernet{index}", "ianaift:ethernetCsmacd"
+        interface = etree.Element(_qname(IF_NS, "interface"), nsmap={None: IF_NS})
+        etree.SubElement(interface, _qname(IF_NS, "name")).text = name
+        etree.SubElement(interface, _qname(IF_NS, "description")).text = f"Gesimuleerde interface {index}"
+        etree.SubElement(interface, _qname(IF_NS, "type"), nsmap={"ianaift": IANA_NS}).text = if_type
+        etree.SubElement(interface, _qname(IF_NS, "enabled")).text = "true"
+        ipv4 = etree.SubElement(interface, _qname(IP_NS, "ipv4"), nsmap={None: IP_NS})
+        address = etree.SubElement(ipv4, _qname(IP_NS, "address"))
+        etree.SubElement(address, _qname(IP_NS, "ip")).text = f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"
+        etree.SubElement(address, _qname(IP_NS, "netmask")).text = "255.255.255.255"
+        return interface
+
+    def _build_state(self):
+        """Operationele interfaces-state, afgeleid van de geconfigureerde interfaces."""
+        state = etree.Element(_qname(IF_NS, "interfaces-state"), nsmap={None: IF_NS})
+        container = self._interfaces
+        interfaces = container.iterchildren(_qname(IF_NS, "interface")) if container is not None else []
+        for number, interface in enumerate(interfaces):
+            entry = etree.SubElement(state, _qname(IF_NS, "interface"))
+            etree.SubElement(entry, _qname(IF_NS, "name")).text = interface.findtext(_qname(IF_NS, "name"))
+            enabled = interface.findtext(_qname(IF_NS, "enabled"), "true") == "true"
+            etree.SubElement(entry, _qname(IF_NS, "admin-status")).text = "up" if enabled else "down"
+            etree.SubElement(entry, _qname(IF_NS, "oper-status")).text = "up" if enabled else "down"
+            statistics = etree.SubElement(entry, _qname(IF_NS, "statistics"))
+            etree.SubElement(statistics, _qname(IF_NS, "in-octets")).text = str(number * 1500 + 64000)
+            etree.SubElement(statistics, _qname(IF_NS, "out-octets")).text = str(number * 1400 + 32000)
+            etree.SubElement(statistics, _qname(IF_NS, "in-errors")).text = "0"
+            etree.SubElement(statistics, _qname(IF_NS, "out-errors")).text = "0"
+        return state
+
+    # -- lezen ---------------------------------------------------------------
+
+    def _roots(self, include_state):
+        roots = list(self.running)
+        if include_state:
+            if self._state is None:
+                self._state = self._build_state()
+            roots.append(self._state)
+        return roots
+
+    def _lookup(self, parent, tag, key_tag, value):
+        """Kinderen van parent met tag waarvan de key leaf gelijk is aan value (via index)."""
+        index = self._indexes.get((parent, tag, key_tag))
+        if index is None:
+            index = {}
+            for child in parent.iterchildren(tag):
+                key = child.find(key_tag)
+                index.setdefault(_text(key) if key is not None else None, []).append(child)
+            self._indexes[(parent, tag, key_tag)] = index
+        return index.get(value, [])
+
+    def _write_filtered(self, xf, data, spec, namespace=NC_NS):
+        """Subtree filter spec toepassen op data en het resultaat naar xf schrijven.
+
+        Volledig geselecteerde subtrees worden rechtstreeks uit de datastore
+        geserialiseerd: geen kopie en geen verhuis naar een ander document
+        (bij 100k interfaces kost die namespace reconciliatie tientallen seconden).
+        namespace is de default namespace van het omringende element.
+        """
+        children = _elements(spec)
+        if not children:
+            # Selection node (of content match node op het hoogste niveau)
+            if not _text(spec) or _text(data) == _text(spec):
+                xf.write(data)
+            return
+
+        matches = [child for child in children if len(child) == 0 and _text(child)]
+        others = [child for child in children if len(child) or not _text(child)]
+
+        # Alle content match nodes moeten kloppen, anders valt deze instantie weg
+        for match in matches:
+            if not any(_text(leaf) == _text(match) for leaf in data.iterchildren(match.tag)):
+                return
+
+        # Enkel content match nodes: de volledige instantie wordt geselecteerd
+        if not others:
+            xf.write(data)
+            return
+
+        data_namespace = etree.QName(data).namespace
+        nsmap = {None: data_namespace} if data_namespace != namespace else None
+        with xf.element(data.tag, nsmap=nsmap):
+            for match in matches:
+                for leaf in data.iterchildren(match.tag):
+                    xf.write(leaf)
+            for child_spec in others:
+                for candidate in self._candidates(data, child_spec):
+                    self._write_filtered(xf, candidate, child_spec, data_namespace)
+
+    def _candidates(self, parent, spec):
+        """Kinderen van parent die spec kunnen matchen; list entries met een key via de index."""
+        key_matches = [child for child in _elements(spec) if len(child) == 0 and _text(child)]
+        if key_matches:
+            key = key_matches[0]
+            return self._lookup(parent, spec.tag, key.tag, _text(key))
+        return parent.iterchildren(spec.tag)
+
+    def check_filter(self, filter_element):
+        """Enkel subtree filters (het standaard type) worden ondersteund."""
+        if filter_element is not None and filter_element.get("type", "subtree") != "subtree":
+            raise RPCError("operation-not-supported", "Enkel subtree filters worden ondersteund")
+
+    def query(self, xf, filter_element=None, include_state=False):
+        """Schrijf de inhoud van <data> naar xf (lxml xmlfile), optioneel met een subtree filter."""
+        self.check_filter(filter_element)
+        with self._lock:
+            roots = self._roots(include_state)
+            if filter_element is None:
+                for root in roots:
+                    xf.write(root)
+                return
+            for spec in _elements(filter_element):
+                for root in roots:
+                    if root.tag == spec.tag:
+                        self._write_filtered(xf, root, spec)
+
+    # -- schrijven -----------------------------------------------------------
+
+    def _index_add(self, parent, element):
+        for (index_parent, tag, key_tag), index in self._indexes.items():
+            if index_parent is parent and element.tag == tag:
+                key = element.find(key_tag)
+                index.setdefault(_text(key) if key is not None else None, []).append(element)
+
+    def _index_remove(self, parent, element):
+        for (index_parent, tag, key_tag), index in self._indexes.items():
+            if index_parent is parent and element.tag == tag:
+                key = element.find(key_tag)
+                entries = index.get(_text(key) if key is not None else None, [])
+                if element in entries:
+                    entries.remove(element)
+
+    @staticmethod
+    def _clean(element):
+        """Kopie zonder operation attributen."""
+        element = copy.deepcopy(element)
+        for node in element.iter():
+            node.attrib.pop(_OPERATION, None)
+            node.attrib.pop("operation", None)
+        return element
+
+    def _find_match(self, parent, source):
+        """Het bestaande element in parent dat overeenkomt met source (list entry via 'name')."""
+        namespace = etree.QName(source).namespace
+        key = source.find(_qname(namespace, "name") if namespace else "name")
+        if key is not None:
+            entries = self._lookup(parent, source.tag, key.tag, _text(key))
+            return entries[0] if entries else None
+        return parent.find(source.tag)
+
+    def _merge(self, parent, source, default_operation):
+        # De templates in part8_netconf_edit_config.py gebruiken operation zonder namespace
+        operation = source.get(_OPERATION) or source.get("operation") or default_operation
+        existing = self._find_match(parent, source)
+
+        if operation in ("delete", "remove"):
+            if existing is None:
+                if operation == "delete":
+                    raise RPCError("data-missing", f"{etree.QName(source).localname} bestaat niet")
+                return
+            self._index_remove(parent, existing)
+            parent.remove(existing)
+        elif operation == "create" and existing is not None:
+            raise RPCError("data-exists", f"{etree.QName(source).localname} bestaat al")
+        elif existing is None or operation in ("replace", "create"):
+            element = self._clean(source)
+            if existing is not None:
+                self._index_remove(parent, existing)
+                parent.replace(existing, element)
+            else:
+                parent.append(element)
+            self._index_add(parent, element)
+        elif len(source) == 0:
+            existing.text = source.text
+        else:
+            for child in source:
+                if isinstance(child.tag, str):
+                    self._merge(existing, child, operation)
+
+    def edit(self, config, default_operation="merge"):
+        """Pas een <config> element toe op de running datastore."""
+        with self._lock:
+            for child in config:
+                if isinstance(child.tag, str):
+                    self._merge(self.running, child, default_operation)
+            self._state = None
+            self.version += 1
+            # Indexes van verwijderde elementen en van de oude operationele data opruimen
+            self._indexes = {key: index for key, index in self._indexes.items()
+                             if key[0].getroottree().getroot() is self.running}
+
+
+class _NetconfSSHServer(paramiko.ServerInterface):
+    """Accepteert elke username/password en het 'netconf' subsystem."""
+
+    def __init__(self):
+        self.netconf_requested = threading.Event()
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_subsystem_request(self, channel, name):
+        if name != "netconf":
+            return False
+        self.netconf_requested.set()
+        return True
+
+
+class NetconfServer:
+    """NETCONF over SSH server rond een Datastore."""
+
+    def __init__(self, datastore=None, port=8830, host="127.0.0.1", latency=0.0):
+        self.datastore = datastore if datastore is not None else Datastore()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.rpcs = 0
+        # Sessies en RPCs lopen in aparte threads: ids uit een itertools.count
+        # (next() is atomair), de RPC teller onder lock
+        self._session_ids = itertools.count(1)
+        self._rpcs_lock = threading.Lock()
+        self._listener = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((self.host, self.port))
+        self._listener.listen(128)
+        self._listener.settimeout(0.5)
+        self._running = True
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._listener.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            client.settimeout(None)
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client):
+        transport = paramiko.Transport(client)
+        transport.set_log_channel("paramiko.netconf_server")
+        transport.add_server_key(self.host_key)
+        server = _NetconfSSHServer()
+        try:
+            transport.start_server(server=server)
+            channel = transport.accept(timeout=10)
+            if channel is None or not server.netconf_requested.wait(10):
+                return
+            self._session(channel, next(self._session_ids))
+        except (paramiko.SSHException, EOFError, OSError):
+            pass
+        finally:
+            transport.close()
+
+    def _hello(self, session_id):
+        hello = etree.Element(_qname(NC_NS, "hello"), nsmap={None: NC_NS})
+        capabilities = etree.SubElement(hello, _qname(NC_NS, "capabilities"))
+        for capability in CAPABILITIES:
+            etree.SubElement(capabilities, _qname(NC_NS, "capability")).text = capability
+        etree.SubElement(hello, _qname(NC_NS, "session-id")).text = str(session_id)
+        return etree.tostring(hello, xml_declaration=True, encoding="UTF-8") + EOM
+
+    def _session(self, channel, session_id):
+        channel.sendall(self._hello(session_id))
+        buffer = b""
+        hello_received = False
+        while True:
+            data = channel.recv(65536)
+            if not data:
+                return
+            buffer += data
+            while EOM in buffer:
+                message, buffer = buffer.split(EOM, 1)
+                if not hello_received:
+                    # Eerste bericht is de client hello
+                    hello_received = True
+                    continue
+                reply, close = self.handle(message)
+                channel.sendall(reply + EOM)
+                if close:
+                    channel.close()
+                    return
+
+    def handle(self, message):
+        """Verwerk één <rpc>. Return (reply bytes, sessie sluiten).
+
+        _dispatch valideert en voert de operatie uit en geeft een functie terug
+        die de body van de reply streamt; fouten vallen dus altijd vóór de output.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        with self._rpcs_lock:
+            self.rpcs += 1
+        try:
+            rpc = etree.fromstring(message.strip(), etree.XMLParser(huge_tree=True, remove_blank_text=True))
+        except etree.XMLSyntaxError as e:
+            rpc, operation = None, None
+            write_body = self._error("malformed-message", str(e), "rpc")
+        else:
+            operation = next(iter(_elements(rpc)), None)
+            try:
+                write_body = self._dispatch(operation)
+            except RPCError as e:
+                write_body = self._error(e.tag, str(e), e.error_type)
+
+        buffer = io.BytesIO()
+        with etree.xmlfile(buffer, encoding="UTF-8") as xf:
+            xf.write_declaration()
+            attributes = dict(rpc.attrib) if rpc is not None else {}
+            with xf.element(_qname(NC_NS, "rpc-reply"), attributes, nsmap={None: NC_NS}):
+                write_body(xf)
+        close = operation is not None and operation.tag == _qname(NC_NS, "close-session")
+        return buffer.getvalue(), close
+
+    def _dispatch(self, operation):
+        if operation is None:
+            raise RPCError("missing-element", "Lege rpc", "rpc")
+        name = etree.QName(operation).localname
+
+        if name in ("get", "get-config"):
+            if name == "get-config":
+                source = _child(operation, "source")
+                if source is None or _child(source, "running") is None:
+                    raise RPCError("invalid-value", "Enkel source 'running' wordt ondersteund")
+            filter_element = _child(operation, "filter")
+            self.datastore.check_filter(filter_element)
+
+            def write_data(xf):
+                with xf.element(_qname(NC_NS, "data")):
+                    self.datastore.query(xf, filter_element, include_state=name == "get")
+            return write_data
+
+        if name == "edit-config":
+            target = _child(operation, "target")
+            if target is None or _child(target, "running") is None:
+                raise RPCError("invalid-value", "Enkel target 'running' wordt ondersteund")
+            config = _child(operation, "config")
+            if config is None:
+                raise RPCError("missing-element", "edit-config zonder <config>")
+            default_element = _child(operation, "default-operation")
+            default_operation = _text(default_element) if default_element is not None else "merge"
+            self.datastore.edit(config, default_operation)
+            return self._ok
+
+        if name in ("lock", "unlock", "close-session", "kill-session"):
+            return self._ok
+
+        raise RPCError("operation-not-supported", f"Operatie '{name}' wordt niet ondersteund", "protocol")
+
+    @staticmethod
+    def _ok(xf):
+        xf.write(etree.Element(_qname(NC_NS, "ok")))
+
+    @staticmethod
+    def _error(tag, message, error_type="application"):
+        error = etree.Element(_qname(NC_NS, "rpc-error"))
+        etree.SubElement(error, _qname(NC_NS, "error-type")).text = error_type
+        etree.SubElement(error, _qname(NC_NS, "error-tag")).text = tag
+        etree.SubElement(error, _qname(NC_NS, "error-severity")).text = "error"
+        etree.SubElement(error, _qname(NC_NS, "error-message")).text = message
+        return lambda xf: xf.write(error)
+
+
+# Main execution: start een NETCONF server tot Ctrl+C
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lokale NETCONF server stand-in")
+    parser.add_argument("--interfaces", type=int, default=10, help="Aantal interfaces in de datastore")
+    parser.add_argument("--port", type=int, default=8830, help="Luisterpoort")
+    parser.add_argument("--latency", type=float, default=0.0, help="Vertraging per RPC (s)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Part 8: NETCONF Server Stand-in")
+    print("=" * 60)
+    start = time.perf_counter()
+    server = NetconfServer(Datastore(args.interfaces), args.port, latency=args.latency).start()
+    print(f"Datastore met {args.interfaces} interface(s) opgebouwd in {time.perf_counter() - start:.2f}s")
+    print(f"Luistert op 127.0.0.1:{args.port} - stop met Ctrl+C")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        print(f"\nServer gestopt na {server.rpcs} RPC(s).")
@@ -0,0 +1,44 @@
+import json
+import socket
+
+from part3b_network_health_monitor import NetworkHealthMonitor
+
+
+def _closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_connection_failures_dedup_on_stable_subject(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    device = {"device_type": "cisco_ios", "host": "127.0.0.1", "port": _closed_port(),
+              "username": "cisco", "password": "cisco123!", "conn_timeout": 2}
+    monitor = NetworkHealthMonitor([device], probe_timeout=None)
+
+    # Elke poging geeft een andere message: "(circuit closed)", "(circuit open)", ...
+    for _ in range(monitor.circuit_breaker.failure_threshold):
+        assert monitor.connect_device(device) is None
+
+    alerts = [alert for alert in monitor.alerts if alert["type"] == "connection"]
+    assert len(alerts) == 1
+    assert alerts[0]["subject"] == "connection"
+    assert alerts[0]["count"] == monitor.circuit_breaker.failure_threshold
+
+
+def test_circuit_breaker_is_per_host_and_port(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    broken = {"device_type": "cisco_ios", "host": "127.0.0.1", "port": _closed_port(),
+              "username": "cisco", "password": "cisco123!", "conn_timeout": 2}
+    other = dict(broken, port=broken["port"] + 1)
+    monitor = NetworkHealthMonitor([broken, other], probe_timeout=None)
+
+    for _ in range(monitor.circuit_breaker.failure_threshold):
+        monitor.connect_device(broken)
+
+    assert not monitor.circuit_breaker.allow(f"127.0.0.1:{broken['port']}")
+    assert monitor.circuit_breaker.allow(f"127.0.0.1:{other['port']}")
+    with open("health_reports/circuit_breaker.json") as f:
+        assert set(json.load(f)) == {f"127.0.0.1:{broken['port']}"}
@@ -0,0 +1,22 @@
+from part3b_async_health_monitor import AsyncNetworkHealthMonitor
+from part3b_device_simulator import DeviceSimulator
+from part3b_history_store import HistoryStore
+
+
+def test_async_backend_probes_and_records_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with DeviceSimulator(2, base_port=37022) as simulator:
+        devices = simulator.device_params()
+        # Een device waar niets luistert: de pre-probe markeert het zonder SSH poging
+        devices.append(dict(devices[0], port=37999, device_name="DOWN"))
+        history = HistoryStore()
+        monitor = AsyncNetworkHealthMonitor(devices, history=history, probe_timeout=1.0)
+        monitor.run_health_check()
+
+    statuses = {name: result["status"] for name, result in monitor.results.items()}
+    assert statuses.pop("DOWN") == "unreachable"
+    assert set(statuses.values()) == {"checked"}
+
+    run = history.runs(limit=1)[0]
+    assert run["devices"] == 3
+    assert {alert["device"] for alert in history.query_alerts(alert_type="health_check")} == set(statuses)
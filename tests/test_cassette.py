@@ -0,0 +1,43 @@
+import pytest
+
+from part3b_cassette import Cassette, find_cassettes, replay
+from part3b_check_plugins import CHECK_REGISTRY
+from part3b_device_simulator import DeviceSimulator
+from part3b_health_daemon import HealthDaemon
+from part3b_network_health_monitor import NetworkHealthMonitor
+
+
+@pytest.fixture
+def simulator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with DeviceSimulator(1, base_port=34022) as simulator:
+        yield simulator
+
+
+def test_cassette_saved_when_check_fails(simulator, monkeypatch):
+    def broken(monitor, device_name, outputs):
+        raise ValueError("parser kapot")
+
+    monkeypatch.setattr(CHECK_REGISTRY["routing"], "evaluate", broken)
+    monitor = NetworkHealthMonitor(simulator.device_params(), probe_timeout=None,
+                                   cassette_dir="cassettes")
+    result = monitor.check_device(simulator.device_params()[0])
+
+    assert result["status"] == "error"
+    [path] = find_cassettes(["cassettes"])
+    assert "show ip route summary" in Cassette.load(path).commands()
+
+
+def test_daemon_records_cassettes(simulator):
+    monitor = NetworkHealthMonitor(simulator.device_params(), probe_timeout=None,
+                                   cassette_dir="cassettes")
+    daemon = HealthDaemon(monitor)
+    try:
+        daemon.run_device_checks("SIM-R0001", ["resources", "routing"])
+    finally:
+        monitor.session_pool.close_all()
+
+    [path] = find_cassettes(["cassettes"])
+    [record], _ = replay([path])
+    assert record["result"]["status"] == "checked"
+    assert set(record["result"]) == {"status", "hostname", "resources", "routing"}
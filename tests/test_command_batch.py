@@ -0,0 +1,33 @@
+import pytest
+from netmiko import ConnectHandler
+
+from part3b_command_batch import send_command_batch, split_batched_output
+from part3b_device_simulator import DeviceSimulator
+
+COMMANDS = ["show ip interface brief", "show ip route summary", "show ip ospf neighbor",
+            "show cdp neighbors", "show running-config | include hostname"]
+
+
+def test_split_ignores_stale_prompts_before_first_echo():
+    raw = ("\r\nR1#\r\nR1#\r\nR1#show clock\r\n*10:00:00.000 UTC\r\n"
+           "R1#show version | include uptime\r\nR1 uptime is 1 minute\r\nR1#")
+    outputs = split_batched_output(raw, "R1#", ["show clock", "show version | include uptime"])
+    assert outputs == {"show clock": "*10:00:00.000 UTC",
+                       "show version | include uptime": "R1 uptime is 1 minute"}
+
+
+@pytest.mark.parametrize("count", [3, 5])
+def test_batch_against_slow_simulator_does_not_fall_back(count):
+    with DeviceSimulator(1, base_port=33022, latency=0.2) as simulator:
+        params = {k: v for k, v in simulator.device_params()[0].items() if k != "device_name"}
+        conn = ConnectHandler(**params)
+        try:
+            expected = {command: conn.send_command(command) for command in COMMANDS[:count]}
+
+            def no_fallback(command, **kwargs):
+                raise AssertionError(f"sequentiële fallback voor '{command}'")
+
+            conn.send_command = no_fallback
+            assert send_command_batch(conn, COMMANDS[:count]) == expected
+        finally:
+            conn.disconnect()
@@ -0,0 +1,26 @@
+from part3b_command_cache import CachedConnection, CommandCache
+
+
+class FakeConnection:
+    def __init__(self):
+        self.calls = []
+
+    def send_command(self, command, **kwargs):
+        self.calls.append((command, kwargs))
+        if kwargs.get("use_textfsm"):
+            return [{"intf": "GigabitEthernet1", "status": "up"}]
+        return "GigabitEthernet1  10.0.0.1  YES manual up  up"
+
+
+def test_send_command_options_are_part_of_the_key():
+    conn = FakeConnection()
+    cached = CachedConnection(conn, CommandCache(), "R1")
+
+    raw = cached.send_command("show ip interface brief")
+    parsed = cached.send_command("show ip interface brief", use_textfsm=True)
+    assert isinstance(raw, str) and isinstance(parsed, list)
+
+    # Enkel timing opties verschillen: uit de cache
+    assert cached.send_command("show ip interface brief", read_timeout=30) == raw
+    assert cached.send_command("show ip interface brief", use_textfsm=True, read_timeout=5) == parsed
+    assert len(conn.calls) == 2
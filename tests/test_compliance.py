@@ -0,0 +1,35 @@
+import pytest
+
+from part3b_compliance import ComplianceEngine
+
+
+def _rule(rule_id, pattern, **extra):
+    return dict({"id": rule_id, "match": "regex", "pattern": pattern}, **extra)
+
+
+@pytest.mark.parametrize("pattern", [
+    r"(?P<version>ip ssh version \d)",
+    r"(\w+) \1",
+    r"(?P<word>\w+) (?P=word)",
+    r"(ssh)?(?(1)x|y)",
+])
+def test_rule_constructs_that_break_the_matcher_name_the_rule(pattern):
+    with pytest.raises(ValueError, match="kapotte_regel"):
+        ComplianceEngine([_rule("ssh", "^ip ssh"), _rule("kapotte_regel", pattern)])
+
+
+def test_leading_inline_flags_are_scoped_to_the_rule():
+    engine = ComplianceEngine([
+        _rule("ssh_nocase", r"(?i)^ip ssh version 2"),
+        _rule("logging", r"^logging host", scope="any")
+    ])
+    results = engine.evaluate("IP SSH VERSION 2\nLOGGING HOST 10.0.0.1\nlogging host 10.0.0.2\n")
+
+    assert results["ssh_nocase"]["lines"] == [1]
+    # De flag geldt enkel voor zijn eigen regel
+    assert results["logging"]["lines"] == [3]
+
+
+def test_octal_escape_in_character_class_is_allowed():
+    engine = ComplianceEngine([_rule("octal", r"^banner motd [\1]"), _rule("group", r"^(ntp) server")])
+    assert engine.evaluate("ntp server 10.0.0.1\n")["group"]["passed"]
@@ -0,0 +1,44 @@
+from part3b_compliance import ComplianceEngine
+from part3b_config_tree import get_config_tree
+
+CONFIG = """hostname R1
+ip ssh version 2
+logging-buffered 4096
+line vty 0 4
+ transport input ssh
+line vty 5 15
+ transport input telnet
+interface Gi0/1
+ description uplink
+  ! comment
+"""
+
+
+def test_query_api_uses_the_keyword_index():
+    tree = get_config_tree(CONFIG)
+
+    assert tree.has_global("ip ssh version 2")
+    assert not tree.has_global("ip ssh version 1")
+    # Een prefix die midden in een woord stopt raakt ook andere keywords
+    assert [node.line for node in tree.global_lines("logging")] == ["logging-buffered 4096"]
+    assert not tree.every_section_has("line vty", "transport input ssh")
+    assert tree.sections_missing("line vty", "transport input ssh") == ["line vty 5 15"]
+    assert not tree.every_section_has("router ospf", "network")
+    assert get_config_tree(CONFIG) is tree
+
+
+def test_engine_reports_config_line_numbers_per_scope():
+    engine = ComplianceEngine([
+        {"id": "ssh", "match": "prefix", "pattern": "ip ssh version 2"},
+        {"id": "vty_ssh", "match": "regex", "pattern": r"^transport input ssh$", "scope": "line vty"},
+        {"id": "telnet", "match": "contains", "pattern": "telnet", "scope": "any"},
+        {"id": "no_desc", "match": "prefix", "pattern": "description", "expect": "absent"}
+    ])
+    results = engine.evaluate(CONFIG)
+
+    assert results["ssh"]["lines"] == [2]
+    assert results["vty_ssh"]["lines"] == [5]
+    assert results["vty_ssh"]["failed_sections"] == ["line vty 5 15"]
+    assert results["telnet"]["lines"] == [7]
+    # "description" staat enkel in een sectie, niet globaal
+    assert results["no_desc"]["passed"]
@@ -0,0 +1,16 @@
+import logging
+
+from part3b_device_simulator import DeviceSimulator
+from part3b_network_health_monitor import NetworkHealthMonitor
+
+
+def test_health_check_does_not_reset_client_transports(caplog, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    caplog.set_level(logging.WARNING, logger="paramiko.transport")
+    with DeviceSimulator(5, base_port=36022) as simulator:
+        monitor = NetworkHealthMonitor(simulator.device_params(), probe_timeout=None)
+        monitor.run_health_check()
+
+    assert all(result["status"] == "checked" for result in monitor.results.values())
+    assert not [record.getMessage() for record in caplog.records
+                if record.name == "paramiko.transport"]
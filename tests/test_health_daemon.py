@@ -0,0 +1,35 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from part3b_health_daemon import HealthDaemon
+from part3b_network_health_monitor import NetworkHealthMonitor
+
+
+def test_tick_does_not_block_and_skips_busy_devices(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    devices = [{"device_type": "cisco_ios", "host": "127.0.0.1", "device_name": name}
+               for name in ("SLOW", "FAST")]
+    daemon = HealthDaemon(NetworkHealthMonitor(devices, probe_timeout=None))
+    release = threading.Event()
+    runs = []
+
+    def run_device_checks(device_name, check_names):
+        runs.append(device_name)
+        if device_name == "SLOW":
+            release.wait(5)
+
+    monkeypatch.setattr(daemon, "run_device_checks", run_device_checks)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for _ in range(3):
+            for name in daemon.devices:
+                daemon.schedule(name, "resources", 0)
+            start = time.monotonic()
+            daemon.tick(executor)
+            assert time.monotonic() - start < 1
+            time.sleep(0.1)
+        release.set()
+
+    assert runs.count("SLOW") == 1
+    assert runs.count("FAST") == 3
+    assert daemon.skipped == 2
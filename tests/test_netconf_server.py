@@ -0,0 +1,79 @@
+from lxml import etree
+
+from part8_netconf_server import IF_NS, NC_NS, Datastore, NetconfServer
+
+RPC = f'<rpc xmlns="{NC_NS}" message-id="1">{{}}</rpc>'
+
+REPLACE_INTERFACES = f"""
+<edit-config>
+  <target><running/></target>
+  <config>
+    <interfaces xmlns="{IF_NS}" operation="replace">
+      <interface>
+        <name>GigabitEthernet9</name>
+        <enabled>false</enabled>
+      </interface>
+    </interfaces>
+  </config>
+</edit-config>
+"""
+
+MERGE_DESCRIPTION = f"""
+<edit-config>
+  <target><running/></target>
+  <config>
+    <interfaces xmlns="{IF_NS}">
+      <interface>
+        <name>GigabitEthernet9</name>
+        <description>na replace</description>
+      </interface>
+    </interfaces>
+  </config>
+</edit-config>
+"""
+
+GET_STATE = f"""
+<get>
+  <filter><interfaces-state xmlns="{IF_NS}"/></filter>
+</get>
+"""
+
+GET_CONFIG = f"""
+<get-config>
+  <source><running/></source>
+  <filter><interfaces xmlns="{IF_NS}"/></filter>
+</get-config>
+"""
+
+
+def _rpc(server, body):
+    reply, _ = server.handle(RPC.format(body).encode())
+    root = etree.fromstring(reply)
+    assert root.find(f"{{{NC_NS}}}rpc-error") is None, reply
+    return root
+
+
+def test_replace_interfaces_container_then_get():
+    server = NetconfServer(Datastore(3))
+    # interfaces-state eerst opbouwen, zodat een verouderde cache zou opvallen
+    _rpc(server, GET_STATE)
+
+    _rpc(server, REPLACE_INTERFACES)
+    state = _rpc(server, GET_STATE)
+    names = [name.text for name in state.iter(f"{{{IF_NS}}}name")]
+    assert names == ["GigabitEthernet9"]
+    assert state.findtext(f".//{{{IF_NS}}}oper-status") == "down"
+
+    _rpc(server, MERGE_DESCRIPTION)
+    config = _rpc(server, GET_CONFIG)
+    assert [name.text for name in config.iter(f"{{{IF_NS}}}name")] == ["GigabitEthernet9"]
+    assert config.findtext(f".//{{{IF_NS}}}description") == "na replace"
+
+
+def test_delete_interfaces_container_then_get():
+    server = NetconfServer(Datastore(3))
+    _rpc(server, GET_STATE)
+    _rpc(server, REPLACE_INTERFACES.replace('operation="replace"', 'operation="delete"'))
+
+    state = _rpc(server, GET_STATE)
+    assert list(state.iter(f"{{{IF_NS}}}interface")) == []
@@ -0,0 +1,33 @@
+import json
+
+import part3b_offline_compliance_scan as scan
+
+
+def test_scan_keeps_a_bounded_window_of_tasks(tmp_path, monkeypatch):
+    for i in range(20):
+        (tmp_path / f"R{i}.cfg").write_text(f"hostname R{i}\nip ssh version 2\n")
+
+    consumed = []
+    real_find, real_wait = scan.find_configs, scan.wait
+
+    def counting_find(directories):
+        for task in real_find(directories):
+            consumed.append(task)
+            yield task
+
+    window = []
+
+    def recording_wait(futures, **kwargs):
+        window.append(len(consumed))
+        return real_wait(futures, **kwargs)
+
+    monkeypatch.setattr(scan, "find_configs", counting_find)
+    monkeypatch.setattr(scan, "wait", recording_wait)
+    output = tmp_path / "scan.ndjson"
+    summary = scan.run_scan([str(tmp_path)], str(output), workers=1, chunksize=1)
+
+    # workers * 4 taken in het venster voor het eerste resultaat
+    assert window[0] == 4
+    assert summary["files"] == 20
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record["devices"][0] for record in records) == sorted(f"R{i}" for i in range(20))
@@ -0,0 +1,69 @@
+import errno
+import socket
+
+import pytest
+
+import part3b_reachability
+from part3b_network_health_monitor import NetworkHealthMonitor
+from part3b_reachability import probe_devices, probe_ports, socket_limit
+
+
+def _listener():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    return sock
+
+
+def _closed_port():
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def _devices():
+    listener = _listener()
+    devices = [
+        {"host": "127.0.0.1", "port": listener.getsockname()[1], "device_name": "OPEN"},
+        {"host": "127.0.0.1", "port": _closed_port(), "device_name": "CLOSED"}
+    ]
+    return listener, devices
+
+
+def test_probe_devices_keys_on_host_and_port():
+    listener, devices = _devices()
+    with listener:
+        open_ports = probe_devices(devices, ports=(), timeout=1.0)
+
+    assert open_ports[("127.0.0.1", devices[0]["port"])] == [devices[0]["port"]]
+    assert open_ports[("127.0.0.1", devices[1]["port"])] == []
+
+
+def test_filter_reachable_same_host(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    listener, devices = _devices()
+    monitor = NetworkHealthMonitor(devices, probe_timeout=1.0)
+    with listener:
+        reachable = monitor.filter_reachable(devices)
+
+    assert [device["device_name"] for device in reachable] == ["OPEN"]
+    assert monitor.results["CLOSED"] == {"status": "unreachable"}
+
+
+def test_fd_exhaustion_marks_target_unreachable(monkeypatch):
+    def no_fds(*args, **kwargs):
+        raise OSError(errno.EMFILE, "Too many open files")
+
+    monkeypatch.setattr(part3b_reachability.socket, "socket", no_fds)
+    assert probe_ports([("127.0.0.1", 22), ("localhost", 22)], timeout=0.5) == {
+        ("127.0.0.1", 22): False, ("localhost", 22): False}
+
+
+@pytest.mark.skipif(part3b_reachability.resource is None, reason="geen RLIMIT_NOFILE")
+def test_max_sockets_capped_by_fd_limit(monkeypatch):
+    resource = part3b_reachability.resource
+    monkeypatch.setattr(resource, "getrlimit", lambda _: (256, resource.RLIM_INFINITY))
+    assert socket_limit(1000) == 256 - part3b_reachability.FD_MARGIN
+    assert socket_limit(10) == 10
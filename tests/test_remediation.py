@@ -0,0 +1,34 @@
+from part3b_device_simulator import DeviceSimulator
+from part3b_history_store import HistoryStore
+from part3b_network_health_monitor import NetworkHealthMonitor
+from part3b_remediation import RemediationAction, RemediationExecutor
+
+
+def _reset(device_name):
+    return RemediationAction(device_name, "interface_reset", "Gi2",
+                             ["interface Gi2", "shutdown", "no shutdown"])
+
+
+def test_unreachable_device_does_not_spend_rate_tokens():
+    executor = RemediationExecutor(max_changes_per_minute=1)
+    executor.add(_reset("DOWN"))
+    records = executor.run(lambda name: None, lambda conn, discard: None)
+
+    assert records[0]["outcome"] == "skipped"
+    assert executor.rate_limiter.tokens == 1
+
+
+def test_remediation_runs_over_the_check_session_before_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Elk vijfde device van de simulator heeft een interface down
+    with DeviceSimulator(5, base_port=38022) as simulator:
+        history = HistoryStore()
+        monitor = NetworkHealthMonitor(simulator.device_params(), history=history, probe_timeout=None)
+        monitor.run_health_check(auto_fix=True)
+        sessions = simulator.sessions
+
+    result = monitor.results["SIM-R0005"]
+    assert [record["outcome"] for record in result["remediation_records"]] == ["ok"]
+    # Eén SSH sessie per device voor checks én remediation
+    assert sessions == 5
+    assert [alert["subject"] for alert in history.query_alerts(alert_type="remediation")] == ["GigabitEthernet3"]
@@ -0,0 +1,17 @@
+import os
+
+from part3b_report_writer import ReportWriter
+
+
+def test_every_page_has_the_same_nav_at_top_and_bottom(tmp_path):
+    with ReportWriter(str(tmp_path), timestamp="20260101_000000", page_size=2) as report:
+        for index in range(5):
+            report.write_device(f"R{index}", {"status": "checked"})
+
+    for number, has_prev, has_next in ((1, False, True), (2, True, True), (3, True, False)):
+        with open(os.path.join(report.pages_dir, f"devices_{number:03d}.html"), encoding="utf-8") as f:
+            html = f.read()
+        navs = [line.strip() for line in html.splitlines() if 'class="nav"' in line]
+        assert len(navs) == 2 and navs[0] == navs[1]
+        assert ("Vorige" in navs[0]) == has_prev
+        assert ("Volgende" in navs[0]) == has_next
@@ -0,0 +1,38 @@
+import pytest
+import requests
+import urllib3
+
+from part6_restconf_server import Datastore, RestconfError, RestconfServer
+
+INTERFACES = "ietf-interfaces:interfaces"
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("post", INTERFACES, {"ietf-interfaces:interface": ["Loopback100"]}),
+    ("post", INTERFACES, {"ietf-interfaces:interface": {"description": "zonder naam"}}),
+    ("post", INTERFACES, {"ietf-interfaces:interface": []}),
+    ("put", f"{INTERFACES}/interface=Loopback100", {"ietf-interfaces:interface": ["Loopback100"]}),
+    ("put", INTERFACES, {INTERFACES: {"interface": [{"description": "zonder naam"}]}}),
+])
+def test_malformed_list_entries_are_rejected(method, path, body):
+    datastore = Datastore(interfaces=2)
+    with pytest.raises(RestconfError) as error:
+        getattr(datastore, method)(path, body)
+
+    assert (error.value.status, error.value.tag) == (400, "invalid-value")
+    assert "None" not in datastore.tree[INTERFACES]["interface"]
+
+
+def test_unexpected_error_returns_500(tmp_path, monkeypatch):
+    urllib3.disable_warnings()
+    datastore = Datastore(interfaces=2)
+    monkeypatch.setattr(datastore, "get", lambda path: 1 / 0)
+    server = RestconfServer(datastore, port=0, cert_dir=str(tmp_path)).start()
+    try:
+        response = requests.get(f"https://127.0.0.1:{server.server_address[1]}/restconf/data/{INTERFACES}",
+                                auth=("cisco", "cisco123!"), verify=False, timeout=5)
+    finally:
+        server.stop()
+
+    assert response.status_code == 500
+    assert response.json()["ietf-restconf:errors"]["error"][0]["error-tag"] == "operation-failed"
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from part3b_session_pool import SessionPool
+
+
+class FakeConnection:
+    def __init__(self, host, **kwargs):
+        self.host = host
+        self.hang = threading.Event()
+        self.release_hang = threading.Event()
+
+    def is_alive(self):
+        if self.hang.is_set():
+            self.release_hang.wait(10)
+        return True
+
+    def disconnect(self):
+        pass
+
+
+def test_slow_liveness_check_does_not_block_other_hosts():
+    pool = SessionPool(max_per_host=1, connect=FakeConnection)
+    slow = {"host": "10.0.0.1"}
+    fast = {"host": "10.0.0.2"}
+    try:
+        slow_conn = pool.acquire(slow)
+        fast_conn = pool.acquire(fast)
+        pool.release(slow_conn)
+        slow_conn.hang.set()
+
+        # Hergebruik van de trage sessie blijft hangen in is_alive()
+        worker = threading.Thread(target=pool.acquire, args=(slow,))
+        worker.start()
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        pool.release(fast_conn)
+        assert pool.acquire(fast, timeout=1) is fast_conn
+        assert time.monotonic() - start < 0.5
+
+        slow_conn.release_hang.set()
+        worker.join(5)
+        assert pool.stats["reused"] == 2
+    finally:
+        pool.close_all()
+
+
+def test_session_in_liveness_check_counts_against_max_per_host():
+    pool = SessionPool(max_per_host=1, connect=FakeConnection)
+    device = {"host": "10.0.0.1"}
+    try:
+        conn = pool.acquire(device)
+        pool.release(conn)
+        conn.hang.set()
+        worker = threading.Thread(target=pool.acquire, args=(device,))
+        worker.start()
+        time.sleep(0.1)
+
+        # De enige plaats is bezet door de sessie in de liveness check
+        with pytest.raises(TimeoutError):
+            pool.acquire(device, timeout=0.2)
+
+        conn.release_hang.set()
+        worker.join(5)
+        assert pool.stats["created"] == 1
+    finally:
+        pool.close_all()
@@ -0,0 +1,64 @@
+from part3b_timeseries import TimeSeriesStore
+
+
+def test_store_grows_past_max_series(tmp_path):
+    store = TimeSeriesStore(str(tmp_path), capacity=4, max_series=2)
+    for device in range(5):
+        for metric in ("cpu", "memory", "interfaces_down"):
+            assert store.record(f"R{device}", metric, device, timestamp=1000)
+
+    assert store.max_series == 16
+    assert list(store.query("R0", "cpu")[1]) == [0]
+    assert list(store.query("R4", "interfaces_down")[1]) == [4]
+
+    # Na heropenen blijven de afmetingen en reeksen behouden
+    store.flush()
+    reopened = TimeSeriesStore(str(tmp_path))
+    assert reopened.max_series == 16
+    assert list(reopened.query("R3", "memory")[1]) == [3]
+
+
+def test_full_store_skips_sample(tmp_path, monkeypatch):
+    store = TimeSeriesStore(str(tmp_path), capacity=4, max_series=1)
+
+    def no_space():
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(store, "_grow", no_space)
+    assert store.record("R1", "cpu", 10)
+    assert not store.record("R2", "cpu", 20)
+    assert not store.record("R3", "cpu", 30)
+    assert store.query("R2", "cpu")[1].size == 0
+
+
+def test_queries_fall_back_to_rollups(tmp_path):
+    store = TimeSeriesStore(str(tmp_path), capacity=4, rollups=((300, 4), (3600, 48)))
+    start = 3600 * 1000
+    # Twee uur lang één sample per minuut, met één piek
+    for minute in range(120):
+        store.record("R1", "cpu", 90 if minute == 30 else 10, timestamp=start + minute * 60)
+
+    # De ruwe ring bevat enkel de laatste 4 minuten
+    times, _ = store.query("R1", "cpu", since=start + 116 * 60)
+    assert list(times) == [start + minute * 60 for minute in range(116, 120)]
+
+    # Het hele venster komt uit de uur buckets: gemiddelde + echte piek
+    times, values = store.query("R1", "cpu", since=start)
+    assert list(times) == [start, start + 3600]
+    assert values[0] == (59 * 10 + 90) / 60
+    assert store.stats("R1", "cpu", since=start)["max"] == 90
+    assert store.fleet_max("cpu", since=start) == {"R1": 90}
+
+    store.flush()
+    reopened = TimeSeriesStore(str(tmp_path))
+    assert list(reopened.query("R1", "cpu", since=start)[0]) == [start, start + 3600]
+
+
+def test_growth_is_bounded_by_max_bytes(tmp_path):
+    # 2 rijen van (4 * 8) + (4 * 12) bytes passen, 4 niet
+    store = TimeSeriesStore(str(tmp_path), capacity=4, max_series=1, rollups=((300, 4),),
+                            max_bytes=2 * 80)
+    assert store.record("R1", "cpu", 1)
+    assert store.record("R2", "cpu", 2)
+    assert not store.record("R3", "cpu", 3)
+    assert store.max_series == 2